@@ -1,9 +1,11 @@
 from .api import core, routers
+from . import repositories
 from .schemas import contact_schema
 from .utils import file_utils  
 __all__ = [
     "core",
     "routers",
+    "repositories",
     "contact_schema",
     "file_utils",
 ]
@@ -1,2 +1,2 @@
-from .contact import generate_unique_id
-__all__ = ["generate_unique_id"]
\ No newline at end of file
+from .contact import generate_contact_id, generate_contact_ids
+__all__ = ["generate_contact_id", "generate_contact_ids"]
@@ -1,12 +1,87 @@
-import uuid
-from typing import List, Dict, Any
-async def generate_unique_id(existing_contacts_data: List[Dict[str, Any]]) -> str:
-    """Generate a unique time-based UUID not present in existing contacts.""" 
-    existing_ids = {contact.get('id') for contact in existing_contacts_data if contact.get('id')}
-    while True:
-        new_id = str(uuid.uuid1())
-        if new_id not in existing_ids:
-              return new_id
-            
-        # This collision case is extremely rare, even more so with time-based IDs.
-        print(f"Time-based ID Collision detected: {new_id}. Regenerating...")
+"""Time-ordered contact ids (UUID version 7, RFC 9562).
+
+A UUIDv7 starts with the Unix time in milliseconds, followed by a 12-bit
+counter within the millisecond and 62 random bits::
+
+    xxxxxxxx-xxxx-7ccc-vrrr-rrrrrrrrrrrr
+    '-- ms --'     '-'  '----- random ---'
+
+so ids are unique without looking at the stored ones, and their string
+form sorts by creation time: new contacts land at the end of the id index,
+and listing by id is listing in creation order.
+"""
+
+import secrets
+import threading
+import time
+from typing import List
+
+COUNTER_BITS = 12
+MAX_COUNTER = (1 << COUNTER_BITS) - 1
+RANDOM_BITS = 62
+VERSION = 0x7
+VARIANT = 0b10
+
+
+def _uuid7_str(ms: int, counter: int, rand: int) -> str:
+    value = (ms << 80) | (VERSION << 76) | (counter << 64) | (VARIANT << 62) | rand
+    hex_ = f"{value:032x}"
+    return f"{hex_[:8]}-{hex_[8:12]}-{hex_[12:16]}-{hex_[16:20]}-{hex_[20:]}"
+
+
+class ContactIdGenerator:
+    """Thread-safe, monotonic UUIDv7 generator.
+
+    Ids from one process always increase: the counter orders ids within a
+    millisecond, and if it runs out or the clock steps back, the generator
+    keeps counting on from the last millisecond it used instead of waiting.
+    """
+
+    def __init__(self, clock=time.time_ns):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._counter = MAX_COUNTER
+
+    def _reserve(self, count: int) -> List[tuple]:
+        # Caller holds the lock; returns (ms, counter) for `count` ids in order
+        now = self._clock() // 1_000_000
+        if now > self._last_ms:
+            self._last_ms, self._counter = now, -1
+        slots = []
+        for _ in range(count):
+            if self._counter == MAX_COUNTER:
+                self._last_ms, self._counter = self._last_ms + 1, -1
+            self._counter += 1
+            slots.append((self._last_ms, self._counter))
+        return slots
+
+    def next_id(self) -> str:
+        with self._lock:
+            (ms, counter), = self._reserve(1)
+        return _uuid7_str(ms, counter, secrets.randbits(RANDOM_BITS))
+
+    def next_ids(self, count: int) -> List[str]:
+        """Allocate ``count`` increasing ids at once (for imports)."""
+        if count < 0:
+            raise ValueError("count must not be negative")
+        with self._lock:
+            slots = self._reserve(count)
+        randbits = secrets.randbits
+        return [_uuid7_str(ms, counter, randbits(RANDOM_BITS)) for ms, counter in slots]
+
+
+def id_timestamp_ms(contact_id: str) -> int:
+    """Unix time in milliseconds at which a UUIDv7 ``contact_id`` was generated."""
+    return int(contact_id[:8] + contact_id[9:13], 16)
+
+
+id_generator = ContactIdGenerator()
+
+
+def generate_contact_id() -> str:
+    return id_generator.next_id()
+
+
+def generate_contact_ids(count: int) -> List[str]:
+    return id_generator.next_ids(count)
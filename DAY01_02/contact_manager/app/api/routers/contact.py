@@ -1,89 +1,138 @@
-from fastapi import APIRouter,HTTPException,Query
-from app.utils import read_contacts, write_contacts
+import asyncio
+import csv
+import tempfile
+from fastapi import APIRouter,Depends,HTTPException,Query,Request
+from app.dependencies import get_uow
+from app.repositories import DuplicateContactError
 from app.schemas.contact_schema import ContactCreate,ContactUpdate
-from ..core import generate_unique_id
+from app.services import find_duplicates, import_contacts, merge_duplicates
+from app.services.dedup import DEFAULT_THRESHOLD
+from app.utils.import_utils import detect_format
+from app.unit_of_work import IUnitOfWork
+from ..core import generate_contact_id
 from typing import Optional
 
+# Uploads above this size are spooled to a temporary file instead of memory
+IMPORT_SPOOL_SIZE = 8 * 1024 * 1024
+
 
 router = APIRouter(prefix="/contacts", tags=["contacts"])
 
-#list contacts with optional sorting
+#list contacts, one page at a time, sorted by name, email or creation time
 @router.get("/list",status_code=200)
-async def get_contacts(sort_by:Optional[str] = Query("name",description="Field to sort contacts by name or email")):
-	contacts = await read_contacts()
-	if sort_by.lower() in ["name","email"]:
-		contacts = sorted(contacts, key=lambda x: x.get(sort_by)[0].lower())
-	return contacts
+async def get_contacts(sort_by:Optional[str] = Query("name",description="Field to sort contacts by: name, email or created"),
+                       sort_order: str = Query("asc", pattern="^(asc|desc)$", description="asc or desc"),
+                       skip: int = Query(0, ge=0, description="Number of contacts to skip"),
+                       limit: int = Query(50, ge=1, le=1000, description="Maximum number of contacts to return"),
+                       cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+                       uow: IUnitOfWork = Depends(get_uow)):
+	sort_by = sort_by.lower()
+	if sort_by not in ["name","email","created"]:
+		raise HTTPException(status_code=400, detail="sort_by must be 'name', 'email' or 'created'")
+	async with uow:
+		try:
+			return await uow.contacts.page(sort_by, sort_order, skip, limit, cursor)
+		except ValueError as e:
+			raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/search",status_code=200)
-async def search_contacts(name: str = Query(..., description="Search query contact name ")):
-    contacts = await read_contacts()
-    filtered_contacts = [contact for contact in contacts if name.lower() in contact.get('name','no name found').lower()]
-    if not filtered_contacts:
+async def search_contacts(name: str = Query(..., description="Search query contact name "),
+                          skip: int = Query(0, ge=0, description="Number of matches to skip"),
+                          limit: int = Query(20, ge=1, le=100, description="Maximum number of matches to return"),
+                          uow: IUnitOfWork = Depends(get_uow)):
+    # Best matches first: whole words, then word prefixes, substrings and near misses
+    async with uow:
+        filtered_contacts, total = await uow.contacts.search(name, skip, limit)
+    if not total:
         raise HTTPException(status_code=404, detail=f"No contacts found matching the name: {name}")
     return filtered_contacts
 
 
 @router.post("/", status_code=201)
-async def add_contact(contact: ContactCreate):
-    contacts = await read_contacts()
-    for existing_contact in contacts:
-        if (existing_contact.get('email')==contact.email and
-			existing_contact.get('phone')==contact.phone):
+async def add_contact(contact: ContactCreate, uow: IUnitOfWork = Depends(get_uow)):
+    async with uow:
+        # (email, phone) index lookup instead of scanning every contact
+        if await uow.contacts.find_duplicate(contact.email, contact.phone) is not None:
             raise HTTPException(status_code=400, detail="Contact already exists.")
-        
-    id = await generate_unique_id(contacts)
-    new_contact = contact.model_dump()
-    new_contact['id'] = id
-    contacts.append(new_contact)
-    await write_contacts(contacts)
-    return new_contact
+
+        new_contact = contact.model_dump()
+        new_contact['id'] = generate_contact_id()
+        try:
+            return await uow.contacts.add(new_contact)
+        except DuplicateContactError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/import", status_code=200)
+async def bulk_import_contacts(request: Request,
+                               format: Optional[str] = Query(None, pattern="^(csv|ndjson)$",
+                                                             description="csv or ndjson; defaults to the Content-Type"),
+                               uow: IUnitOfWork = Depends(get_uow)):
+    """Import contacts from a CSV (with a name,email,phone header) or NDJSON request body."""
+    fmt = format or detect_format(request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(status_code=415, detail="Send text/csv or application/x-ndjson, or pass ?format=")
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_SIZE) as upload:
+        async for chunk in request.stream():
+            upload.write(chunk)
+        upload.seek(0)
+        async with uow:
+            try:
+                return await import_contacts(upload, fmt, uow.contacts)
+            except (UnicodeDecodeError, ValueError, csv.Error) as e:
+                raise HTTPException(status_code=400, detail=f"Could not read the import file: {e}")
+
+
+@router.get("/duplicates", status_code=200)
+async def get_duplicate_contacts(threshold: float = Query(DEFAULT_THRESHOLD, ge=0.5, le=1.0,
+                                                          description="Minimum similarity (0.5-1) to report"),
+                                 uow: IUnitOfWork = Depends(get_uow)):
+    """Groups of contacts that look like the same person (typos, formatting, alternate emails)."""
+    async with uow:
+        # Stored contacts are never mutated in place, so the list is a stable snapshot for the worker thread
+        contacts = await uow.contacts.list()
+    return await asyncio.to_thread(find_duplicates, contacts, threshold)
+
+
+@router.post("/duplicates/merge", status_code=200)
+async def merge_duplicate_contacts(threshold: float = Query(DEFAULT_THRESHOLD, ge=0.5, le=1.0,
+                                                            description="Minimum similarity (0.5-1) to merge"),
+                                   uow: IUnitOfWork = Depends(get_uow)):
+    """Find duplicates and merge each group into its most complete contact."""
+    async with uow:
+        contacts = await uow.contacts.list()
+        report = await asyncio.to_thread(find_duplicates, contacts, threshold)
+        return {**await merge_duplicates(uow.contacts, report["candidates"]), "groups": len(report["candidates"])}
 
 
 @router.put("/{contact_id}",status_code=200)
-async def update_contact(contact_id:str, contact:ContactUpdate):
-        contacts = await read_contacts()
+async def update_contact(contact_id:str, contact:ContactUpdate, uow: IUnitOfWork = Depends(get_uow)):
         updated_contact = contact.model_dump(exclude_unset=True)
-        contact_found = False
-        for existing_contact in contacts:
-            if existing_contact.get('id') == contact_id:
-                contact_found = True
-                for key, value in updated_contact.items():
-                    existing_contact[key] = value
-                break
-        if not contact_found:
-            raise HTTPException(status_code=404, detail=f"Contact not found with provided ID: {contact_id}")
-        
-        await write_contacts(contacts)       
-        for updated_contact in contacts:
-            if updated_contact.get('id') == contact_id:
-                updated_data = updated_contact
-                break
+        async with uow:
+            try:
+                updated_data = await uow.contacts.update(contact_id, updated_contact)
+            except DuplicateContactError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            if updated_data is None:
+                raise HTTPException(status_code=404, detail=f"Contact not found with provided ID: {contact_id}")
             
         return updated_data
     
     
 @router.delete("/{contact_id}",status_code=200)
-async def delete_contact(contact_id:str):
-    contacts = await read_contacts()
-    contact_found = False
-    for existing_contact in contacts:
-        if existing_contact.get('id') == contact_id:
-            contact_found = True
-            contacts.remove(existing_contact)
-            break
-    if not contact_found:
-        raise HTTPException(status_code=404, detail=f"Contact not found with provided ID: {contact_id}")
-
-    await write_contacts(contacts)
+async def delete_contact(contact_id:str, uow: IUnitOfWork = Depends(get_uow)):
+    async with uow:
+        if not await uow.contacts.delete(contact_id):
+            raise HTTPException(status_code=404, detail=f"Contact not found with provided ID: {contact_id}")
+
     return {"detail": "Contact deleted successfully"}
 
 
 @router.get("/{contact_id}",status_code=200)
-async def get_contact(contact_id:str):
-	contacts = await read_contacts()
-	for existing_contact in contacts:
-		if existing_contact.get('id') == contact_id:
-			return existing_contact
+async def get_contact(contact_id:str, uow: IUnitOfWork = Depends(get_uow)):
+	async with uow:
+		existing_contact = await uow.contacts.get(contact_id)
+	if existing_contact is not None:
+		return existing_contact
 	raise HTTPException(status_code=404, detail=f"Contact not found with provided ID: {contact_id}")
@@ -0,0 +1,24 @@
+"""Application configuration using Pydantic settings.
+"""
+
+from pathlib import Path
+
+from pydantic_settings import BaseSettings
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+class Settings(BaseSettings):
+    debug: bool = False
+
+    # "json" keeps contacts in memory and saves them to contacts.json;
+    # "sql" stores them in the database at database_url
+    contacts_storage: str = "json"
+    database_url: str = f"sqlite+aiosqlite:///{PROJECT_ROOT / 'contacts.db'}"
+
+    class Config:
+        env_file = ".env"
+        case_sensitive = False
+
+
+settings = Settings()
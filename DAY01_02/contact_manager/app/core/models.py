@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Index, String, UniqueConstraint
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+
+
+class Contact(Base):
+    __tablename__ = "contacts"
+
+    id = Column(String(36), primary_key=True)
+    # Nullable like the JSON store, whose contacts.json has contacts without a phone
+    name = Column(String(255), nullable=True)
+    email = Column(String(255), nullable=True)
+    phone = Column(String(32), nullable=True)
+    # Normalized copies, so sorting, search and duplicate checks ignore
+    # case, accents and phone formatting (see contact_repository.dedupe_key).
+    # A missing value is stored as "", so it sorts first and two contacts
+    # with the same email and no phone still count as duplicates
+    name_key = Column(String(255), nullable=False)
+    email_key = Column(String(255), nullable=False)
+    phone_key = Column(String(32), nullable=False)
+
+    __table_args__ = (
+        # The database rejects a second contact with the same email and phone
+        UniqueConstraint("email_key", "phone_key", name="uq_contacts_email_phone"),
+        # (key, id) matches the listing order, so a page is an index range scan
+        Index("ix_contacts_name_key_id", "name_key", "id"),
+        Index("ix_contacts_email_key_id", "email_key", "id"),
+    )
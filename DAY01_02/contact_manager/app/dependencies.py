@@ -0,0 +1,8 @@
+from app.core.config import settings
+from app.unit_of_work import IUnitOfWork, JsonUnitOfWork, SQLAlchemyUnitOfWork
+
+
+def get_uow() -> IUnitOfWork:
+    if settings.contacts_storage == "sql":
+        return SQLAlchemyUnitOfWork()
+    return JsonUnitOfWork()
@@ -1,8 +1,26 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from app.api.routers.contact import router as contact_router
+from app.core.config import settings
+from app.core.database import engine, init_db
+from app.repositories import contact_repository
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.contacts_storage == "sql":
+        await init_db()
+        yield
+        await engine.dispose()
+        return
+    # Read contacts.json once; changes are written back in the background
+    await contact_repository.load()
+    yield
+    await contact_repository.close()
 
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 
 # heath check
@@ -10,4 +28,4 @@ app = FastAPI()
 def health_check():
     return {"status": "ok"}
 
-app.include_router(contact_router)
\ No newline at end of file
+app.include_router(contact_router)
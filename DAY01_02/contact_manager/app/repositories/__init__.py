@@ -0,0 +1,5 @@
+from .contact_repository import ContactRepository, DuplicateContactError, contact_repository
+from .interfaces.contact_repository_interface import IContactRepository
+from .sqlalchemy_repository import SQLAlchemyContactRepository
+__all__ = ["ContactRepository", "DuplicateContactError", "IContactRepository", "SQLAlchemyContactRepository",
+           "contact_repository"]
@@ -0,0 +1,233 @@
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.repositories.interfaces.contact_repository_interface import IContactRepository
+from app.repositories.name_index import NameSearchIndex
+from app.repositories.sort_index import SortedIndex, created_collation_key, email_collation_key, name_collation_key
+from app.utils.file_utils import CONTACTS_FILE_PATH, read_contacts, write_contacts
+from app.utils.normalize import normalize_email, normalize_phone
+from app.utils.pagination import decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait after a change before writing contacts.json, so a burst of
+# changes is saved with one write
+FLUSH_DELAY = 0.5
+
+
+class DuplicateContactError(Exception):
+    """Another contact already has the same email and phone."""
+
+
+def dedupe_key(email: Any, phone: Any) -> Tuple[Any, Any]:
+    """(email, phone) in normalized form, so formatting differences still count as duplicates."""
+    return normalize_email(email) or email, normalize_phone(phone) or phone
+
+
+def contact_key(contact: Dict[str, Any]) -> Tuple[Any, Any]:
+    return dedupe_key(contact.get('email'), contact.get('phone'))
+
+
+class ContactRepository(IContactRepository):
+    """Contacts kept in memory, indexed by id, by (email, phone), by name
+    for search, and in name, email and creation (id) order for listing.
+
+    contacts.json is read once by ``load``. Changes are applied in memory
+    and written back in the background ``flush_delay`` seconds after the
+    first unsaved change (write-behind), so requests never wait for the
+    disk. ``close`` writes anything still pending.
+
+    Stored contacts are replaced rather than modified, so a dict handed out
+    by ``get`` or ``list`` never changes under the caller.
+    """
+
+    def __init__(self, path: Path = CONTACTS_FILE_PATH, flush_delay: float = FLUSH_DELAY):
+        self.path = path
+        self.flush_delay = flush_delay
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        self.by_key: Dict[Tuple[Any, Any], str] = {}
+        self.names = NameSearchIndex()
+        self.sorted = {
+            "name": SortedIndex(name_collation_key),
+            "email": SortedIndex(email_collation_key),
+            "created": SortedIndex(created_collation_key),
+        }
+        self._loaded = False
+        # Changes made so far, and how many of them are on disk
+        self._version = 0
+        self._saved_version = 0
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def load(self) -> None:
+        self.by_id, self.by_key, self.names = {}, {}, NameSearchIndex()
+        for contact in await read_contacts(self.path):
+            self.by_id[contact['id']] = contact
+            self.by_key.setdefault(contact_key(contact), contact['id'])
+            self.names.add(contact['id'], contact.get('name'))
+        for index in self.sorted.values():
+            index.build(self.by_id.values())
+        self._loaded = True
+
+    async def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            await self.load()
+
+    async def list(self) -> List[Dict[str, Any]]:
+        await self._ensure_loaded()
+        return list(self.by_id.values())
+
+    async def get(self, contact_id: str) -> Optional[Dict[str, Any]]:
+        await self._ensure_loaded()
+        return self.by_id.get(contact_id)
+
+    async def find_duplicate(self, email: Any, phone: Any) -> Optional[Dict[str, Any]]:
+        await self._ensure_loaded()
+        contact_id = self.by_key.get(dedupe_key(email, phone))
+        return self.by_id[contact_id] if contact_id is not None else None
+
+    async def existing_keys(self, keys: Iterable[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        await self._ensure_loaded()
+        return {key for key in keys if key in self.by_key}
+
+    async def page(self, sort_by: str = "name", sort_order: str = "asc", skip: int = 0,
+                   limit: Optional[int] = 50, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """One page of contacts in ``sort_by`` order, read from its sorted index.
+
+        ``cursor`` is a ``next_cursor`` from an earlier page with the same
+        sort; an unusable cursor raises ValueError.
+        """
+        await self._ensure_loaded()
+        index = self.sorted[sort_by]
+        after = tuple(decode_cursor(cursor, sort_by, sort_order)) if cursor else None
+        # One extra entry tells whether another page follows
+        entries = index.page(skip, limit + 1 if limit is not None else None, sort_order == "desc", after)
+        has_next = limit is not None and len(entries) > limit
+        entries = entries[:limit] if limit is not None else entries
+        return {
+            "items": [self.by_id[contact_id] for _, contact_id in entries],
+            "total": len(index),
+            "skip": skip,
+            "limit": limit,
+            "has_next": has_next,
+            "next_cursor": encode_cursor(sort_by, sort_order, list(entries[-1])) if has_next else None,
+        }
+
+    async def search(self, query: str, skip: int = 0, limit: Optional[int] = 20) -> Tuple[List[Dict[str, Any]], int]:
+        """One page of contacts whose name best matches ``query``, and the number of matches."""
+        await self._ensure_loaded()
+        ids, total = self.names.search(query, skip, limit)
+        return [self.by_id[contact_id] for contact_id in ids], total
+
+    async def add(self, contact: Dict[str, Any]) -> Dict[str, Any]:
+        await self._ensure_loaded()
+        key = contact_key(contact)
+        if key in self.by_key:
+            raise DuplicateContactError("Contact already exists.")
+        self.by_id[contact['id']] = contact
+        self.by_key[key] = contact['id']
+        self.names.add(contact['id'], contact.get('name'))
+        for index in self.sorted.values():
+            index.add(contact)
+        self._changed()
+        return contact
+
+    async def add_many(self, contacts: List[Dict[str, Any]], schedule_save: bool = True) -> None:
+        """Insert contacts already checked against ``by_key`` and each other.
+
+        Sorted indexes are merged once for the whole batch instead of one
+        insort per contact, and the batch counts as a single change. With
+        ``schedule_save=False`` the caller saves with ``flush`` when done,
+        so a long import is not rewritten to disk every ``flush_delay``.
+        """
+        await self._ensure_loaded()
+        for contact in contacts:
+            self.by_id[contact['id']] = contact
+            self.by_key[contact_key(contact)] = contact['id']
+            self.names.add(contact['id'], contact.get('name'))
+        for index in self.sorted.values():
+            index.add_many(contacts)
+        if contacts:
+            self._changed(schedule_save)
+
+    async def update(self, contact_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Merge ``changes`` into a contact; None if there is no such contact."""
+        await self._ensure_loaded()
+        existing = self.by_id.get(contact_id)
+        if existing is None:
+            return None
+        updated = {**existing, **changes}
+        old_key, new_key = contact_key(existing), contact_key(updated)
+        if new_key != old_key:
+            if new_key in self.by_key:
+                raise DuplicateContactError("Contact already exists.")
+            if self.by_key.get(old_key) == contact_id:
+                del self.by_key[old_key]
+            self.by_key[new_key] = contact_id
+        self.by_id[contact_id] = updated
+        if updated.get('name') != existing.get('name'):
+            self.names.add(contact_id, updated.get('name'))
+        for index in self.sorted.values():
+            if index.key(updated) != index.key(existing):
+                index.remove(existing)
+                index.add(updated)
+        self._changed()
+        return updated
+
+    async def delete(self, contact_id: str) -> bool:
+        await self._ensure_loaded()
+        existing = self.by_id.pop(contact_id, None)
+        if existing is None:
+            return False
+        if self.by_key.get(contact_key(existing)) == contact_id:
+            del self.by_key[contact_key(existing)]
+        self.names.remove(contact_id)
+        for index in self.sorted.values():
+            index.remove(existing)
+        self._changed()
+        return True
+
+    def _changed(self, schedule_save: bool = True) -> None:
+        self._version += 1
+        if schedule_save and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_delay)
+        try:
+            await self.flush()
+        except Exception:
+            # Already logged by flush; the contacts stay unsaved and the next
+            # change (or close) retries
+            pass
+
+    async def flush(self) -> None:
+        """Write contacts.json now if there are unsaved changes.
+
+        Raises if the write fails; the changes then stay unsaved.
+        """
+        async with self._flush_lock:
+            while self._saved_version != self._version:
+                version = self._version
+                # Contacts are replaced, never mutated, so a shallow copy is a consistent snapshot
+                contacts = list(self.by_id.values())
+                try:
+                    await write_contacts(contacts, self.path)
+                except Exception:
+                    logger.exception("Error writing %s", self.path)
+                    raise
+                self._saved_version = version
+
+    async def close(self) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+
+contact_repository = ContactRepository()
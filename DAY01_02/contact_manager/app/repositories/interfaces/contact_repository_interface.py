@@ -0,0 +1,50 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+class IContactRepository(ABC):
+    @abstractmethod
+    async def list(self) -> List[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    async def get(self, contact_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    async def find_duplicate(self, email: Any, phone: Any) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    async def existing_keys(self, keys: Iterable[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """The normalized (email, phone) keys among ``keys`` that are already stored."""
+        ...
+
+    @abstractmethod
+    async def page(self, sort_by: str = "name", sort_order: str = "asc", skip: int = 0,
+                   limit: Optional[int] = 50, cursor: Optional[str] = None) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    async def search(self, query: str, skip: int = 0, limit: Optional[int] = 20) -> Tuple[List[Dict[str, Any]], int]:
+        ...
+
+    @abstractmethod
+    async def add(self, contact: Dict[str, Any]) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    async def add_many(self, contacts: List[Dict[str, Any]], schedule_save: bool = True) -> None:
+        ...
+
+    @abstractmethod
+    async def update(self, contact_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    async def delete(self, contact_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def flush(self) -> None:
+        ...
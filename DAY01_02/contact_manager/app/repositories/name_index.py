@@ -0,0 +1,214 @@
+import re
+import unicodedata
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+# Upper bound on the contacts examined per match kind, so a very broad query
+# ("a") costs the same on a million contacts as on a thousand
+MAX_CANDIDATES = 1000
+# Minimum trigram similarity for a fuzzy (typo-tolerant) match
+FUZZY_THRESHOLD = 0.3
+# Rarest query trigrams whose contacts are considered for fuzzy matching
+FUZZY_PROBES = 4
+
+EXACT, PREFIX, SUBSTRING, FUZZY = range(4)
+
+_END = ""  # trie key marking the end of a token
+_WORD = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    """Lower-case, accent-free form of a name: 'José  Núñez' -> 'jose nunez'."""
+    if text.isascii():
+        return " ".join(_WORD.findall(text.lower()))
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(_WORD.findall(stripped.casefold()))
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of a name, padded so word starts and ends count too."""
+    return inner_trigrams(f"  {text} ")
+
+
+def inner_trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class NameSearchIndex:
+    """Search index over contact names, maintained on every write.
+
+    * a prefix trie over the name tokens, for type-ahead ("jo" finds "John")
+    * token -> contact ids postings, for whole-word matches
+    * trigram -> contact ids postings, for substrings anywhere in the name
+      and for fuzzy matches that survive a typo
+
+    ``search`` ranks exact word matches first, then prefix, substring and
+    fuzzy matches; ties go to the most similar name.
+    """
+
+    def __init__(self):
+        self.names: Dict[str, str] = {}
+        self.tokens: Dict[str, Set[str]] = {}
+        self.grams: Dict[str, Set[str]] = {}
+        self.trie: dict = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, contact_id: str, name: Optional[str]) -> None:
+        if contact_id in self.names:
+            self.remove(contact_id)
+        normalized = normalize(name or "")
+        self.names[contact_id] = normalized
+        for token in set(normalized.split()):
+            ids = self.tokens.get(token)
+            if ids is None:
+                ids = self.tokens[token] = set()
+                self._trie_insert(token)
+            ids.add(contact_id)
+        grams = self.grams
+        for gram in trigrams(normalized):
+            ids = grams.get(gram)
+            if ids is None:
+                grams[gram] = {contact_id}
+            else:
+                ids.add(contact_id)
+
+    def remove(self, contact_id: str) -> None:
+        normalized = self.names.pop(contact_id, None)
+        if normalized is None:
+            return
+        for token in set(normalized.split()):
+            ids = self.tokens[token]
+            ids.discard(contact_id)
+            if not ids:
+                del self.tokens[token]
+                self._trie_remove(token)
+        for gram in trigrams(normalized):
+            ids = self.grams[gram]
+            ids.discard(contact_id)
+            if not ids:
+                del self.grams[gram]
+
+    def _trie_insert(self, token: str) -> None:
+        node = self.trie
+        for char in token:
+            node = node.setdefault(char, {})
+        node[_END] = token
+
+    def _trie_remove(self, token: str) -> None:
+        path = [self.trie]
+        for char in token:
+            path.append(path[-1][char])
+        del path[-1][_END]
+        # Prune the nodes that no longer lead to any token
+        for depth in range(len(token), 0, -1):
+            if path[depth]:
+                break
+            del path[depth - 1][token[depth - 1]]
+
+    def _completions(self, prefix: str) -> Iterator[str]:
+        node = self.trie
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if _END in node:
+                yield node[_END]
+            stack.extend(child for char, child in node.items() if char != _END)
+
+    def _prefix_ids(self, prefix: str) -> Set[str]:
+        # Whole-word matches first, so the cut-off never drops them for longer words
+        ids = set(islice(self.tokens.get(prefix, ()), MAX_CANDIDATES))
+        for token in self._completions(prefix):
+            if len(ids) >= MAX_CANDIDATES:
+                break
+            if token != prefix:
+                ids.update(islice(self.tokens[token], MAX_CANDIDATES - len(ids)))
+        return ids
+
+    def _word_matches(self, words: List[str]) -> Tuple[Set[str], Set[str]]:
+        """Contacts having every query word as a whole word, and as a word prefix."""
+        # Candidates come from the rarest word; the others are checked against
+        # each candidate's own tokens rather than intersecting large postings
+        anchor = min(words, key=lambda word: (len(self.tokens.get(word, ())), -len(word)))
+        exact, prefix = set(), set()
+        for contact_id in self._prefix_ids(anchor):
+            tokens = self.names[contact_id].split()
+            if all(word in tokens for word in words):
+                exact.add(contact_id)
+            elif all(any(token.startswith(word) for token in tokens) for word in words):
+                prefix.add(contact_id)
+        return exact, prefix
+
+    def _substring_matches(self, query: str) -> Set[str]:
+        # Unpadded: the query may start or end in the middle of a word
+        grams = sorted((self.grams.get(gram, set()) for gram in inner_trigrams(query)), key=len)
+        if not grams or not grams[0]:
+            return set()
+        candidates = grams[0]
+        for ids in grams[1:]:
+            candidates = candidates & ids
+            if not candidates:
+                return set()
+        matches = set()
+        for contact_id in candidates:
+            if query in self.names[contact_id]:
+                matches.add(contact_id)
+                if len(matches) >= MAX_CANDIDATES:
+                    break
+        return matches
+
+    def _fuzzy_matches(self, query_grams: Set[str]) -> Dict[str, float]:
+        probes = sorted((self.grams[gram] for gram in query_grams if gram in self.grams), key=len)[:FUZZY_PROBES]
+        matches = {}
+        for ids in probes:
+            for contact_id in islice(ids, MAX_CANDIDATES // FUZZY_PROBES):
+                if contact_id not in matches:
+                    matches[contact_id] = similarity(query_grams, trigrams(self.names[contact_id]))
+        return {contact_id: score for contact_id, score in matches.items() if score >= FUZZY_THRESHOLD}
+
+    def search(self, query: str, skip: int = 0, limit: Optional[int] = 20) -> Tuple[List[str], int]:
+        """Ids of the best matching contacts for one page, and the number of matches.
+
+        Each kind of match is cut off at ``MAX_CANDIDATES`` contacts, and
+        weaker kinds are skipped once the page is filled by stronger ones, so
+        for broad queries the count is a lower bound.
+        """
+        normalized = normalize(query)
+        if not normalized:
+            return [], 0
+        query_grams = trigrams(normalized)
+        exact, prefix = self._word_matches(normalized.split())
+        tiers = {contact_id: EXACT for contact_id in exact}
+        for contact_id in prefix:
+            tiers.setdefault(contact_id, PREFIX)
+        # Lower kinds of match rank after everything found so far, so they are
+        # only looked for while the requested page is not full yet
+        wanted = skip + limit if limit is not None else float("inf")
+        if len(normalized) >= 3 and len(tiers) < wanted:
+            for contact_id in self._substring_matches(normalized):
+                tiers.setdefault(contact_id, SUBSTRING)
+            if len(tiers) < wanted:
+                for contact_id in self._fuzzy_matches(query_grams):
+                    tiers.setdefault(contact_id, FUZZY)
+
+        def rank(contact_id: str) -> Tuple[int, float, str]:
+            name = self.names[contact_id]
+            return tiers[contact_id], -similarity(query_grams, trigrams(name)), name
+
+        ranked = sorted(tiers, key=rank)
+        stop = skip + limit if limit is not None else None
+        return ranked[skip:stop], len(ranked)
+
+
+def similarity(a: Set[str], b: Set[str]) -> float:
+    """Jaccard similarity of two trigram sets."""
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
@@ -0,0 +1,82 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.repositories.name_index import normalize
+
+Entry = Tuple[str, str]
+
+
+def name_collation_key(contact: Dict[str, Any]) -> str:
+    """Sort names by their case- and accent-free form ('émile' sorts with 'emile')."""
+    return normalize(contact.get('name') or "")
+
+
+def email_collation_key(contact: Dict[str, Any]) -> str:
+    return (contact.get('email') or "").casefold()
+
+
+def created_collation_key(contact: Dict[str, Any]) -> str:
+    """UUIDv7 ids sort by creation time, so the id itself is the key."""
+    return contact['id']
+
+
+class SortedIndex:
+    """Contact ids kept in order of a precomputed collation key.
+
+    Entries are ``(key, id)`` tuples, so ties are broken by id and every
+    position is unique, which is what a cursor needs. Adding or removing a
+    contact is a bisect plus one list insert/delete; reading a page is a
+    slice. Bulk additions are buffered and merged in by the next read or
+    single write, so consecutive import batches cost one sort, not one each.
+    """
+
+    def __init__(self, key: Callable[[Dict[str, Any]], str]):
+        self.key = key
+        self.entries: List[Entry] = []
+        self.pending: List[Entry] = []
+
+    def __len__(self) -> int:
+        return len(self.entries) + len(self.pending)
+
+    def _settle(self) -> None:
+        if self.pending:
+            # Timsort finds the existing run and merges the new entries into it
+            self.entries.extend(self.pending)
+            self.entries.sort()
+            self.pending = []
+
+    def entry(self, contact: Dict[str, Any]) -> Entry:
+        return self.key(contact), contact['id']
+
+    def build(self, contacts: Iterable[Dict[str, Any]]) -> None:
+        self.entries = sorted(self.entry(contact) for contact in contacts)
+        self.pending = []
+
+    def add(self, contact: Dict[str, Any]) -> None:
+        self._settle()
+        insort(self.entries, self.entry(contact))
+
+    def add_many(self, contacts: Iterable[Dict[str, Any]]) -> None:
+        self.pending.extend(self.entry(contact) for contact in contacts)
+
+    def remove(self, contact: Dict[str, Any]) -> None:
+        self._settle()
+        del self.entries[bisect_left(self.entries, self.entry(contact))]
+
+    def page(self, skip: int = 0, limit: Optional[int] = None, descending: bool = False,
+             after: Optional[Entry] = None) -> List[Entry]:
+        """Entries of one page; with ``after``, the page starts right after that entry."""
+        self._settle()
+        lo, hi = 0, len(self.entries)
+        if after is not None:
+            if descending:
+                hi = bisect_left(self.entries, after)
+            else:
+                lo = bisect_right(self.entries, after)
+        if descending:
+            stop = hi - skip
+            start = stop - limit if limit is not None else lo
+            return self.entries[max(start, lo):max(stop, lo)][::-1]
+        start = lo + skip
+        stop = start + limit if limit is not None else hi
+        return self.entries[min(start, hi):min(stop, hi)]
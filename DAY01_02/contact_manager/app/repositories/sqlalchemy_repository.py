@@ -0,0 +1,198 @@
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, case, delete, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.models import Contact
+from app.repositories.contact_repository import DuplicateContactError, dedupe_key
+from app.repositories.interfaces.contact_repository_interface import IContactRepository
+from app.repositories.name_index import normalize
+from app.utils.pagination import decode_cursor, encode_cursor
+
+# Values per IN (...) list; SQLite allows at most 32766 bound parameters
+KEY_LOOKUP_CHUNK = 500
+
+
+def _stored_key(key: Tuple[Any, Any]) -> Tuple[Any, Any]:
+    """(email_key, phone_key) column values of a ``dedupe_key``; a missing part is stored as ""."""
+    return tuple("" if part is None else part for part in key)
+
+
+def _is_duplicate(error: IntegrityError) -> bool:
+    """Whether ``error`` is a violation of the (email_key, phone_key) unique constraint."""
+    message = str(error.orig)
+    # PostgreSQL and MySQL name the constraint; SQLite lists its columns
+    return "uq_contacts_email_phone" in message or "contacts.email_key, contacts.phone_key" in message
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class SQLAlchemyContactRepository(IContactRepository):
+    """Contacts in a SQL table (see ``app.core.models.Contact``).
+
+    Duplicates are rejected by the unique (email, phone) constraint, pages
+    are read with keyset conditions on the (name, id) and (email, id)
+    indexes, and search is a LIKE over the normalized names. Changes become
+    visible to others when the unit of work commits.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @staticmethod
+    def _contact_to_dict(contact: Contact) -> Dict[str, Any]:
+        return {"name": contact.name, "email": contact.email, "phone": contact.phone, "id": contact.id}
+
+    @staticmethod
+    def _row(contact: Dict[str, Any]) -> Dict[str, Any]:
+        email_key, phone_key = _stored_key(dedupe_key(contact.get('email'), contact.get('phone')))
+        return {
+            "id": contact['id'],
+            "name": contact.get('name'),
+            "email": contact.get('email'),
+            "phone": contact.get('phone'),
+            "name_key": normalize(contact.get('name') or ""),
+            "email_key": email_key,
+            "phone_key": phone_key,
+        }
+
+    async def list(self) -> List[Dict[str, Any]]:
+        result = await self.session.execute(select(Contact))
+        return [self._contact_to_dict(contact) for contact in result.scalars()]
+
+    async def get(self, contact_id: str) -> Optional[Dict[str, Any]]:
+        # Rows change through Core statements, so never answer from the identity map
+        result = await self.session.execute(
+            select(Contact).where(Contact.id == contact_id).execution_options(populate_existing=True)
+        )
+        contact = result.scalar_one_or_none()
+        return self._contact_to_dict(contact) if contact else None
+
+    async def find_duplicate(self, email: Any, phone: Any) -> Optional[Dict[str, Any]]:
+        email_key, phone_key = _stored_key(dedupe_key(email, phone))
+        result = await self.session.execute(
+            select(Contact).where(Contact.email_key == email_key, Contact.phone_key == phone_key)
+        )
+        contact = result.scalar_one_or_none()
+        return self._contact_to_dict(contact) if contact else None
+
+    async def existing_keys(self, keys: Iterable[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        by_stored = {_stored_key(key): key for key in keys}
+        emails = sorted({email for email, _ in by_stored})
+        found = set()
+        for i in range(0, len(emails), KEY_LOOKUP_CHUNK):
+            result = await self.session.execute(
+                select(Contact.email_key, Contact.phone_key)
+                .where(Contact.email_key.in_(emails[i:i + KEY_LOOKUP_CHUNK]))
+            )
+            found.update(by_stored[key] for key in map(tuple, result.all()) if key in by_stored)
+        return found
+
+    async def page(self, sort_by: str = "name", sort_order: str = "asc", skip: int = 0,
+                   limit: Optional[int] = 50, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """One page of contacts in ``sort_by`` order; same shape and cursors as the JSON repository."""
+        # Ids are UUIDv7, so id order is creation order
+        column = {"name": Contact.name_key, "email": Contact.email_key, "created": Contact.id}[sort_by]
+        descending = sort_order == "desc"
+        query = select(Contact)
+        if cursor:
+            key, contact_id = decode_cursor(cursor, sort_by, sort_order)
+            if descending:
+                query = query.where(or_(column < key, and_(column == key, Contact.id < contact_id)))
+            else:
+                query = query.where(or_(column > key, and_(column == key, Contact.id > contact_id)))
+        if descending:
+            query = query.order_by(column.desc(), Contact.id.desc())
+        else:
+            query = query.order_by(column.asc(), Contact.id.asc())
+        # One extra row tells whether another page follows
+        query = query.offset(skip).limit(limit + 1 if limit is not None else None)
+
+        result = await self.session.execute(query)
+        contacts = result.scalars().all()
+        total = (await self.session.execute(select(func.count()).select_from(Contact))).scalar()
+
+        has_next = limit is not None and len(contacts) > limit
+        contacts = contacts[:limit] if limit is not None else contacts
+        last = contacts[-1] if contacts else None
+        return {
+            "items": [self._contact_to_dict(contact) for contact in contacts],
+            "total": total,
+            "skip": skip,
+            "limit": limit,
+            "has_next": has_next,
+            "next_cursor": encode_cursor(sort_by, sort_order, [getattr(last, column.key), last.id]) if has_next else None,
+        }
+
+    async def search(self, query: str, skip: int = 0, limit: Optional[int] = 20) -> Tuple[List[Dict[str, Any]], int]:
+        """Contacts whose normalized name contains ``query``.
+
+        Ranked like the in-memory index, without its typo tolerance: whole
+        name, then names starting with the query, then a word starting with
+        it, then anywhere in the name.
+        """
+        normalized = normalize(query)
+        if not normalized:
+            return [], 0
+        escaped = _escape_like(normalized)
+        condition = Contact.name_key.like(f"%{escaped}%", escape="\\")
+        rank = case(
+            (Contact.name_key == normalized, 0),
+            (Contact.name_key.like(f"{escaped}%", escape="\\"), 1),
+            (Contact.name_key.like(f"% {escaped}%", escape="\\"), 2),
+            else_=3,
+        )
+        result = await self.session.execute(
+            select(Contact).where(condition).order_by(rank, Contact.name_key, Contact.id).offset(skip).limit(limit)
+        )
+        total = (await self.session.execute(select(func.count()).select_from(Contact).where(condition))).scalar()
+        return [self._contact_to_dict(contact) for contact in result.scalars()], total
+
+    async def add(self, contact: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            # A savepoint, so a rejected insert leaves the rest of the transaction usable
+            async with self.session.begin_nested():
+                await self.session.execute(insert(Contact).values(**self._row(contact)))
+        except IntegrityError as e:
+            if not _is_duplicate(e):
+                raise
+            raise DuplicateContactError("Contact already exists.") from None
+        return contact
+
+    async def add_many(self, contacts: List[Dict[str, Any]], schedule_save: bool = True) -> None:
+        """Insert contacts already checked with ``existing_keys``, as one executemany."""
+        if not contacts:
+            return
+        try:
+            async with self.session.begin_nested():
+                await self.session.execute(insert(Contact), [self._row(contact) for contact in contacts])
+        except IntegrityError as e:
+            if not _is_duplicate(e):
+                raise
+            raise DuplicateContactError("Contact already exists.") from None
+
+    async def update(self, contact_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        existing = await self.get(contact_id)
+        if existing is None:
+            return None
+        updated = {**existing, **changes}
+        row = self._row(updated)
+        del row['id']
+        try:
+            async with self.session.begin_nested():
+                await self.session.execute(update(Contact).where(Contact.id == contact_id).values(**row))
+        except IntegrityError as e:
+            if not _is_duplicate(e):
+                raise
+            raise DuplicateContactError("Contact already exists.") from None
+        return updated
+
+    async def delete(self, contact_id: str) -> bool:
+        result = await self.session.execute(delete(Contact).where(Contact.id == contact_id))
+        return result.rowcount > 0
+
+    async def flush(self) -> None:
+        await self.session.flush()
@@ -0,0 +1,3 @@
+from .contact_import import import_contacts
+from .dedup import find_duplicates, merge_duplicates
+__all__ = ["import_contacts", "find_duplicates", "merge_duplicates"]
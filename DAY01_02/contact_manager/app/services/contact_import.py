@@ -0,0 +1,76 @@
+import asyncio
+from typing import IO, Dict, List, Optional, Set, Tuple
+
+from app.api.core import generate_contact_ids
+from app.repositories.interfaces.contact_repository_interface import IContactRepository
+from app.utils.import_utils import read_batches
+from app.utils.normalize import normalize_emails, normalize_phones
+
+# Rows normalized per step; between steps the event loop serves other requests
+IMPORT_BATCH_SIZE = 5000
+
+Row = Optional[Dict[str, str]]
+
+FIELDS = ('name', 'email', 'phone')
+NO_FIELDS = ("", "", "")
+
+
+def _fields(row: Row) -> Tuple[str, str, str]:
+    """The row's name, email and phone; all empty (an invalid row) if one is missing or not a string."""
+    if row is None:
+        return NO_FIELDS
+    values = tuple(row.get(field) for field in FIELDS)
+    return values if all(isinstance(value, str) for value in values) else NO_FIELDS
+
+
+def _normalize_batch(rows: List[Row]) -> List[Optional[Tuple[str, str, str]]]:
+    """(name, email, phone) per row, normalized column by column; None if invalid."""
+    fields = [_fields(row) for row in rows]
+    names = [name.strip() for name, _, _ in fields]
+    emails = normalize_emails([email for _, email, _ in fields])
+    phones = normalize_phones([phone for _, _, phone in fields])
+    return [(name, email, phone) if name and email and phone else None
+            for name, email, phone in zip(names, emails, phones)]
+
+
+def _read_and_normalize(batches) -> Optional[List[Optional[Tuple[str, str, str]]]]:
+    batch = next(batches, None)
+    return _normalize_batch(batch) if batch is not None else None
+
+
+async def import_contacts(file: IO[bytes], fmt: str, repository: IContactRepository) -> Dict[str, int]:
+    """Add every new, valid contact of a CSV/NDJSON file and save once.
+
+    Rows are parsed and normalized (email lower-cased, phone in E.164) in a
+    worker thread, a batch at a time. A row is a duplicate if its (email,
+    phone) is already stored or appeared earlier in the file. Returns the
+    inserted, duplicate and invalid counts.
+    """
+    counts = {"inserted": 0, "duplicates": 0, "invalid": 0}
+    seen: Set[Tuple[str, str]] = set()
+    batches = read_batches(file, fmt, IMPORT_BATCH_SIZE)
+    while True:
+        normalized = await asyncio.to_thread(_read_and_normalize, batches)
+        if normalized is None:
+            break
+        # One lookup per batch, so a SQL repository answers with a few queries
+        stored = await repository.existing_keys((row[1], row[2]) for row in normalized if row is not None)
+        new_contacts = []
+        for row in normalized:
+            if row is None:
+                counts["invalid"] += 1
+                continue
+            name, email, phone = row
+            key = (email, phone)
+            if key in seen or key in stored:
+                counts["duplicates"] += 1
+                continue
+            seen.add(key)
+            new_contacts.append({"name": name, "email": email, "phone": phone})
+        for contact, contact_id in zip(new_contacts, generate_contact_ids(len(new_contacts))):
+            contact['id'] = contact_id
+        await repository.add_many(new_contacts, schedule_save=False)
+        counts["inserted"] += len(new_contacts)
+    # One write (JSON) or flush (SQL) for the whole import, finished before the counts are reported
+    await repository.flush()
+    return counts
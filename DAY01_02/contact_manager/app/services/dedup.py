@@ -0,0 +1,224 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from app.repositories.contact_repository import DuplicateContactError
+from app.repositories.interfaces.contact_repository_interface import IContactRepository
+from app.repositories.name_index import normalize
+from app.utils.normalize import normalize_email, normalize_phone
+
+# Pairs scoring at least this are reported as duplicates
+DEFAULT_THRESHOLD = 0.85
+# Blocks larger than this are not compared all-pairs; their contacts are
+# sorted by name and each is compared with the next BLOCK_WINDOW only
+MAX_BLOCK_SIZE = 50
+BLOCK_WINDOW = 10
+# Trailing digits of a phone number used as a blocking key (ignores country/area prefixes)
+PHONE_SUFFIX = 7
+
+WEIGHTS = {"name": 0.5, "email": 0.25, "phone": 0.25}
+# Jaro-Winkler only rewards a common prefix for strings already this similar
+WINKLER_BOOST_THRESHOLD = 0.7
+
+_SOUNDEX = str.maketrans("bfpvcgjkqsxzdtlmnr", "111122222222334556", "aeiouyhw")
+
+
+def soundex(word: str) -> str:
+    """American Soundex code of a word ('Robert' and 'Rupert' -> 'R163')."""
+    word = "".join(c for c in word.lower() if c.isalpha())
+    if not word:
+        return ""
+    codes = []
+    previous = word[0].translate(_SOUNDEX)
+    for char in word[1:]:
+        code = char.translate(_SOUNDEX) if char not in "hw" else previous
+        if code and code != previous:
+            codes.append(code)
+        previous = code
+    return (word[0].upper() + "".join(codes) + "000")[:4]
+
+
+def jaro_winkler(a: str, b: str) -> float:
+    """Similarity from 0 to 1 that forgives typos and transpositions and favours a shared prefix."""
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    window = max(max(len(a), len(b)) // 2 - 1, 0)
+    matched_b = [False] * len(b)
+    a_matches = []
+    for i, char in enumerate(a):
+        for j in range(max(0, i - window), min(len(b), i + window + 1)):
+            if not matched_b[j] and b[j] == char:
+                matched_b[j] = True
+                a_matches.append(char)
+                break
+    if not a_matches:
+        return 0.0
+    b_matches = [char for char, matched in zip(b, matched_b) if matched]
+    transpositions = sum(x != y for x, y in zip(a_matches, b_matches)) / 2
+    m = len(a_matches)
+    jaro = (m / len(a) + m / len(b) + (m - transpositions) / m) / 3
+    if jaro <= WINKLER_BOOST_THRESHOLD:
+        return jaro
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return jaro + prefix * 0.1 * (1 - jaro)
+
+
+class _Profile:
+    """The normalized fields of one contact that matching looks at."""
+
+    __slots__ = ("id", "name", "email", "local", "phone")
+
+    def __init__(self, contact: Dict[str, Any]):
+        self.id = contact['id']
+        self.name = normalize(contact.get('name') or "")
+        self.email = normalize_email(contact.get('email')) or ""
+        self.local = self.email.split("@")[0].split("+")[0].replace(".", "")
+        self.phone = normalize_phone(contact.get('phone')) or ""
+
+    def blocking_keys(self) -> Iterator[str]:
+        tokens = self.name.split()
+        if tokens:
+            # First initial plus the sound of the last name: 'Jon Smyth' ~ 'John Smith'
+            yield f"n:{tokens[0][0]}{soundex(tokens[-1])}"
+        if len(self.phone) > PHONE_SUFFIX:
+            yield f"p:{self.phone[-PHONE_SUFFIX:]}"
+        if self.local:
+            yield f"e:{self.local}"
+
+
+def score(a: _Profile, b: _Profile, threshold: float = 0.0) -> float:
+    """Weighted similarity of two contacts, from 0 (unrelated) to 1 (same fields).
+
+    Returns 0 early, without the string comparisons, when the cheap exact
+    checks show the pair cannot reach ``threshold``.
+    """
+    if a.phone and a.phone == b.phone:
+        phone = 1.0
+    elif a.phone and a.phone[-PHONE_SUFFIX:] == b.phone[-PHONE_SUFFIX:]:
+        phone = 0.9
+    else:
+        phone = 0.0
+    if a.email and a.email == b.email:
+        email = 1.0
+    elif a.local and a.local == b.local:
+        email = 0.8
+    else:
+        # A different email is worth at most half
+        if WEIGHTS["name"] + WEIGHTS["email"] * 0.5 + WEIGHTS["phone"] * phone < threshold:
+            return 0.0
+        email = jaro_winkler(a.email, b.email) * 0.5
+    if WEIGHTS["name"] + WEIGHTS["email"] * email + WEIGHTS["phone"] * phone < threshold:
+        return 0.0
+    return WEIGHTS["name"] * jaro_winkler(a.name, b.name) + WEIGHTS["email"] * email + WEIGHTS["phone"] * phone
+
+
+def _block_pairs(block: List[_Profile]) -> Iterator[Tuple[_Profile, _Profile]]:
+    if len(block) <= MAX_BLOCK_SIZE:
+        for i, a in enumerate(block):
+            for b in block[i + 1:]:
+                yield a, b
+        return
+    # Sorted neighbourhood keeps a huge block (a shared phone suffix, a common
+    # name) linear instead of quadratic
+    block = sorted(block, key=lambda profile: profile.name)
+    for i, a in enumerate(block):
+        for b in block[i + 1:i + 1 + BLOCK_WINDOW]:
+            yield a, b
+
+
+def _find(parents: Dict[str, str], contact_id: str) -> str:
+    while parents[contact_id] != contact_id:
+        parents[contact_id] = parents[parents[contact_id]]
+        contact_id = parents[contact_id]
+    return contact_id
+
+
+def find_duplicates(contacts: Iterable[Dict[str, Any]], threshold: float = DEFAULT_THRESHOLD) -> Dict[str, Any]:
+    """Group likely duplicates.
+
+    Contacts are only compared with others sharing a blocking key (name
+    sound, phone suffix or email local part), so the work grows with the
+    number of contacts rather than its square. Matching pairs are joined
+    transitively into groups. Each group keeps the contact with the most
+    filled-in fields (then the lowest id); ``merge_into`` lists the others
+    with their score against it.
+    """
+    profiles = [_Profile(contact) for contact in contacts]
+    blocks: Dict[str, List[_Profile]] = defaultdict(list)
+    for profile in profiles:
+        for key in profile.blocking_keys():
+            blocks[key].append(profile)
+
+    compared: Set[Tuple[str, str]] = set()
+    parents: Dict[str, str] = {}
+    pairs = 0
+    for block in blocks.values():
+        if len(block) < 2:
+            continue
+        for a, b in _block_pairs(block):
+            pair = (a.id, b.id) if a.id < b.id else (b.id, a.id)
+            if pair in compared:
+                continue
+            compared.add(pair)
+            pairs += 1
+            if score(a, b, threshold) >= threshold:
+                for contact_id in pair:
+                    parents.setdefault(contact_id, contact_id)
+                parents[_find(parents, pair[0])] = _find(parents, pair[1])
+
+    by_id = {profile.id: profile for profile in profiles}
+    groups: Dict[str, List[str]] = defaultdict(list)
+    for contact_id in parents:
+        groups[_find(parents, contact_id)].append(contact_id)
+
+    candidates = []
+    for members in groups.values():
+        keep = min(members, key=lambda contact_id: (-_filled(by_id[contact_id]), contact_id))
+        candidates.append({
+            "keep": keep,
+            "merge_into": [
+                {"id": contact_id, "score": round(score(by_id[keep], by_id[contact_id]), 3)}
+                for contact_id in sorted(members) if contact_id != keep
+            ],
+        })
+    candidates.sort(key=lambda candidate: candidate["keep"])
+    return {"contacts": len(profiles), "pairs_compared": pairs, "candidates": candidates}
+
+
+def _filled(profile: _Profile) -> int:
+    return bool(profile.name) + bool(profile.email) + bool(profile.phone)
+
+
+async def merge_duplicates(repository: IContactRepository, candidates: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Apply ``find_duplicates`` groups: fill the kept contact's empty fields
+    from its duplicates, then delete the duplicates."""
+    merged = skipped = 0
+    for candidate in candidates:
+        keep = await repository.get(candidate["keep"])
+        if keep is None:
+            skipped += len(candidate["merge_into"])
+            continue
+        for duplicate in candidate["merge_into"]:
+            other: Optional[Dict[str, Any]] = await repository.get(duplicate["id"])
+            if other is None:
+                skipped += 1
+                continue
+            fill = {field: value for field, value in other.items() if field != 'id' and value and not keep.get(field)}
+            # Delete first: the filled-in contact often takes over the
+            # duplicate's (email, phone), which must be free by then
+            await repository.delete(other['id'])
+            try:
+                if fill:
+                    keep = await repository.update(keep['id'], fill)
+            except DuplicateContactError:
+                # Clashes with a third contact; leave both as they were
+                await repository.add(other)
+                skipped += 1
+                continue
+            merged += 1
+    return {"merged": merged, "skipped": skipped}
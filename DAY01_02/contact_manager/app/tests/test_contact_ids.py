@@ -0,0 +1,83 @@
+import threading
+import uuid
+
+import pytest
+
+from app.api.core.contact import MAX_COUNTER, ContactIdGenerator, id_timestamp_ms
+
+MS = 1_000_000  # nanoseconds
+
+
+class FakeClock:
+    def __init__(self, ms: int = 1_700_000_000_000):
+        self.ns = ms * MS
+
+    def __call__(self) -> int:
+        return self.ns
+
+
+def test_ids_are_uuid7_and_carry_their_creation_time():
+    clock = FakeClock()
+    contact_id = ContactIdGenerator(clock).next_id()
+    parsed = uuid.UUID(contact_id)
+    assert str(parsed) == contact_id
+    assert parsed.version == 7
+    assert parsed.variant == uuid.RFC_4122
+    assert id_timestamp_ms(contact_id) == clock.ns // MS
+
+
+def test_ids_sort_in_creation_order():
+    clock = FakeClock()
+    generator = ContactIdGenerator(clock)
+    ids = [generator.next_id() for _ in range(10)]
+    clock.ns += 5 * MS
+    ids += generator.next_ids(10)
+    assert ids == sorted(ids)
+    assert len(set(ids)) == 20
+
+
+def test_counter_overflow_borrows_the_next_millisecond():
+    clock = FakeClock()
+    generator = ContactIdGenerator(clock)
+    ids = generator.next_ids(MAX_COUNTER + 3)
+    assert ids == sorted(ids)
+    assert [id_timestamp_ms(i) - clock.ns // MS for i in ids[MAX_COUNTER:]] == [0, 1, 1]
+    # Catching up with the borrowed millisecond does not reuse it
+    clock.ns += MS
+    later = generator.next_id()
+    assert later > ids[-1]
+    assert id_timestamp_ms(later) == clock.ns // MS
+
+
+def test_ids_keep_increasing_when_the_clock_steps_back():
+    clock = FakeClock()
+    generator = ContactIdGenerator(clock)
+    first = generator.next_id()
+    clock.ns -= 1000 * MS
+    second = generator.next_id()
+    assert second > first
+    assert id_timestamp_ms(second) == id_timestamp_ms(first)
+
+
+def test_ids_from_many_threads_are_unique():
+    generator = ContactIdGenerator()
+    results = [[] for _ in range(8)]
+
+    def generate(out):
+        out.extend(generator.next_id() for _ in range(2000))
+
+    threads = [threading.Thread(target=generate, args=(out,)) for out in results]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    ids = [contact_id for out in results for contact_id in out]
+    assert len(set(ids)) == len(ids)
+    # Each thread saw its own ids increase
+    assert all(out == sorted(out) for out in results)
+
+
+def test_negative_count_is_rejected():
+    with pytest.raises(ValueError):
+        ContactIdGenerator().next_ids(-1)
+    assert ContactIdGenerator().next_ids(0) == []
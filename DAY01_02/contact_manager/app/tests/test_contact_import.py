@@ -0,0 +1,94 @@
+import io
+import json
+
+import httpx
+import pytest
+
+from app.dependencies import get_uow
+from app.main import app
+from app.repositories.contact_repository import ContactRepository
+from app.services import import_contacts
+from app.unit_of_work import JsonUnitOfWork
+
+
+def ndjson(*rows):
+    return "".join(row if isinstance(row, str) else json.dumps(row) + "\n" for row in rows).encode()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    return ContactRepository(tmp_path / "contacts.json", flush_delay=3600)
+
+
+@pytest.mark.asyncio
+async def test_csv_import_normalizes_and_counts_rows(repo, tmp_path):
+    data = (
+        "phone,name,email,notes\n"
+        "(555) 010-0001, Ada Lovelace ,ADA@Example.com,x\n"
+        "555.010.0001,Ada again,ada@example.com ,\n"  # same (email, phone) after normalizing
+        "5550100002,No Email,,\n"
+        "12,Short Phone,short@example.com,\n"
+        "+44 20 7946 0000,Bob,not-an-email,\n"
+        "0044 20 7946 0000,Bob,bob@example.com\n"
+    ).encode()
+    counts = await import_contacts(io.BytesIO(data), "csv", repo)
+    assert counts == {"inserted": 2, "duplicates": 1, "invalid": 3}
+    stored = sorted((c["name"], c["email"], c["phone"]) for c in await repo.list())
+    assert stored == [("Ada Lovelace", "ada@example.com", "+15550100001"), ("Bob", "bob@example.com", "+442079460000")]
+    # Saved before the counts were returned
+    assert len(json.loads((tmp_path / "contacts.json").read_text())) == 2
+
+
+@pytest.mark.asyncio
+async def test_ndjson_rows_that_are_not_contacts_are_invalid(repo):
+    data = ndjson(
+        {"name": "A B", "email": "ab@example.com", "phone": "5550100001"},
+        {"name": "A B", "email": 5, "phone": "5550100002"},
+        {"name": ["A", "B"], "email": "list@example.com", "phone": "5550100003"},
+        {"name": "Num Phone", "email": "num@example.com", "phone": 5550100004},
+        {"name": None, "email": "none@example.com", "phone": "5550100005"},
+        {"email": "noname@example.com", "phone": "5550100006"},
+        ["not", "an", "object"],
+        "{torn line\n",
+        "\n",
+    )
+    counts = await import_contacts(io.BytesIO(data), "ndjson", repo)
+    assert counts == {"inserted": 1, "duplicates": 0, "invalid": 7}
+    assert [c["email"] for c in await repo.list()] == ["ab@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_rows_already_stored_are_duplicates(repo):
+    await repo.add({"id": "stored", "name": "Ada", "email": "ada@example.com", "phone": "+15550100001"})
+    data = ndjson({"name": "Ada L", "email": "Ada@example.com", "phone": "555 010 0001"},
+                  {"name": "Cy", "email": "cy@example.com", "phone": "5550100003"})
+    assert await import_contacts(io.BytesIO(data), "ndjson", repo) == {"inserted": 1, "duplicates": 1, "invalid": 0}
+    assert len(await repo.list()) == 2
+
+
+@pytest.fixture
+def client(repo):
+    app.dependency_overrides[get_uow] = lambda: JsonUnitOfWork(repo)
+    yield httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_import_endpoint_counts_non_string_fields_as_invalid(client):
+    async with client:
+        response = await client.post("/contacts/import", content=ndjson({"name": "A B", "email": 5}),
+                                     headers={"content-type": "application/x-ndjson"})
+    assert response.status_code == 200
+    assert response.json() == {"inserted": 0, "duplicates": 0, "invalid": 1}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("body", [
+    b"name,email,phone\n" + b"x" * (1 << 18) + b",a@example.com,5550100001\n",  # field over the csv size limit
+    b"name,email,phone\n\xff\xfe,a@example.com,5550100001\n",  # not UTF-8
+], ids=["oversized-field", "not-utf8"])
+async def test_unreadable_csv_is_a_bad_request(client, body):
+    async with client:
+        response = await client.post("/contacts/import", content=body, headers={"content-type": "text/csv"})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Could not read the import file")
@@ -0,0 +1,102 @@
+import json
+import logging
+import sys
+
+import pytest
+
+from app.api.core.contact import generate_contact_id
+from app.repositories.contact_repository import ContactRepository, DuplicateContactError
+
+
+def contact(name, email, phone="+15550100"):
+    return {"id": generate_contact_id(), "name": name, "email": email, "phone": phone}
+
+
+def consistent(repo: ContactRepository) -> bool:
+    """Every index holds exactly the stored contacts, under their current values."""
+    ids = set(repo.by_id)
+    if set(repo.by_key.values()) != ids or set(repo.names.names) != ids:
+        return False
+    return all(
+        sorted(index.entries + index.pending) == sorted(index.entry(c) for c in repo.by_id.values())
+        for index in repo.sorted.values()
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    return ContactRepository(tmp_path / "contacts.json", flush_delay=3600)
+
+
+@pytest.mark.asyncio
+async def test_indexes_follow_updates_and_deletes(repo):
+    ada = contact("Ada Lovelace", "ada@example.com")
+    bob = contact("Bob Stone", "bob@example.com")
+    cy = contact("Cy Young", "cy@example.com")
+    for c in (ada, bob, cy):
+        await repo.add(c)
+
+    await repo.update(bob["id"], {"name": "Zed Stone", "email": "zed@example.com"})
+    assert consistent(repo)
+    assert (await repo.find_duplicate("ZED@example.com", "+1 555 0100"))["id"] == bob["id"]
+    assert await repo.find_duplicate("bob@example.com", "+15550100") is None
+    assert [c["name"] for c in (await repo.page("name"))["items"]] == ["Ada Lovelace", "Cy Young", "Zed Stone"]
+    assert [c["id"] for c in (await repo.search("zed"))[0]] == [bob["id"]]
+    assert (await repo.search("bob"))[1] == 0
+
+    assert await repo.delete(ada["id"])
+    assert not await repo.delete(ada["id"])
+    assert consistent(repo)
+    assert [c["email"] for c in (await repo.page("email", "desc"))["items"]] == ["zed@example.com", "cy@example.com"]
+    assert (await repo.search("ada"))[1] == 0
+    # The deleted contact's (email, phone) is free again
+    await repo.add(contact("Ada Again", "ada@example.com"))
+    assert consistent(repo)
+
+
+@pytest.mark.asyncio
+async def test_update_to_an_existing_email_and_phone_is_rejected(repo):
+    ada, bob = contact("Ada", "ada@example.com"), contact("Bob", "bob@example.com")
+    await repo.add(ada)
+    await repo.add(bob)
+    with pytest.raises(DuplicateContactError):
+        await repo.update(bob["id"], {"email": "ADA@example.com"})
+    with pytest.raises(DuplicateContactError):
+        await repo.add(contact("Ada 2", "ada@example.com"))
+    assert (await repo.get(bob["id"]))["email"] == "bob@example.com"
+    assert consistent(repo)
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_changes_and_reload_rebuilds_the_indexes(repo, tmp_path):
+    ada = contact("Ada", "ada@example.com")
+    await repo.add(ada)
+    await repo.update(ada["id"], {"name": "Ada L"})
+    await repo.close()
+    assert json.loads((tmp_path / "contacts.json").read_text()) == [{**ada, "name": "Ada L"}]
+
+    reloaded = ContactRepository(tmp_path / "contacts.json")
+    await reloaded.load()
+    assert consistent(reloaded)
+    assert [c["id"] for c in (await reloaded.search("ada"))[0]] == [ada["id"]]
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_logged_raised_and_retried(repo, tmp_path, monkeypatch, caplog):
+    module = sys.modules[ContactRepository.__module__]
+    write = module.write_contacts
+
+    async def failing_write(contacts, path):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(module, "write_contacts", failing_write)
+    await repo.add(contact("Ada", "ada@example.com"))
+    with caplog.at_level(logging.ERROR, logger="app.repositories.contact_repository"):
+        with pytest.raises(OSError):
+            await repo.flush()
+    assert "disk full" in caplog.text
+    assert not (tmp_path / "contacts.json").exists()
+
+    monkeypatch.setattr(module, "write_contacts", write)
+    await repo.flush()
+    assert len(json.loads((tmp_path / "contacts.json").read_text())) == 1
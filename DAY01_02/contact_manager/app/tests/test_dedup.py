@@ -0,0 +1,105 @@
+import pytest
+
+from app.repositories.contact_repository import ContactRepository
+from app.services.dedup import find_duplicates, jaro_winkler, merge_duplicates, soundex
+
+
+@pytest.mark.parametrize("word, code", [
+    ("Robert", "R163"),
+    ("Rupert", "R163"),
+    ("Rubin", "R150"),
+    ("Ashcraft", "A261"),  # h between two letters of one code keeps them one
+    ("Tymczak", "T522"),  # vowels separate equal codes
+    ("Pfister", "P236"),  # the first letter's code absorbs the next one
+    ("Honeyman", "H555"),
+    ("O'Hara", "O600"),
+    ("", ""),
+])
+def test_soundex(word, code):
+    assert soundex(word) == code
+
+
+@pytest.mark.parametrize("a, b, similarity", [
+    ("martha", "marhta", 0.961),
+    ("dwayne", "duane", 0.84),
+    ("dixon", "dicksonx", 0.813),
+    ("same", "same", 1.0),
+    ("abc", "", 0.0),
+    ("abc", "xyz", 0.0),
+])
+def test_jaro_winkler(a, b, similarity):
+    assert jaro_winkler(a, b) == pytest.approx(similarity, abs=0.001)
+    assert jaro_winkler(b, a) == pytest.approx(similarity, abs=0.001)
+
+
+def test_jaro_winkler_gives_no_prefix_bonus_to_dissimilar_strings():
+    # Jaro alone is (2/10 + 2/10 + 1) / 3; the shared "ab" must not lift it
+    assert jaro_winkler("abxxxxxxxx", "abyyyyyyyy") == pytest.approx(0.4667, abs=0.001)
+
+
+CONTACTS = [
+    {"id": "1", "name": "John Smith", "email": "john.smith@example.com", "phone": "+15550100001"},
+    {"id": "2", "name": "Jon Smyth", "email": "johnsmith@work.example", "phone": "555-010-0001"},
+    {"id": "3", "name": "John  Smith", "email": "JOHN.SMITH@example.com", "phone": "(555) 010-0001"},
+    {"id": "4", "name": "Mary Jones", "email": "mary@example.com", "phone": "+15550100004"},
+    {"id": "5", "name": "Mary Jane", "email": "mj@other.example", "phone": "+15550100005"},
+    {"id": "6", "name": "Alice Brown", "email": "alice@example.com", "phone": "+15550100006"},
+]
+
+
+def test_find_duplicates_groups_matching_contacts():
+    report = find_duplicates(CONTACTS)
+    assert report["contacts"] == 6
+    # Only contacts sharing a blocking key are compared
+    assert 0 < report["pairs_compared"] < 15
+    # John Smith and his two lookalikes form one group; the Marys and Alice
+    # are different people
+    assert [(c["keep"], [m["id"] for m in c["merge_into"]]) for c in report["candidates"]] == [("1", ["2", "3"])]
+    assert all(0.85 <= m["score"] <= 1 for m in report["candidates"][0]["merge_into"])
+
+
+def test_find_duplicates_threshold():
+    # Only the contact that differs in formatting alone is a perfect match
+    assert find_duplicates(CONTACTS, threshold=1.0)["candidates"] == [
+        {"keep": "1", "merge_into": [{"id": "3", "score": 1.0}]},
+    ]
+
+
+def test_find_duplicates_keeps_the_most_complete_contact():
+    sparse = {"id": "1", "name": "John Smith", "email": "john.smith@example.com", "phone": ""}
+    full = {**sparse, "id": "2", "phone": "+15550100001"}
+    assert [c["keep"] for c in find_duplicates([sparse, full], threshold=0.75)["candidates"]] == ["2"]
+
+
+@pytest.mark.asyncio
+async def test_merge_fills_the_kept_contact_and_deletes_the_rest(tmp_path):
+    repo = ContactRepository(tmp_path / "contacts.json", flush_delay=3600)
+    keep = {"id": "1", "name": "John Smith", "email": "john.smith@example.com", "phone": ""}
+    duplicate = {"id": "2", "name": "Jon Smith", "email": "john.smith@example.com", "phone": "+15550100001"}
+    other = {"id": "3", "name": "Alice Brown", "email": "alice@example.com", "phone": "+15550100006"}
+    for contact in (keep, duplicate, other):
+        await repo.add(contact)
+    candidates = [{"keep": "1", "merge_into": [{"id": "2", "score": 0.9}, {"id": "gone", "score": 0.9}]}]
+
+    assert await merge_duplicates(repo, candidates) == {"merged": 1, "skipped": 1}
+    assert sorted(c["id"] for c in await repo.list()) == ["1", "3"]
+    assert (await repo.get("1"))["phone"] == "+15550100001"
+    assert (await repo.get("1"))["name"] == "John Smith"
+    assert (await repo.find_duplicate("john.smith@example.com", "+15550100001"))["id"] == "1"
+    assert (await repo.search("jon"))[1] == 0
+
+
+@pytest.mark.asyncio
+async def test_merge_skips_a_duplicate_whose_fields_clash_with_another_contact(tmp_path):
+    repo = ContactRepository(tmp_path / "contacts.json", flush_delay=3600)
+    keep = {"id": "1", "name": "John Smith", "email": "john.smith@example.com", "phone": ""}
+    duplicate = {"id": "2", "name": "John Smith", "email": "js@example.com", "phone": "+15550100001"}
+    # Already has the (email, phone) the kept contact would get
+    third = {"id": "3", "name": "Someone Else", "email": "john.smith@example.com", "phone": "+15550100001"}
+    for contact in (keep, duplicate, third):
+        await repo.add(contact)
+
+    assert await merge_duplicates(repo, [{"keep": "1", "merge_into": [{"id": "2", "score": 0.9}]}]) == {
+        "merged": 0, "skipped": 1,
+    }
+    assert [await repo.get(contact_id) for contact_id in ("1", "2", "3")] == [keep, duplicate, third]
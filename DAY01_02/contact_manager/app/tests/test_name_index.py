@@ -0,0 +1,99 @@
+import pytest
+
+from app.repositories import name_index
+from app.repositories.name_index import NameSearchIndex, normalize
+
+
+def index_of(names):
+    index = NameSearchIndex()
+    for contact_id, name in names.items():
+        index.add(contact_id, name)
+    return index
+
+
+def test_normalize():
+    assert normalize("José  Núñez") == "jose nunez"
+    assert normalize(" O'Brien-Smith ") == "o brien smith"
+    assert normalize("ÉMILE") == normalize("emile") == "emile"
+
+
+def test_matches_rank_exact_then_prefix_then_substring_then_fuzzy():
+    index = index_of({
+        "fuzzy": "Wiliams Roe",
+        "substring": "Mcwilliams Jo",
+        "prefix": "Williamson Kay",
+        "exact": "Robin Williams",
+        "other": "Bob Stone",
+    })
+    ids, total = index.search("williams")
+    assert ids == ["exact", "prefix", "substring", "fuzzy"]
+    assert total == 4
+
+
+def test_prefix_and_substring_hits():
+    index = index_of({"1": "John Smith", "2": "Johanna Lee", "3": "Bo Johnson", "4": "Ann Lee"})
+    # Type-ahead on any word of the name
+    assert sorted(index.search("jo")[0]) == ["1", "2", "3"]
+    assert sorted(index.search("lee jo")[0]) == ["2"]
+    # Queries of three letters or more also match inside words
+    assert index.search("ohns")[0] == ["3"]
+    assert index.search("hanna")[0] == ["2"]
+    # Shorter ones only match word starts
+    assert index.search("oh") == ([], 0)
+    assert index.search("  ") == ([], 0)
+
+
+def test_fuzzy_matches_survive_typos():
+    index = index_of({"1": "Catherine Zeta", "2": "Jonathan Smith", "3": "Bob Stone"})
+    assert index.search("katherine")[0] == ["1"]
+    assert index.search("jonathon smyth")[0] == ["2"]
+    assert index.search("xyzzy") == ([], 0)
+
+
+def structure(index):
+    return index.names, index.tokens, index.grams, index.trie
+
+
+def test_postings_and_trie_follow_adds_renames_and_deletes():
+    index = index_of({"1": "John Smith", "2": "Johnny Smith"})
+    index.add("3", "Ann Lee")
+    index.add("1", "Jon Smyth")  # rename
+    index.remove("2")
+    index.remove("missing")
+
+    # Same state as an index built from the final names only
+    assert structure(index) == structure(index_of({"1": "Jon Smyth", "3": "Ann Lee"}))
+    assert "john" not in index.tokens and "j" in index.trie and "h" not in index.trie["j"]["o"]
+    assert index.search("john") == ([], 0)
+    assert index.search("jon")[0] == ["1"]
+    assert index.search("smyth")[0] == ["1"]
+    assert len(index) == 2
+
+    index.remove("1")
+    index.remove("3")
+    assert structure(index) == ({}, {}, {}, {})
+
+
+def test_search_pages_through_the_ranking():
+    index = index_of({str(i): f"Ann {chr(ord('a') + i)}" for i in range(10)})
+    ids, total = index.search("ann", limit=None)
+    assert total == 10
+    assert index.search("ann", skip=3, limit=4) == (ids[3:7], 10)
+    assert index.search("ann", skip=9, limit=4) == (ids[9:], 10)
+
+
+def test_each_kind_of_match_is_capped(monkeypatch):
+    monkeypatch.setattr(name_index, "MAX_CANDIDATES", 10)
+    names = {f"exact{i}": f"John {i}" for i in range(30)}
+    names.update({f"prefix{i}": f"Johnson {i}" for i in range(30)})
+    index = index_of(names)
+
+    # Whole words fill the capped candidates before longer completions do,
+    # and a full page skips the weaker kinds of match, so total is a lower bound
+    ids, total = index.search("john", limit=5)
+    assert total == 10
+    assert all(contact_id.startswith("exact") for contact_id in ids)
+    # Without a limit, substring and fuzzy matches add at most 10 each
+    assert 10 < index.search("john", limit=None)[1] <= 30
+    assert index.search("johns", limit=5)[1] == 10  # prefix matches only
+    assert index.search("ohnso", limit=5)[1] == 10  # substring matches only
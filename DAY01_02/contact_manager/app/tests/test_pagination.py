@@ -0,0 +1,76 @@
+import pytest
+import pytest_asyncio
+
+from app.api.core.contact import generate_contact_id
+from app.repositories.contact_repository import ContactRepository
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+@pytest_asyncio.fixture
+async def repo(tmp_path):
+    repo = ContactRepository(tmp_path / "contacts.json", flush_delay=3600)
+    for i, name in enumerate(["dora", "Émile", "emile", "Ann", "bob", "Carl", "ann"]):
+        email = f"{name.lower()}{i}@example.com"
+        await repo.add({"id": generate_contact_id(), "name": name, "email": email, "phone": str(i)})
+    return repo
+
+
+async def walk(repo, sort_by, sort_order, limit):
+    ids, cursor = [], None
+    while True:
+        page = await repo.page(sort_by, sort_order, limit=limit, cursor=cursor)
+        ids += [contact["id"] for contact in page["items"]]
+        cursor = page["next_cursor"]
+        assert page["has_next"] == (cursor is not None)
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort_by", ["name", "email", "created"])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+@pytest.mark.parametrize("limit", [1, 2, 3, 7, 50])
+async def test_cursor_pages_cover_the_listing_once(repo, sort_by, sort_order, limit):
+    everything = [contact["id"] for contact in (await repo.page(sort_by, sort_order, limit=None))["items"]]
+    assert len(everything) == 7
+    assert await walk(repo, sort_by, sort_order, limit) == everything
+
+
+@pytest.mark.asyncio
+async def test_cursor_survives_changes_between_pages(repo):
+    first = await repo.page("name", limit=3)
+    assert [c["name"] for c in first["items"]] == ["Ann", "ann", "bob"]
+    # A contact deleted before the cursor and one added after it
+    await repo.delete(first["items"][0]["id"])
+    await repo.add({"id": generate_contact_id(), "name": "Zoe", "email": "zoe@example.com", "phone": "9"})
+    rest = await repo.page("name", limit=50, cursor=first["next_cursor"])
+    # Émile and emile collate equal and are ordered by id, i.e. creation
+    assert [c["name"] for c in rest["items"]] == ["Carl", "dora", "Émile", "emile", "Zoe"]
+
+
+@pytest.mark.asyncio
+async def test_cursor_from_another_sort_is_rejected(repo):
+    cursor = (await repo.page("name", limit=1))["next_cursor"]
+    with pytest.raises(ValueError):
+        await repo.page("email", cursor=cursor)
+    with pytest.raises(ValueError):
+        await repo.page("name", "desc", cursor=cursor)
+
+
+@pytest.mark.parametrize("position", [
+    ["ann"],
+    ["ann", "id", "extra"],
+    [1, "id"],
+    ["ann", None],
+    [["ann"], "id"],
+    {"key": "ann"},
+])
+def test_forged_cursor_positions_are_rejected(position):
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor("name", "asc", position), "name", "asc")
+
+
+@pytest.mark.parametrize("cursor", ["", "not base64!", "bm90IGpzb24"])
+def test_garbled_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, "name", "asc")
@@ -0,0 +1,153 @@
+import json
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import unit_of_work
+from app.api.core.contact import generate_contact_id
+from app.core.models import Base
+from app.repositories.contact_repository import ContactRepository, DuplicateContactError
+from app.repositories.sqlalchemy_repository import SQLAlchemyContactRepository
+from tools import migrate_contacts
+
+CONTACTS = [
+    {"name": "dora", "email": "Dora@example.com", "phone": "555 010 0001"},
+    {"name": "Émile", "email": "emile@example.com", "phone": "+15550100002"},
+    {"name": "emile", "email": "emile2@example.com", "phone": "+15550100003"},
+    {"name": "Ann Smith", "email": "ann@example.com", "phone": "+15550100004"},
+    {"name": "bob", "email": "bob@example.com", "phone": None},
+    {"name": "Carl Annan", "email": "carl@example.com", "phone": "+15550100006"},
+]
+
+
+@pytest_asyncio.fixture
+async def engine():
+    # One shared connection, so every session sees the same in-memory database
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool,
+                                 connect_args={"check_same_thread": False})
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def repo(engine):
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        repo = SQLAlchemyContactRepository(session)
+        await repo.add_many([{**contact, "id": generate_contact_id()} for contact in CONTACTS])
+        yield repo
+
+
+@pytest.mark.asyncio
+async def test_duplicates_are_found_on_the_normalized_email_and_phone(repo):
+    assert (await repo.find_duplicate("DORA@example.com ", "(555) 010-0001"))["name"] == "dora"
+    assert (await repo.find_duplicate("bob@example.com", None))["name"] == "bob"
+    assert await repo.find_duplicate("dora@example.com", "+15550100009") is None
+    with pytest.raises(DuplicateContactError):
+        await repo.add({"id": generate_contact_id(), "name": "Dora 2", "email": "dora@EXAMPLE.com",
+                        "phone": "+1 555 010 0001"})
+    with pytest.raises(DuplicateContactError):
+        await repo.add_many([{"id": generate_contact_id(), "name": "Bob 2", "email": "BOB@example.com", "phone": None}])
+    # The rejected inserts rolled back to their savepoints only
+    assert len(await repo.list()) == len(CONTACTS)
+    keys = {("dora@example.com", "+15550100001"), ("bob@example.com", None), ("new@example.com", "+15550100009")}
+    assert await repo.existing_keys(keys) == keys - {("new@example.com", "+15550100009")}
+
+
+@pytest.mark.asyncio
+async def test_an_id_clash_is_not_reported_as_a_duplicate_contact(repo):
+    contact_id = (await repo.list())[0]["id"]
+    with pytest.raises(Exception) as error:
+        await repo.add({"id": contact_id, "name": "New", "email": "new@example.com", "phone": "+15550100009"})
+    assert not isinstance(error.value, DuplicateContactError)
+
+
+async def walk(repo, sort_by, sort_order, limit):
+    names, cursor = [], None
+    while True:
+        page = await repo.page(sort_by, sort_order, limit=limit, cursor=cursor)
+        names += [contact["name"] for contact in page["items"]]
+        assert page["total"] == len(CONTACTS)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return names
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort_by", ["name", "email", "created"])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+async def test_keyset_pages_match_the_json_repository(repo, tmp_path, sort_by, sort_order):
+    json_repo = ContactRepository(tmp_path / "contacts.json", flush_delay=3600)
+    await json_repo.add_many(await repo.list(), schedule_save=False)
+    expected = [contact["name"] for contact in (await json_repo.page(sort_by, sort_order, limit=None))["items"]]
+    for limit in (1, 2, 4, 50):
+        assert await walk(repo, sort_by, sort_order, limit) == expected
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_whole_names_then_prefixes_then_words_then_substrings(repo):
+    contacts, total = await repo.search("ann")
+    assert total == 2
+    assert [contact["name"] for contact in contacts] == ["Ann Smith", "Carl Annan"]
+    contacts, total = await repo.search("EMILE")
+    assert total == 2
+    assert {contact["name"] for contact in contacts} == {"Émile", "emile"}
+    assert (await repo.search("nan"))[1] == 1
+    assert await repo.search("100%") == ([], 0)
+    assert await repo.search("  ") == ([], 0)
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete(repo):
+    dora = await repo.find_duplicate("dora@example.com", "+15550100001")
+    updated = await repo.update(dora["id"], {"name": "Dora Z", "phone": "+15550100009"})
+    assert updated == {**dora, "name": "Dora Z", "phone": "+15550100009"}
+    assert await repo.get(dora["id"]) == updated
+    assert await repo.find_duplicate("dora@example.com", "+15550100001") is None
+    assert [c["name"] for c in (await repo.search("dora z"))[0]] == ["Dora Z"]
+
+    # Same as the JSON repository: missing fields are fine, a taken (email, phone) is not
+    assert (await repo.update(dora["id"], {"email": None}))["email"] is None
+    assert (await repo.update(dora["id"], {"name": None}))["name"] is None
+    with pytest.raises(DuplicateContactError):
+        await repo.update(dora["id"], {"email": "bob@example.com", "phone": None})
+    assert await repo.update("missing", {"name": "x"}) is None
+
+    assert await repo.delete(dora["id"])
+    assert not await repo.delete(dora["id"])
+    assert await repo.get(dora["id"]) is None
+    assert len(await repo.list()) == len(CONTACTS) - 1
+
+
+@pytest.mark.asyncio
+async def test_migration_copies_contacts_with_missing_fields(tmp_path, monkeypatch):
+    # A file, since the migration disposes of the engine (and an in-memory database with it)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'contacts.db'}")
+
+    async def init_db():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    monkeypatch.setattr(migrate_contacts, "engine", engine)
+    monkeypatch.setattr(migrate_contacts, "init_db", init_db)
+    monkeypatch.setattr(unit_of_work, "AsyncSessionLocal",
+                        sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False))
+    contacts = [
+        {"id": generate_contact_id(), "name": "David Miller", "email": "david@example.com", "phone": None},
+        {"id": generate_contact_id(), "name": None, "email": "anon@example.com", "phone": "+15550100001"},
+        {"id": generate_contact_id(), "name": "Dave", "email": "David@example.com", "phone": None},  # duplicate
+        {"id": generate_contact_id(), "name": "Ann", "email": "ann@example.com", "phone": "555 010 0002"},
+    ]
+    path = tmp_path / "contacts.json"
+    path.write_text(json.dumps(contacts))
+
+    assert await migrate_contacts.migrate(path) == {"migrated": 3, "duplicates": 1, "already_migrated": 0}
+    assert await migrate_contacts.migrate(path) == {"migrated": 0, "duplicates": 1, "already_migrated": 3}
+    async with unit_of_work.SQLAlchemyUnitOfWork() as uow:
+        stored = {contact["id"]: contact for contact in await uow.contacts.list()}
+    await engine.dispose()
+    assert stored == {contact["id"]: contact for contact in contacts[:2] + contacts[3:]}
@@ -0,0 +1,69 @@
+from abc import ABC, abstractmethod
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.contact_repository import ContactRepository, contact_repository
+from app.repositories.sqlalchemy_repository import SQLAlchemyContactRepository
+from app.repositories.interfaces.contact_repository_interface import IContactRepository
+from app.core.database import AsyncSessionLocal
+
+class IUnitOfWork(ABC):
+    contacts: IContactRepository
+
+    @abstractmethod
+    async def __aenter__(self):
+        ...
+
+    @abstractmethod
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        ...
+
+    @abstractmethod
+    async def commit(self):
+        ...
+
+    @abstractmethod
+    async def rollback(self):
+        ...
+
+class SQLAlchemyUnitOfWork(IUnitOfWork):
+    def __init__(self):
+        self.session: AsyncSession = None
+
+    async def __aenter__(self):
+        self.session = AsyncSessionLocal()
+        self.contacts = SQLAlchemyContactRepository(self.session)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            await self.commit()
+        else:
+            await self.rollback()
+        await self.session.close()
+
+    async def commit(self):
+        await self.session.commit()
+
+    async def rollback(self):
+        await self.session.rollback()
+
+class JsonUnitOfWork(IUnitOfWork):
+    """The in-memory repository, which applies changes immediately and saves
+    them to contacts.json in the background; commit and rollback do nothing."""
+
+    def __init__(self, repository: ContactRepository = contact_repository):
+        self.contacts = repository
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            await self.commit()
+        else:
+            await self.rollback()
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
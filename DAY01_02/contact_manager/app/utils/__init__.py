@@ -1,3 +1,4 @@
-from .file_utils import read_contacts, write_contacts
+from .file_utils import CONTACTS_FILE_PATH, read_contacts, write_contacts
+from .pagination import decode_cursor, encode_cursor
 
-__all__ = ["read_contacts", "write_contacts"]
\ No newline at end of file
+__all__ = ["CONTACTS_FILE_PATH", "read_contacts", "write_contacts", "decode_cursor", "encode_cursor"]
@@ -1,20 +1,28 @@
 import aiofiles
+import asyncio
 import json
+import os
+from pathlib import Path
 from typing import List, Dict, Any
 
+# Resolved from this file, so the server no longer has to run from the project root
+CONTACTS_FILE_PATH = Path(__file__).resolve().parent.parent.parent / "contacts.json"
 
-async def read_contacts() -> List[Dict[str, Any]]:  
+
+async def read_contacts(path: Path = CONTACTS_FILE_PATH) -> List[Dict[str, Any]]:  
     try:
-        async with aiofiles.open("contacts.json", mode='r') as f:
+        async with aiofiles.open(path, mode='r') as f:
             content = await f.read()
             return  json.loads(content)
 
     except FileNotFoundError:
         return []
 
-async def write_contacts(contacts: List[Dict[str, Any]]) -> None:
-    try:
-        async with aiofiles.open("contacts.json", mode='w') as f:
-            await f.write(json.dumps(contacts, indent=4))
-    except Exception as e:
-        print(f"Error writing to file: {e}")    
\ No newline at end of file
+async def write_contacts(contacts: List[Dict[str, Any]], path: Path = CONTACTS_FILE_PATH) -> None:
+    # Write a temporary file and rename it, so a crash never leaves half a file
+    tmp_path = path.with_name(path.name + ".tmp")
+    # Serializing a large list takes seconds; keep it off the event loop
+    content = await asyncio.to_thread(json.dumps, contacts, indent=4)
+    async with aiofiles.open(tmp_path, mode='w') as f:
+        await f.write(content)
+    os.replace(tmp_path, path)
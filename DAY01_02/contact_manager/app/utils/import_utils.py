@@ -0,0 +1,51 @@
+import csv
+import io
+import json
+from typing import IO, Dict, Iterator, List, Optional
+
+FORMATS = ("csv", "ndjson")
+CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+def detect_format(content_type: Optional[str]) -> Optional[str]:
+    if not content_type:
+        return None
+    return CONTENT_TYPES.get(content_type.split(";")[0].strip().lower())
+
+
+def _csv_rows(text: IO[str]) -> Iterator[Optional[Dict[str, str]]]:
+    # A header row names the columns (name, email, phone; any order, extra columns ignored)
+    for row in csv.DictReader(text):
+        yield row
+
+
+def _ndjson_rows(text: IO[str]) -> Iterator[Optional[Dict[str, str]]]:
+    for line in text:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield None
+            continue
+        yield row if isinstance(row, dict) else None
+
+
+def read_batches(file: IO[bytes], fmt: str, size: int) -> Iterator[List[Optional[Dict[str, str]]]]:
+    """Rows of an uploaded CSV/NDJSON file, ``size`` at a time; None for unreadable rows."""
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    rows = _csv_rows(text) if fmt == "csv" else _ndjson_rows(text)
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
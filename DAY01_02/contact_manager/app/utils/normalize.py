@@ -0,0 +1,51 @@
+import re
+from typing import List, Optional
+
+# Country calling code assumed for numbers written without one ("555-1234")
+DEFAULT_COUNTRY_CODE = "1"
+
+_EMAIL = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+_PHONE_FORMATTING = re.compile(r"[\s().\-/]")
+_DIGITS = re.compile(r"\d{7,15}")
+
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    """Trimmed, lower-case email, or None if it does not look like one."""
+    return normalize_emails([email])[0]
+
+
+def normalize_phone(phone: Optional[str], country_code: str = DEFAULT_COUNTRY_CODE) -> Optional[str]:
+    """E.164 form ('+15551234'), or None if the number cannot be one.
+
+    Formatting characters are dropped, a leading '00' counts as '+', and
+    numbers without a country code get ``country_code``. Only the shape is
+    checked (a '+' and at most 15 digits), not whether the number exists.
+    """
+    return normalize_phones([phone], country_code)[0]
+
+
+def normalize_emails(emails: List[Optional[str]]) -> List[Optional[str]]:
+    """``normalize_email`` over a whole batch, without per-call overhead."""
+    match = _EMAIL.fullmatch
+    stripped = [email.strip().lower() if email else "" for email in emails]
+    return [email if email and match(email) else None for email in stripped]
+
+
+def normalize_phones(phones: List[Optional[str]], country_code: str = DEFAULT_COUNTRY_CODE) -> List[Optional[str]]:
+    """``normalize_phone`` over a whole batch, without per-call overhead."""
+    strip_formatting = _PHONE_FORMATTING.sub
+    match = _DIGITS.fullmatch
+    result = []
+    for phone in phones:
+        if not phone:
+            result.append(None)
+            continue
+        digits = strip_formatting("", phone.strip())
+        if digits[:1] == "+":
+            digits = digits[1:]
+        elif digits[:2] == "00":
+            digits = digits[2:]
+        else:
+            digits = country_code + digits.lstrip("0")
+        result.append("+" + digits if match(digits) else None)
+    return result
@@ -0,0 +1,27 @@
+import base64
+import json
+from typing import Any, List
+
+
+def encode_cursor(sort_by: str, sort_order: str, position: List[Any]) -> str:
+    """Opaque cursor: the sort position of the last contact on a page."""
+    payload = json.dumps({"sort_by": sort_by, "sort_order": sort_order, "after": position}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str) -> List[Any]:
+    """Return the position stored in ``cursor``; ValueError if it does not fit this listing."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        position = payload["after"]
+        matches = payload["sort_by"] == sort_by and payload["sort_order"] == sort_order
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor") from None
+    if not matches:
+        raise ValueError("Cursor was issued for a different sort order")
+    # Positions are (collation key, id) pairs of strings; anything else would
+    # fail to compare with the index entries
+    if not isinstance(position, list) or len(position) != 2 or not all(isinstance(part, str) for part in position):
+        raise ValueError("Invalid cursor")
+    return position
@@ -0,0 +1,88 @@
+"""Throughput of the bulk contact import (POST /contacts/import).
+
+Run from the project root:
+
+    python -m benchmarks.bench_contact_import [--rows 1000000] [--format csv]
+
+Generates a file with messy formatting (mixed-case emails, spaces and
+dashes in phone numbers), about 5% duplicates and 2% invalid rows, imports
+it into an empty repository, and reports rows per second for the import
+including the single save at the end, and how long that save takes.
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from app.repositories.contact_repository import ContactRepository
+from app.services import import_contacts
+from app.utils.file_utils import write_contacts
+
+FIRST = ["john", "jane", "alice", "bob", "maria", "jose", "li", "wei", "anna", "omar"]
+
+
+def make_rows(count: int) -> list:
+    rng = random.Random(1)
+    rows = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.05 and rows:
+            # Same contact again, formatted differently
+            previous = rows[rng.randrange(len(rows))]
+            rows.append({"name": previous["name"], "email": previous["email"].upper(),
+                         "phone": previous["phone"].replace("-", " ")})
+        elif roll < 0.07:
+            rows.append({"name": f"Broken {i}", "email": f"broken{i}.example.com", "phone": "12"})
+        else:
+            rows.append({"name": f"{rng.choice(FIRST).title()} Person{i}", "email": f"User.{i}@Example.com",
+                         "phone": f"{rng.randint(200, 999)}-{rng.randint(200, 999)}-{i % 10000:04d}"})
+    return rows
+
+
+def encode(rows: list, fmt: str) -> bytes:
+    if fmt == "ndjson":
+        return "".join(json.dumps(row) + "\n" for row in rows).encode()
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=["name", "email", "phone"])
+    writer.writeheader()
+    writer.writerows(rows)
+    return out.getvalue().encode()
+
+
+async def run(count: int, fmt: str) -> None:
+    data = encode(make_rows(count), fmt)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "contacts.json"
+        repository = ContactRepository(path)
+        await repository.load()
+        start = time.perf_counter()
+        counts = await import_contacts(io.BytesIO(data), fmt, repository)
+        total_time = time.perf_counter() - start
+        # The import ends with one save; time that write on its own
+        start = time.perf_counter()
+        await write_contacts(await repository.list(), path)
+        save_time = time.perf_counter() - start
+        await repository.close()
+
+    print(f"{count} rows ({fmt}, {len(data) / 1e6:.0f} MB): {counts}")
+    print(f"  import  {total_time:6.1f} s  {count / total_time:9.0f} rows/s"
+          f"  (of which ~{save_time:.1f} s is the single save)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--format", choices=["csv", "ndjson"], default="csv")
+    args = parser.parse_args()
+    for count in args.rows:
+        asyncio.run(run(count, args.format))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Copy contacts.json into the SQL database.
+
+Run from the project root, with the target database in DATABASE_URL (the
+default is contacts.db next to contacts.json):
+
+    python -m tools.migrate_contacts [--json contacts.json]
+
+Then start the app with CONTACTS_STORAGE=sql. The JSON file is left as it
+is. Running the migration again only adds contacts that are not in the
+database yet, so it can also catch up with changes made in the meantime.
+"""
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+from typing import Dict
+
+from app.core.database import engine, init_db
+from app.repositories.contact_repository import contact_key
+from app.unit_of_work import SQLAlchemyUnitOfWork
+from app.utils.file_utils import CONTACTS_FILE_PATH, read_contacts
+
+# Contacts inserted per statement
+MIGRATE_BATCH_SIZE = 5000
+
+
+async def migrate(json_path: Path = CONTACTS_FILE_PATH) -> Dict[str, int]:
+    """Insert every contact of ``json_path`` whose id and (email, phone) are not stored yet.
+
+    Contacts that repeat the (email, phone) of an earlier one (the JSON
+    file never enforced that for existing data) are counted as duplicates
+    and left out, since the table's unique constraint would reject them.
+    """
+    await init_db()
+    counts = {"migrated": 0, "duplicates": 0, "already_migrated": 0}
+    contacts = await read_contacts(json_path)
+    async with SQLAlchemyUnitOfWork() as uow:
+        stored_ids = {contact['id'] for contact in await uow.contacts.list()}
+        seen = await uow.contacts.existing_keys(contact_key(contact) for contact in contacts)
+        batch = []
+        for contact in contacts:
+            if contact['id'] in stored_ids:
+                counts["already_migrated"] += 1
+                continue
+            key = contact_key(contact)
+            if key in seen:
+                counts["duplicates"] += 1
+                continue
+            seen.add(key)
+            batch.append(contact)
+            if len(batch) == MIGRATE_BATCH_SIZE:
+                await uow.contacts.add_many(batch)
+                counts["migrated"] += len(batch)
+                batch = []
+        await uow.contacts.add_many(batch)
+        counts["migrated"] += len(batch)
+    await engine.dispose()
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", type=Path, default=CONTACTS_FILE_PATH, help="contacts file to copy")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(migrate(args.json))))
+
+
+if __name__ == "__main__":
+    main()
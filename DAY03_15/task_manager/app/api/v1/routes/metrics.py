@@ -0,0 +1,21 @@
+import asyncio
+from pathlib import Path
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.metrics import REGISTRY, add_cache_ratios, merge_snapshots, render
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint (text exposition format)."""
+    if settings.metrics_multiproc_dir:
+        # Reads one small file per worker; keep it off the event loop
+        snapshot = await asyncio.to_thread(merge_snapshots, Path(settings.metrics_multiproc_dir))
+    else:
+        snapshot = REGISTRY.snapshot()
+    return PlainTextResponse(render(add_cache_ratios(snapshot)), media_type="text/plain; version=0.0.4")
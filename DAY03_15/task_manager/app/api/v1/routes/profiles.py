@@ -0,0 +1,32 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.profiling import profiles
+from app.middleware.profiling_middleware import secret_matches
+
+
+def require_profiling_secret(x_profile_token: Optional[str] = Header(None)) -> None:
+    # Answer as if the endpoints did not exist
+    if not settings.profiling_secret or not secret_matches(settings.profiling_secret, x_profile_token):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+router = APIRouter(prefix="/internal/profiles", dependencies=[Depends(require_profiling_secret)])
+
+
+@router.get("", include_in_schema=False)
+async def list_profiles():
+    """Stored request profiles, newest first."""
+    return [profile.summary() for profile in profiles.list()]
+
+
+@router.get("/{trace_id}", response_class=PlainTextResponse, include_in_schema=False)
+async def get_profile(trace_id: str):
+    """Collapsed stacks of one profiled request, for flamegraph.pl or speedscope."""
+    profile = profiles.get(trace_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(profile.collapsed())
@@ -4,11 +4,13 @@ from app.services.task_services import TaskService
 from datetime import date
 from typing import Optional, List
 from app.dependencies import get_task_service
+from app.core.tracing import traced
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
 @router.get("", response_model=PaginatedTaskResponse, status_code=200)
+@traced()
 async def list_tasks(
     status: Optional[str] = Query(None, description="Filter tasks by status"),
     due_date: Optional[date] = Query(None, description="Filter tasks by due date"),
@@ -43,6 +45,7 @@ async def list_tasks(
 
 
 @router.post("/", response_model=TaskResponse, status_code=201)
+@traced()
 async def create_task(
     task_create: TaskCreate,
     task_service: TaskService = Depends(get_task_service)
@@ -52,6 +55,7 @@ async def create_task(
 
 
 @router.delete("/{task_id}", status_code=204)
+@traced()
 async def delete_task(
     task_id: int = Path(..., description="The ID of the task to delete"),
     task_service: TaskService = Depends(get_task_service)
@@ -61,6 +65,7 @@ async def delete_task(
 
 
 @router.put("/{task_id}", response_model=TaskResponse, status_code=200)
+@traced()
 async def update_task(
     task_id: int = Path(..., description="The ID of the task to update"),
     task_update: TaskUpdate = ...,
@@ -71,6 +76,7 @@ async def update_task(
 
 
 @router.get("/{task_id}", response_model=TaskResponse, status_code=200)
+@traced()
 async def get_task(
     task_id: int = Path(..., description="The ID of the task to retrieve"),
     task_service: TaskService = Depends(get_task_service)
@@ -29,6 +29,33 @@ class Settings(BaseSettings):
 
     sqlite_file: str = "./task_manager.db"
 
+    metrics_enabled: bool = True
+    # Directory shared by all worker processes; each writes its metrics
+    # there and /metrics reports the sum. Leave unset for a single process.
+    metrics_multiproc_dir: Optional[str] = None
+    metrics_snapshot_interval: float = 1.0
+
+    log_level: str = "INFO"
+    log_json: bool = True
+    # Records waiting for the logging thread; more are dropped, not waited for
+    log_queue_size: int = 10000
+    # Share of successful request log lines kept; errors and slow requests always are
+    log_sample_rate: float = 1.0
+    log_slow_request_ms: int = 1000
+
+    tracing_enabled: bool = True
+    # Share of requests traced, unless the caller's traceparent decides
+    tracing_sample_rate: float = 0.1
+    # "log" (one JSON "trace" log line per trace) or "none"
+    tracing_exporter: str = "log"
+
+    # Requests with an "X-Profile-Token: <profiling_secret>" header are profiled,
+    # and the profiles served at /internal/profiles (same header required)
+    profiling_enabled: bool = False
+    profiling_secret: Optional[str] = None
+    profiling_interval_ms: float = 1.0
+    profiling_max_profiles: int = 50
+
     class Config:
         env_file = ".env"
 
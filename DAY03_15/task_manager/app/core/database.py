@@ -5,10 +5,9 @@ from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-)
+# No echo: in debug, SQL statements are logged through the queued logging
+# setup (app/core/logging_config.py) instead of a synchronous handler
+engine = create_async_engine(settings.database_url)
 
 AsyncSessionLocal = sessionmaker(
     bind=engine,
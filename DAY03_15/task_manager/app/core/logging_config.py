@@ -0,0 +1,142 @@
+"""Non-blocking logging: handlers run on a background thread.
+
+``setup_logging`` puts a ``DroppingQueueHandler`` on the root logger and
+makes uvicorn's loggers propagate to it instead of writing to their own
+stream handlers. Logging on the event loop then only appends the record
+to a bounded queue; a ``QueueListener`` thread formats it (as one JSON
+object per line) and writes it out. When the queue is full the record is
+dropped and counted in ``log_records_dropped_total`` instead of blocking
+the request.
+
+Successful request log lines are sampled (``log_sample_rate``); errors
+(status >= 400) and slow requests (``log_slow_request_ms``) are always
+kept.
+"""
+
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO, Optional
+
+from app.core.config import settings
+from app.core.metrics import Counter
+
+log_records_dropped_total = Counter(
+    "log_records_dropped_total", "Log records dropped because the log queue was full.")
+
+# LogRecord attributes that are not "extra" fields
+_RECORD_FIELDS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+# Loggers uvicorn gives their own (synchronous) handlers
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, any ``extra`` fields and the traceback."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def _request_outcome(record: logging.LogRecord):
+    """(status, duration_ms) of a request log line, or None for other records."""
+    status = getattr(record, "status", None)
+    if status is not None:
+        return status, getattr(record, "duration_ms", 0)
+    if record.name == "uvicorn.access" and isinstance(record.args, tuple) and len(record.args) == 5:
+        # '%s - "%s %s HTTP/%s" %d'
+        return record.args[4], 0
+    return None
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps ``rate`` of the successful, fast request log lines and everything else."""
+
+    def __init__(self, rate: float = 1.0, slow_ms: int = 1000):
+        super().__init__()
+        self.rate = rate
+        self.slow_ms = slow_ms
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1.0 or record.levelno >= logging.WARNING:
+            return True
+        outcome = _request_outcome(record)
+        if outcome is None:
+            return True
+        status, duration_ms = outcome
+        if not isinstance(status, int) or status >= 400 or (duration_ms or 0) >= self.slow_ms:
+            return True
+        return random.random() < self.rate
+
+
+class DroppingQueueHandler(QueueHandler):
+    """A QueueHandler for a bounded queue that drops records instead of blocking.
+
+    ``prepare`` only merges the message arguments; formatting, including
+    tracebacks, is left to the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_records_dropped_total.inc()
+
+
+def setup_logging(stream: Optional[IO[str]] = None) -> QueueListener:
+    """Route the root and uvicorn loggers through a bounded queue to ``stream``.
+
+    Returns the started listener; stop it on shutdown to write out what is
+    still queued.
+    """
+    output = logging.StreamHandler(stream if stream is not None else sys.stderr)
+    output.setFormatter(JsonFormatter() if settings.log_json else
+                        logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+
+    handler = DroppingQueueHandler(queue.Queue(maxsize=settings.log_queue_size))
+    handler.addFilter(SamplingFilter(settings.log_sample_rate, settings.log_slow_request_ms))
+
+    root = logging.getLogger()
+    for existing in [h for h in root.handlers if isinstance(h, DroppingQueueHandler)]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(settings.log_level.upper())
+    for name in UVICORN_LOGGERS:
+        logger = logging.getLogger(name)
+        logger.handlers = []
+        logger.propagate = True
+    # In debug, SQL statements are logged through the same queue (the engine no longer echoes)
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO if settings.debug else logging.WARNING)
+
+    listener = QueueListener(handler.queue, output, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def shutdown_logging(listener: QueueListener) -> None:
+    """Write out the queued records and detach the queue handler."""
+    listener.stop()
+    root = logging.getLogger()
+    for handler in [h for h in root.handlers if isinstance(h, DroppingQueueHandler) and h.queue is listener.queue]:
+        root.removeHandler(handler)
@@ -0,0 +1,497 @@
+"""Prometheus-style metrics, rendered in the text exposition format.
+
+Recording never takes a lock: every thread writes to its own shard of
+each metric (a plain dict), and a scrape sums the shards. Request metrics
+are all recorded on the event loop thread, so in practice there is one
+shard per process.
+
+With several worker processes, each worker writes a snapshot of its
+metrics to ``metrics_multiproc_dir`` every ``metrics_snapshot_interval``
+seconds, and ``/metrics`` answers with the sum over all snapshots, so
+any worker can serve the scrape. Counters and histograms of workers that
+have exited keep counting toward the totals; their gauges are dropped.
+Snapshots are named after the process's pid and start time, and a worker
+starting up folds those of exited workers into one aggregate file, so the
+directory does not fill up with them and a reused pid never overwrites
+(and resets) an earlier worker's counts.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import default
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.routing import get_route_path
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; workers there fold snapshots without the lock
+    fcntl = None
+
+Labels = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+
+class Metric:
+    type_ = "untyped"
+
+    def __init__(self, name: str, help_: str, labelnames: Sequence[str] = (), registry: "Registry" = None):
+        self.name = name
+        self.help = help_
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._shards_lock = threading.Lock()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _values(self) -> dict:
+        try:
+            return self._local.values
+        except AttributeError:
+            # First write from this thread: the only time a lock is taken
+            values = self._local.values = {}
+            with self._shards_lock:
+                self._shards.append(values)
+            return values
+
+    def samples(self) -> Dict[Labels, object]:
+        """Values per label set, summed over the threads' shards."""
+        merged: Dict[Labels, object] = {}
+        for shard in list(self._shards):
+            # dict() copies in one step, so a concurrent insert cannot break the loop
+            for labels, value in dict(shard).items():
+                merged[labels] = self._merge(merged.get(labels), value)
+        return merged
+
+    @staticmethod
+    def _merge(total, value):
+        return value if total is None else total + value
+
+
+class Counter(Metric):
+    type_ = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        values = self._values()
+        values[labels] = values.get(labels, 0.0) + amount
+
+
+class Gauge(Metric):
+    """A gauge that goes up and down, like the number of requests in flight."""
+
+    type_ = "gauge"
+
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        values = self._values()
+        values[labels] = values.get(labels, 0.0) + amount
+
+    def dec(self, labels: Labels = (), amount: float = 1.0) -> None:
+        self.inc(labels, -amount)
+
+
+class Histogram(Metric):
+    """Observations counted into ``buckets``.
+
+    Each label set keeps one count per bucket (not cumulative), then the
+    +Inf count, the sum and the total count, so an observation is a bisect
+    and three list updates.
+    """
+
+    type_ = "histogram"
+
+    def __init__(self, name: str, help_: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, registry: "Registry" = None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help_, labelnames, registry)
+
+    def observe(self, labels: Labels, value: float) -> None:
+        values = self._values()
+        counts = values.get(labels)
+        if counts is None:
+            counts = values[labels] = [0.0] * (len(self.buckets) + 3)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-2] += value
+        counts[-1] += 1
+
+    @staticmethod
+    def _merge(total, value):
+        return list(value) if total is None else [a + b for a, b in zip(total, value)]
+
+
+class CallbackGauge(Metric):
+    """A gauge whose values are computed by ``callback`` when it is read."""
+
+    type_ = "gauge"
+
+    def __init__(self, name: str, help_: str, labelnames: Sequence[str] = (),
+                 callback: Callable[[], Dict[Labels, float]] = dict, registry: "Registry" = None):
+        self.callback = callback
+        super().__init__(name, help_, labelnames, registry)
+
+    def samples(self) -> Dict[Labels, object]:
+        return dict(self.callback())
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> None:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+
+    def snapshot(self) -> Dict[str, dict]:
+        """All current values, as written to a multiprocess snapshot file."""
+        return {
+            name: {
+                "type": metric.type_,
+                "help": metric.help,
+                "labelnames": list(metric.labelnames),
+                "buckets": list(getattr(metric, "buckets", ())),
+                "samples": [[list(labels), value] for labels, value in metric.samples().items()],
+            }
+            for name, metric in self.metrics.items()
+        }
+
+
+REGISTRY = Registry()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def render(snapshot: Dict[str, dict]) -> str:
+    """Text exposition format (version 0.0.4) of a snapshot."""
+    lines = []
+    for name, metric in snapshot.items():
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        labelnames = metric["labelnames"]
+        for labels, value in sorted(metric["samples"], key=lambda sample: sample[0]):
+            if metric["type"] != "histogram":
+                lines.append(f"{name}{_label_text(labelnames, labels)} {_number(value)}")
+                continue
+            cumulative = 0.0
+            for bound, count in zip(list(metric["buckets"]) + [float("inf")], value[:-2]):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{name}_bucket{_label_text(labelnames, labels, le)} {_number(cumulative)}")
+            lines.append(f"{name}_sum{_label_text(labelnames, labels)} {_number(value[-2])}")
+            lines.append(f"{name}_count{_label_text(labelnames, labels)} {_number(value[-1])}")
+    return "\n".join(lines) + "\n"
+
+
+def add_cache_ratios(snapshot: Dict[str, dict]) -> Dict[str, dict]:
+    """Add ``cache_hit_ratio`` per cache, from the hit and miss counters."""
+    hits = {tuple(labels): value for labels, value in snapshot.get("cache_hits_total", {}).get("samples", [])}
+    misses = {tuple(labels): value for labels, value in snapshot.get("cache_misses_total", {}).get("samples", [])}
+    samples = []
+    for labels in sorted(set(hits) | set(misses)):
+        lookups = hits.get(labels, 0.0) + misses.get(labels, 0.0)
+        samples.append([list(labels), hits.get(labels, 0.0) / lookups if lookups else 0.0])
+    snapshot["cache_hit_ratio"] = {
+        "type": "gauge",
+        "help": "Share of cache lookups that were hits, since start.",
+        "labelnames": ["cache"],
+        "buckets": [],
+        "samples": samples,
+    }
+    return snapshot
+
+
+# -- multiprocess mode ---------------------------------------------------------
+
+# Counters and histograms of exited workers, folded in from their snapshots
+AGGREGATE_FILE = "metrics.aggregate.json"
+AGGREGATE_LOCK_FILE = "metrics.aggregate.lock"
+
+_process: Optional[Tuple[int, str]] = None
+
+
+def process_token() -> str:
+    """Names this process's snapshot: its pid and start time, so a process
+    that is given the pid of an exited worker does not take over its file."""
+    global _process
+    pid = os.getpid()
+    if _process is None or _process[0] != pid:
+        _process = (pid, f"{pid}-{time.time_ns()}")
+    return _process[1]
+
+
+def snapshot_path(directory: Path, token: str) -> Path:
+    return directory / f"metrics-{token}.json"
+
+
+def write_snapshot(directory: Path, registry: Registry = REGISTRY) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    token = process_token()
+    path = snapshot_path(directory, token)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps({"pid": os.getpid(), "token": token, "metrics": registry.snapshot()}))
+    os.replace(tmp_path, path)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_json(path: Path) -> Optional[dict]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None  # gone, or being replaced right now
+
+
+def _read_snapshots(directory: Path) -> List[Tuple[Path, dict]]:
+    snapshots = []
+    for path in directory.glob("metrics-*.json"):
+        data = _read_json(path)
+        if data is not None:
+            # Files written before snapshots had tokens are named after the pid alone
+            data.setdefault("token", str(data["pid"]))
+            snapshots.append((path, data))
+    return snapshots
+
+
+def _started(token: str) -> int:
+    _, _, started = token.partition("-")
+    return int(started or 0)
+
+
+def _live_tokens(snapshots: List[Tuple[Path, dict]]) -> Set[str]:
+    """Tokens of the snapshots whose process is still running.
+
+    Of several snapshots with the same pid, only the newest can be: the
+    others belong to workers that exited before the pid was reused.
+    """
+    newest: Dict[int, str] = {}
+    for _, data in snapshots:
+        pid, token = data["pid"], data["token"]
+        if pid == os.getpid():
+            newest[pid] = process_token()
+        elif pid not in newest or _started(token) > _started(newest[pid]):
+            newest[pid] = token
+    return {token for pid, token in newest.items() if pid == os.getpid() or _pid_alive(pid)}
+
+
+def _add_samples(totals: Dict[str, dict], metrics: Dict[str, dict], gauges: bool = True) -> None:
+    for name, metric in metrics.items():
+        if name not in totals or (metric["type"] == "gauge" and not gauges):
+            continue
+        merge = Histogram._merge if metric["type"] == "histogram" else Metric._merge
+        for labels, value in metric["samples"]:
+            labels = tuple(labels)
+            totals[name][labels] = merge(totals[name].get(labels), value)
+
+
+@contextmanager
+def _aggregate_lock(directory: Path):
+    if fcntl is None:
+        yield
+        return
+    with open(directory / AGGREGATE_LOCK_FILE, "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield  # closing the file releases the lock
+
+
+def fold_exited_snapshots(directory: Path) -> None:
+    """Add the counters and histograms of exited workers' snapshots to the
+    aggregate file, then delete the snapshots.
+
+    Called by each worker at startup. The aggregate lists the snapshots
+    folded into it until they are gone, so a scrape that still finds one
+    does not count it twice, and a fold interrupted before the deletes
+    does not repeat.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    with _aggregate_lock(directory):
+        snapshots = _read_snapshots(directory)
+        live = _live_tokens(snapshots)
+        aggregate = _read_json(directory / AGGREGATE_FILE) or {"folded": [], "metrics": {}}
+        folded = set(aggregate["folded"])
+        exited = [(path, data) for path, data in snapshots if data["token"] not in live]
+        if not exited and folded <= {data["token"] for _, data in snapshots}:
+            return
+        metrics = aggregate["metrics"]
+        totals = {name: {tuple(labels): value for labels, value in metric["samples"]}
+                  for name, metric in metrics.items()}
+        for _, data in exited:
+            if data["token"] in folded:
+                continue
+            for name, metric in data["metrics"].items():
+                if metric["type"] != "gauge" and name not in metrics:
+                    metrics[name] = {**metric, "samples": []}
+                    totals[name] = {}
+            _add_samples(totals, data["metrics"], gauges=False)
+            folded.add(data["token"])
+        for name, metric in metrics.items():
+            metric["samples"] = [[list(labels), value] for labels, value in totals[name].items()]
+        # Only snapshots that still exist need to stay listed
+        existing = {data["token"] for path, data in snapshots if path.exists()}
+        aggregate = {"folded": sorted(folded & existing), "metrics": metrics}
+        path = directory / AGGREGATE_FILE
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(aggregate))
+        os.replace(tmp_path, path)
+        for path, _ in exited:
+            with suppress(FileNotFoundError):
+                path.unlink()
+
+
+def merge_snapshots(directory: Path, registry: Registry = REGISTRY) -> Dict[str, dict]:
+    """Sum of every worker's snapshot and of the exited workers' aggregate,
+    with this process's values taken live."""
+    merged = registry.snapshot()
+    totals = {name: {tuple(labels): value for labels, value in metric["samples"]} for name, metric in merged.items()}
+    # Snapshots first: one deleted after this read has its token in the aggregate read next
+    snapshots = _read_snapshots(directory)
+    aggregate = _read_json(directory / AGGREGATE_FILE) or {"folded": [], "metrics": {}}
+    folded = set(aggregate["folded"])
+    live = _live_tokens(snapshots)
+    _add_samples(totals, aggregate["metrics"], gauges=False)
+    for _, data in snapshots:
+        token = data["token"]
+        if token == process_token() or token in folded:
+            continue
+        _add_samples(totals, data["metrics"], gauges=token in live)
+    for name, metric in merged.items():
+        metric["samples"] = [[list(labels), value] for labels, value in totals[name].items()]
+    return merged
+
+
+async def snapshot_forever(directory: Path, interval: float, registry: Registry = REGISTRY) -> None:
+    """Keep this worker's snapshot file current until cancelled."""
+    await asyncio.to_thread(fold_exited_snapshots, directory)
+    try:
+        while True:
+            await asyncio.to_thread(write_snapshot, directory, registry)
+            await asyncio.sleep(interval)
+    finally:
+        write_snapshot(directory, registry)
+
+
+# -- application metrics -------------------------------------------------------
+
+# Route label of requests no route matched, so unknown paths cannot blow up the label set
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_template(scope: dict) -> str:
+    """Template of the route that handled ``scope`` ("/api/v1/tasks/{task_id}").
+
+    The router records the matched route in the scope. A route of a router
+    included with a prefix may only know its own part of the path; the
+    prefix is then what precedes that part in the request path.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return UNMATCHED_ROUTE
+    try:
+        concrete = route.path_format.format(**scope.get("path_params", {}))
+    except (AttributeError, KeyError, IndexError, ValueError):
+        return template
+    path = get_route_path(scope)
+    return path[:len(path) - len(concrete)] + template if path.endswith(concrete) else template
+
+
+# Scopes of the requests being served, by id. Routing fills in scope["route"]
+# in place, so the in-flight gauge reads the route labels at scrape time.
+active_requests: Dict[int, dict] = {}
+
+
+def _requests_in_flight() -> Dict[Labels, float]:
+    counts: Dict[Labels, float] = {}
+    for scope in list(active_requests.values()):
+        labels = (scope["method"], route_template(scope))
+        counts[labels] = counts.get(labels, 0.0) + 1
+    return counts
+
+
+http_requests_total = Counter(
+    "http_requests_total", "HTTP requests by route template and status code.", ("method", "route", "status"))
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route"))
+http_requests_in_flight = CallbackGauge(
+    "http_requests_in_flight", "HTTP requests being served.", ("method", "route"), callback=_requests_in_flight)
+http_request_db_seconds = Histogram(
+    "http_request_db_seconds", "Time spent in SQL statements per HTTP request.", ("method", "route"))
+db_statements_total = Counter(
+    "db_statements_total", "SQL statements executed, by route template.", ("route",))
+uow_commits_total = Counter("uow_commits_total", "Unit of work commits.", ("uow",))
+uow_rollbacks_total = Counter("uow_rollbacks_total", "Unit of work rollbacks.", ("uow",))
+cache_hits_total = Counter("cache_hits_total", "Cache hits.", ("cache",))
+cache_misses_total = Counter("cache_misses_total", "Cache misses.", ("cache",))
+
+
+class RequestDbTime:
+    """SQL time and statement count of the current request."""
+
+    __slots__ = ("seconds", "statements")
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.statements = 0
+
+
+current_db_time: ContextVar[Optional[RequestDbTime]] = ContextVar("current_db_time", default=None)
+
+_CACHE_COUNTERS = {
+    default.CACHE_HIT: cache_hits_total,
+    default.CACHE_MISS: cache_misses_total,
+}
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._metrics_start
+    request = current_db_time.get()
+    if request is not None:
+        request.seconds += elapsed
+        request.statements += 1
+    counter = _CACHE_COUNTERS.get(getattr(context, "cache_hit", None))
+    if counter is not None:
+        counter.inc(("sqlalchemy_compiled",))
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Time every SQL statement into the current request's ``RequestDbTime``
+    and count hits of SQLAlchemy's compiled statement cache."""
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,125 @@
+"""On-demand profiling of single requests.
+
+A request carrying the profiling secret (see ProfilingMiddleware) is run
+under a ``SamplingProfiler``: a thread that, every ``interval`` seconds,
+looks at what the event loop thread is executing and, when the running
+task is the profiled request's, records its Python stack. Other requests
+interleaved on the same loop are not sampled, and time the request spends
+suspended (waiting on the database, say) is not on the loop at all; the
+trace of the request shows that side.
+
+The result is kept as collapsed stacks ("outer;inner;leaf count" lines,
+the input of flamegraph.pl and speedscope), by trace id, in a bounded
+``ProfileStore``.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def collapse_stack(frame) -> str:
+    """The stack ending at ``frame``, outermost frame first, joined with ";"."""
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SamplingProfiler:
+    """Samples the stack of the event loop thread while ``task`` is the running task."""
+
+    def __init__(self, task: asyncio.Task, interval: float = 0.001):
+        self.task = task
+        self.loop = task.get_loop()
+        self.thread_id = threading.get_ident()
+        self.interval = interval
+        self.stacks: Dict[str, int] = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if asyncio.current_task(self.loop) is not self.task:
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = collapse_stack(frame)
+            self.stacks[stack] = self.stacks.get(stack, 0) + 1
+            self.samples += 1
+
+
+class Profile:
+    """The collapsed stacks of one profiled request."""
+
+    def __init__(self, trace_id: str, method: str, path: str, status: int, duration_ms: float,
+                 interval: float, stacks: Dict[str, int]):
+        self.trace_id = trace_id
+        self.method = method
+        self.path = path
+        self.status = status
+        self.duration_ms = duration_ms
+        self.interval = interval
+        self.stacks = stacks
+        self.created = time.time()
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+    def summary(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "duration_ms": round(self.duration_ms, 3),
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "created": self.created,
+        }
+
+
+class ProfileStore:
+    """The last ``max_profiles`` profiles, by trace id."""
+
+    def __init__(self, max_profiles: int = 50):
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, Profile]" = OrderedDict()
+
+    def add(self, profile: Profile) -> None:
+        self._profiles[profile.trace_id] = profile
+        self._profiles.move_to_end(profile.trace_id)
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+
+    def get(self, trace_id: str) -> Optional[Profile]:
+        return self._profiles.get(trace_id)
+
+    def list(self) -> List[Profile]:
+        return list(reversed(self._profiles.values()))
+
+
+profiles = ProfileStore()
@@ -0,0 +1,277 @@
+"""Request tracing: spans for routes, services, units of work, repositories and SQL.
+
+``TracingMiddleware`` starts one root span per request. If the request has
+a W3C ``traceparent`` header, the root span continues that trace and
+keeps its sampling decision; otherwise the trace is sampled with
+probability ``tracing_sample_rate`` (head-based: decided once, at the
+root). Functions decorated with ``traced`` and the SQL statements of an
+engine passed to ``instrument_engine`` become child spans of the current
+span.
+
+In a request that is not sampled, instrumented code only looks up the
+current span and calls through. Spans are kept with their trace and handed
+to the exporter together when the root span ends; spans still open at
+that point (work that outlives the request) are not exported.
+"""
+
+import functools
+import logging
+import random
+import re
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+_TRACEPARENT = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+# Statements longer than this are cut in the db.statement attribute
+MAX_STATEMENT_LENGTH = 2000
+
+
+def _new_trace_id() -> str:
+    return f"{random.getrandbits(128):032x}"
+
+
+def _new_span_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+def parse_traceparent(header: Optional[str]):
+    """(trace_id, parent_span_id, sampled) from a ``traceparent`` header, or None if it is missing or invalid."""
+    if not header:
+        return None
+    match = _TRACEPARENT.match(header.strip().lower())
+    if match is None:
+        return None
+    version, trace_id, span_id, flags = match.groups()
+    if version == "ff" or trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+        return None
+    return trace_id, span_id, bool(int(flags, 16) & 0x01)
+
+
+class Span:
+    """One timed operation of a trace. Times are nanoseconds since the epoch."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "sampled", "start_ns", "end_ns",
+                 "attributes", "status", "_trace")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], sampled: bool,
+                 trace: Optional[List["Span"]], attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_span_id()
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = attributes or {}
+        self.status = "ok"
+        # Finished spans of the trace, shared with the other spans of this process
+        self._trace = trace
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.status = "error"
+        self.attributes["exception.type"] = type(exc).__name__
+        self.attributes["exception.message"] = str(exc)
+
+    def end(self) -> None:
+        self.end_ns = time.time_ns()
+        if self._trace is not None:
+            self._trace.append(self)
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_trace_id() -> Optional[str]:
+    """Trace id of the request being served, sampled or not."""
+    span = current_span.get()
+    return span.trace_id if span is not None else None
+
+
+# -- exporters ----------------------------------------------------------------
+
+
+class SpanExporter:
+    """Receives the finished spans of each sampled trace, root span last."""
+
+    def export(self, spans: Sequence[Span]) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+class NoopSpanExporter(SpanExporter):
+    def export(self, spans: Sequence[Span]) -> None:
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps every exported span in ``spans``; for tests."""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self.spans.extend(spans)
+
+    def clear(self) -> None:
+        self.spans = []
+
+    def names(self) -> List[str]:
+        return [span.name for span in self.spans]
+
+
+class LogSpanExporter(SpanExporter):
+    """One ``trace`` log record per trace, with the spans as an extra field.
+
+    Written through the queued logging setup (app/core/logging_config.py),
+    so exporting does not block the request.
+    """
+
+    def __init__(self, logger: logging.Logger = None):
+        self.logger = logger or logging.getLogger("app.tracing")
+
+    def export(self, spans: Sequence[Span]) -> None:
+        if spans:
+            self.logger.info("trace", extra={"trace_id": spans[-1].trace_id,
+                                             "spans": [span.to_dict() for span in spans]})
+
+
+EXPORTERS = {"log": LogSpanExporter, "none": NoopSpanExporter}
+
+
+# -- tracer -------------------------------------------------------------------
+
+
+class Tracer:
+    def __init__(self, sample_rate: float = 0.0, exporter: SpanExporter = None):
+        self.sample_rate = sample_rate
+        self.exporter = exporter or NoopSpanExporter()
+
+    def configure(self, sample_rate: float, exporter: SpanExporter) -> None:
+        self.exporter.shutdown()
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+
+    def start_trace(self, name: str, traceparent: Optional[str] = None,
+                    attributes: Optional[Dict[str, Any]] = None) -> Span:
+        """The root span of a request, continuing the caller's trace if ``traceparent`` is valid."""
+        parent = parse_traceparent(traceparent)
+        if parent is not None:
+            trace_id, parent_id, sampled = parent
+        else:
+            trace_id, parent_id = _new_trace_id(), None
+            sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        return Span(name, trace_id, parent_id, sampled, [] if sampled else None, attributes)
+
+    def end_trace(self, root: Span) -> None:
+        root.end()
+        if root.sampled:
+            self.exporter.export(root._trace)
+
+    @staticmethod
+    def start_span(name: str, parent: Span, attributes: Optional[Dict[str, Any]] = None) -> Span:
+        """A child of the sampled span ``parent``; the caller ends it."""
+        return Span(name, parent.trace_id, parent.span_id, True, parent._trace, attributes)
+
+
+tracer = Tracer()
+
+
+def traced(name: Optional[str] = None):
+    """Record calls of the decorated coroutine function as spans named ``name``
+    (the function's qualified name by default)."""
+
+    def decorate(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            parent = current_span.get()
+            if parent is None or not parent.sampled:
+                return await func(*args, **kwargs)
+            span = tracer.start_span(span_name, parent)
+            token = current_span.set(span)
+            try:
+                return await func(*args, **kwargs)
+            except BaseException as exc:
+                span.record_exception(exc)
+                raise
+            finally:
+                current_span.reset(token)
+                span.end()
+
+        return wrapper
+
+    return decorate
+
+
+# -- SQL ----------------------------------------------------------------------
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    parent = current_span.get()
+    if parent is None or not parent.sampled:
+        return
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+    context._trace_span = tracer.start_span(keyword, parent, {
+        "db.system": conn.dialect.name,
+        "db.statement": statement[:MAX_STATEMENT_LENGTH],
+        "db.executemany": executemany,
+    })
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    span = getattr(context, "_trace_span", None)
+    if span is not None:
+        context._trace_span = None
+        span.set_attribute("db.rowcount", cursor.rowcount)
+        span.end()
+
+
+def _handle_error(exception_context):
+    span = getattr(exception_context.execution_context, "_trace_span", None)
+    if span is not None:
+        exception_context.execution_context._trace_span = None
+        span.record_exception(exception_context.original_exception)
+        span.end()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Record every SQL statement run in a sampled trace as a span."""
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(sync_engine, "handle_error", _handle_error)
@@ -1,15 +1,44 @@
+import asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
 from app.core.database import engine
 from app.core.models import Base
-from app.api.v1.routes import health, tasks
-from app.middleware.exception_middleware import exception_middleware_factory
+from app.core.logging_config import setup_logging, shutdown_logging
+from app.core import tracing
+from app.core.metrics import instrument_engine, snapshot_forever
+from app.core.profiling import profiles
+from app.api.v1.routes import health, metrics, profiles as profile_routes, tasks
+from app.middleware.exception_middleware import ProblemDetailsMiddleware
+from app.middleware.metrics_middleware import MetricsMiddleware
+from app.middleware.profiling_middleware import ProfilingMiddleware
+from app.middleware.tracing_middleware import TracingMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    listener = setup_logging()
+    snapshots = None
+    if settings.metrics_enabled and settings.metrics_multiproc_dir:
+        snapshots = asyncio.create_task(
+            snapshot_forever(Path(settings.metrics_multiproc_dir), settings.metrics_snapshot_interval)
+        )
+    yield
+    if snapshots is not None:
+        snapshots.cancel()
+        try:
+            await snapshots
+        except asyncio.CancelledError:
+            pass
+    shutdown_logging(listener)
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title=settings.app_name)
+    app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
     app.add_middleware(
         CORSMiddleware,
@@ -19,7 +48,29 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    app.middleware("http")(exception_middleware_factory())
+    # Added last, so it wraps CORS and sees every response
+    app.add_middleware(ProblemDetailsMiddleware)
+
+    if settings.profiling_enabled:
+        if not settings.profiling_secret:
+            raise RuntimeError("PROFILING_SECRET must be set when PROFILING_ENABLED is true")
+        # Inside the tracing middleware, so profiles are stored under the trace id
+        profiles.max_profiles = settings.profiling_max_profiles
+        app.add_middleware(ProfilingMiddleware, secret=settings.profiling_secret,
+                           interval=settings.profiling_interval_ms / 1000)
+        app.include_router(profile_routes.router)
+
+    if settings.tracing_enabled:
+        # Wraps the problem-details middleware, so error responses carry the trace id
+        tracing.tracer.configure(settings.tracing_sample_rate, tracing.EXPORTERS[settings.tracing_exporter]())
+        app.add_middleware(TracingMiddleware)
+        tracing.instrument_engine(engine)
+
+    if settings.metrics_enabled:
+        # Outermost, so the recorded latency and status are what the client got
+        app.add_middleware(MetricsMiddleware)
+        instrument_engine(engine)
+        app.include_router(metrics.router)
 
     app.include_router(health.router, prefix="/api/v1")
     app.include_router(tasks.router, prefix="/api/v1")
@@ -1,112 +1,171 @@
+"""Error responses as RFC 7807 problem details, as a raw ASGI middleware.
+
+Successful responses are passed through message by message, without
+buffering or re-encoding. For a response with status >= 400, the
+``http.response.start`` message is held back and the body collected, then
+both are replaced with a problem-details JSON document. Exceptions that
+escape the app become a 500 problem-details response.
+"""
+
+import json
 import logging
-import uuid
 import time
-from datetime import datetime
-from typing import Callable
+import uuid
+from datetime import datetime, timezone
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from fastapi import Request, HTTPException
-from fastapi.responses import JSONResponse
-from fastapi.exceptions import RequestValidationError
+from app.core.tracing import current_trace_id
 
 logger = logging.getLogger("uvicorn.error")
 
+_REWRITTEN_HEADERS = (b"content-length", b"content-type")
+
+
 def _make_problem_details(
-    request: Request,
+    path: str,
     status: int,
     title: str,
-    detail: str,
+    detail: Any,
     trace_id: str,
     type_: str = "about:blank",
-):
+) -> Dict[str, Any]:
     return {
         "type": type_,
         "title": title,
         "status": status,
         "detail": detail,
-        "instance": str(request.url.path),
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "instance": path,
+        "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
         "trace_id": trace_id,
     }
 
-def exception_middleware_factory():
-    async def exception_middleware(request: Request, call_next: Callable):
-        trace_id = str(uuid.uuid4())
-        start = time.perf_counter()
-        if request.method == "OPTIONS":
-            return await call_next(request)
 
-        try:
-            response = await call_next(request)
-            duration_ms = int((time.perf_counter() - start) * 1000)
-            logger.info(
-                "request",
-                extra={
-                    "method": request.method,
-                    "path": str(request.url.path),
-                    "status": getattr(response, "status_code", None),
-                    "duration_ms": duration_ms,
-                    "trace_id": trace_id,
-                },
-            )
-            if response.status_code >= 400:
-                try:
-                    body = response.json()
-                    if isinstance(body, dict) and "trace_id" in body:
-                        return response
-                    detail = body.get("detail") if isinstance(body, dict) else str(body)
-                except Exception:
-                    try:
-                        detail = response.text
-                    except Exception:
-                        detail = str(response.status_code)
-
-                payload = _make_problem_details(
-                    request,
-                    status=response.status_code,
-                    title=response.status_code and f"HTTP {response.status_code}" or "Error",
-                    detail=detail,
-                    trace_id=trace_id,
-                    type_=f"about:blank#http{response.status_code}",
-                )
-                return JSONResponse(payload, status_code=response.status_code)
-
-            return response
-
-        except HTTPException as exc:
-            payload = _make_problem_details(
-                request,
-                status=exc.status_code,
-                title=exc.detail if isinstance(exc.detail, str) else "HTTP error",
-                detail=str(exc.detail),
-                trace_id=trace_id,
-                type_=f"about:blank#http{exc.status_code}",
-            )
-            logger.warning("http_exception", exc_info=exc, extra={"trace_id": trace_id})
-            return JSONResponse(payload, status_code=exc.status_code)
+def _problem_type(status: int) -> str:
+    if status == 422:
+        return "about:blank#validation"
+    if status == 500:
+        return "about:blank#internal"
+    return f"about:blank#http{status}"
 
-        except RequestValidationError as exc:
-            detail = exc.errors() if hasattr(exc, "errors") else str(exc)
-            payload = _make_problem_details(
-                request,
-                status=422,
-                title="Validation Error",
-                detail=str(detail),
-                trace_id=trace_id,
-                type_="about:blank#validation",
-            )
-            logger.warning("validation_error", exc_info=exc, extra={"trace_id": trace_id})
-            return JSONResponse(payload, status_code=422)
 
+def _new_trace_id() -> str:
+    """The id of the request's trace (see TracingMiddleware), or a random one without tracing."""
+    return current_trace_id() or str(uuid.uuid4())
+
+
+def _title(status: int) -> str:
+    try:
+        return HTTPStatus(status).phrase
+    except ValueError:
+        return f"HTTP {status}"
+
+
+class ProblemDetailsMiddleware:
+    """Turns error responses and unhandled exceptions into problem details.
+
+    The per-request ``request`` log line, and the trace id and timestamp it
+    needs, are only produced when INFO is enabled on the logger; error
+    responses always get a trace id.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        log_requests = logger.isEnabledFor(logging.INFO)
+        start = time.perf_counter() if log_requests else 0.0
+        trace_id: Optional[str] = None
+        status = 0
+        started = False  # whether a start message went out to the client
+        error_start: Optional[Message] = None
+        error_body: List[bytes] = []
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, started, error_start, trace_id
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if status < 400:
+                    started = True
+                    await send(message)
+                else:
+                    error_start = message
+                return
+            if error_start is None:
+                await send(message)
+                return
+            if message["type"] == "http.response.body":
+                error_body.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    trace_id = trace_id or _new_trace_id()
+                    started = True
+                    await self._send_problem(send, scope, error_start, b"".join(error_body), trace_id)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
         except Exception as exc:
+            trace_id = trace_id or _new_trace_id()
             logger.exception("unhandled_exception", exc_info=exc, extra={"trace_id": trace_id})
+            if started:
+                # Part of the response is already on the wire; nothing can replace it
+                raise
+            status = 500
             payload = _make_problem_details(
-                request,
+                scope["path"],
                 status=500,
                 title="Internal Server Error",
                 detail="An unexpected error occurred.",
                 trace_id=trace_id,
-                type_="about:blank#internal",
+                type_=_problem_type(500),
             )
-            return JSONResponse(payload, status_code=500)
+            await self._send_json(send, 500, payload, [])
+
+        if log_requests:
+            logger.info(
+                "request",
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status,
+                    "duration_ms": int((time.perf_counter() - start) * 1000),
+                    "trace_id": trace_id or _new_trace_id(),
+                },
+            )
+
+    async def _send_problem(self, send: Send, scope: Scope, start: Message, body: bytes, trace_id: str) -> None:
+        status = start["status"]
+        try:
+            original = json.loads(body)
+        except (ValueError, UnicodeDecodeError):
+            detail = body.decode("utf-8", "replace") or _title(status)
+        else:
+            if isinstance(original, dict) and "trace_id" in original:
+                # Already a problem-details document
+                await send(start)
+                await send({"type": "http.response.body", "body": body})
+                return
+            # FastAPI errors are {"detail": ...}; keep any other JSON as it is
+            detail = original["detail"] if isinstance(original, dict) and "detail" in original else original
+        payload = _make_problem_details(
+            scope["path"],
+            status=status,
+            title=_title(status),
+            detail=detail,
+            trace_id=trace_id,
+            type_=_problem_type(status),
+        )
+        headers = [(name, value) for name, value in start.get("headers", []) if name.lower() not in _REWRITTEN_HEADERS]
+        await self._send_json(send, status, payload, headers)
 
-    return exception_middleware
+    @staticmethod
+    async def _send_json(send: Send, status: int, payload: Dict[str, Any], headers: list) -> None:
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        headers = headers + [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,59 @@
+"""Request metrics (see app/core/metrics.py), as a raw ASGI middleware."""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import (
+    RequestDbTime,
+    active_requests,
+    current_db_time,
+    db_statements_total,
+    http_request_db_seconds,
+    http_request_duration_seconds,
+    http_requests_total,
+    route_template,
+)
+
+
+class MetricsMiddleware:
+    """Records latency, status, in-flight count and SQL time per route template.
+
+    The route is read from the scope once the router has handled the
+    request, so labels are templates ("/api/v1/tasks/{task_id}"), never
+    concrete paths.
+    """
+
+    def __init__(self, app: ASGIApp, exclude_paths=("/metrics",)):
+        self.app = app
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500  # if the app fails before responding
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        db_time = RequestDbTime()
+        token = current_db_time.set(db_time)
+        active_requests[id(scope)] = scope
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            del active_requests[id(scope)]
+            current_db_time.reset(token)
+            method, route = scope["method"], route_template(scope)
+            http_request_duration_seconds.observe((method, route), elapsed)
+            http_requests_total.inc((method, route, str(status)))
+            if db_time.statements:
+                http_request_db_seconds.observe((method, route), db_time.seconds)
+                db_statements_total.inc((route,), db_time.statements)
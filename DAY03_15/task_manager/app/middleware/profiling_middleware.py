@@ -0,0 +1,66 @@
+"""Profile single requests on demand (see app/core/profiling.py), as a raw ASGI middleware."""
+
+import asyncio
+import hmac
+import time
+import uuid
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.profiling import Profile, ProfileStore, SamplingProfiler, profiles
+from app.core.tracing import current_trace_id
+
+PROFILE_HEADER = b"x-profile-token"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+
+def secret_matches(secret: str, token) -> bool:
+    return token is not None and hmac.compare_digest(secret.encode(), token if isinstance(token, bytes) else token.encode())
+
+
+class ProfilingMiddleware:
+    """Runs a request under the sampling profiler when its ``X-Profile-Token``
+    header holds the profiling secret.
+
+    The profile is stored under the request's trace id, which is returned
+    in the ``X-Profile-Id`` response header. Requests without the header
+    only pay for the header lookup; the middleware is not installed at all
+    unless profiling is enabled.
+    """
+
+    def __init__(self, app: ASGIApp, secret: str, interval: float = 0.001, store: ProfileStore = None):
+        self.app = app
+        self.secret = secret
+        self.interval = interval
+        self.store = store if store is not None else profiles
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = next((value for key, value in scope["headers"] if key == PROFILE_HEADER), None)
+        if token is None or not secret_matches(self.secret, token):
+            await self.app(scope, receive, send)
+            return
+
+        trace_id = current_trace_id() or uuid.uuid4().hex
+        status = 500  # if the app fails before responding
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (PROFILE_ID_HEADER, trace_id.encode())]}
+            await send(message)
+
+        profiler = SamplingProfiler(asyncio.current_task(), self.interval)
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            self.store.add(Profile(
+                trace_id, scope["method"], scope["path"], status,
+                (time.perf_counter() - start) * 1000, self.interval, profiler.stacks,
+            ))
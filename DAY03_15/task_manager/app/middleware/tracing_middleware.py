@@ -0,0 +1,69 @@
+"""Root span per request (see app/core/tracing.py), as a raw ASGI middleware."""
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import route_template
+from app.core.tracing import current_span, tracer
+
+
+def _header(scope: Scope, name: bytes):
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class TracingMiddleware:
+    """Starts the trace of each request and names its root span after the route.
+
+    The root span is the current span while the app runs, so the trace id
+    is available to everything below (the problem-details ``trace_id``
+    included), sampled or not. The span is named "METHOD /route/template"
+    once the router has matched the request.
+    """
+
+    def __init__(self, app: ASGIApp, exclude_paths=("/metrics",)):
+        self.app = app
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        root = tracer.start_trace(scope["method"], _header(scope, b"traceparent"))
+        if not root.sampled:
+            token = current_span.set(root)
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                current_span.reset(token)
+            return
+
+        status = 500  # if the app fails before responding
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = current_span.set(root)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as exc:
+            root.record_exception(exc)
+            raise
+        finally:
+            current_span.reset(token)
+            route = route_template(scope)
+            root.name = f"{scope['method']} {route}"
+            root.attributes.update({
+                "http.method": scope["method"],
+                "http.route": route,
+                "http.target": scope["path"],
+                "http.status_code": status,
+            })
+            if status >= 500:
+                root.status = "error"
+            tracer.end_trace(root)
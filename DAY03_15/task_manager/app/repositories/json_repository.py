@@ -1,5 +1,6 @@
 from typing import List, Optional, Dict, Any
 from app.repositories.interfaces.task_repository_interface import ITaskRepository
+from app.core.tracing import traced
 from app.utils.files_io import read_tasks, write_tasks
 
 class JsonTaskRepository(ITaskRepository):
@@ -12,18 +13,22 @@ class JsonTaskRepository(ITaskRepository):
             self.tasks = await read_tasks()
             self.loaded = True
 
+    @traced()
     async def get_all(self) -> List[Dict[str, Any]]:
         await self._load_data()
         return self.tasks
 
+    @traced()
     async def get_by_id(self, task_id: str) -> Optional[Dict[str, Any]]:
         await self._load_data()
         return next((task for task in self.tasks if str(task["id"]) == task_id), None)
 
+    @traced()
     async def add(self, task_data: Dict[str, Any]):
         await self._load_data()
         self.tasks.append(task_data)
 
+    @traced()
     async def update(self, task_id: str, task_data: Dict[str, Any]):
         await self._load_data()
         for i, task in enumerate(self.tasks):
@@ -31,6 +36,7 @@ class JsonTaskRepository(ITaskRepository):
                 self.tasks[i] = task_data
                 break
 
+    @traced()
     async def delete(self, task_id: str):
         await self._load_data()
         self.tasks = [task for task in self.tasks if str(task["id"]) != task_id]
@@ -4,6 +4,7 @@ from sqlalchemy import select, update, delete, func
 from sqlalchemy.orm import selectinload
 from app.core.models import Task, User
 from app.repositories.interfaces.task_repository_interface import ITaskRepository
+from app.core.tracing import traced
 
 
 class SQLAlchemyTaskRepository(ITaskRepository):
@@ -35,6 +36,7 @@ class SQLAlchemyTaskRepository(ITaskRepository):
             
         return result
 
+    @traced()
     async def get_all(
         self, 
         skip: int = 0, 
@@ -76,6 +78,7 @@ class SQLAlchemyTaskRepository(ITaskRepository):
             "has_previous": skip > 0
         }
 
+    @traced()
     async def get_by_id(self, task_id: str) -> Optional[Dict[str, Any]]:
         result = await self.session.execute(
             select(Task).options(selectinload(Task.user)).where(Task.id == int(task_id))
@@ -83,6 +86,7 @@ class SQLAlchemyTaskRepository(ITaskRepository):
         task = result.scalar_one_or_none()
         return self._task_to_dict(task) if task else None
 
+    @traced()
     async def add(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         task = Task(
             title=task_data["title"],
@@ -98,6 +102,7 @@ class SQLAlchemyTaskRepository(ITaskRepository):
         await self.session.refresh(task, ["user"])
         return self._task_to_dict(task)
 
+    @traced()
     async def update(self, task_id: str, task_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         update_data = {k: v for k, v in task_data.items() if k != 'id'}
         
@@ -111,6 +116,7 @@ class SQLAlchemyTaskRepository(ITaskRepository):
         
         return await self.get_by_id(task_id)
 
+    @traced()
     async def delete(self, task_id: str):
         await self.session.execute(
             delete(Task).where(Task.id == int(task_id))
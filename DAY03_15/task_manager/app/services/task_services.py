@@ -5,11 +5,13 @@ generate_id = generate_int_id
 from fastapi import HTTPException
 from datetime import date
 from app.unit_of_work import IUnitOfWork
+from app.core.tracing import traced
 
 class TaskService:
     def __init__(self, uow: IUnitOfWork):
         self.uow = uow
 
+    @traced()
     async def list_tasks(
         self, 
         status: Optional[str] = None, 
@@ -56,6 +58,7 @@ class TaskService:
             raise HTTPException(status_code=500, detail=str(e))
         
 
+    @traced()
     async def create_task(self, task_data: TaskCreate) -> TaskResponse:
         """Create a new task"""
         try:
@@ -71,6 +74,7 @@ class TaskService:
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
+    @traced()
     async def update_task(self, task_id: int, task_data: TaskUpdate) -> TaskResponse:
         """Update an existing task by its ID"""
         try:
@@ -92,6 +96,7 @@ class TaskService:
             raise HTTPException(status_code=500, detail=str(e))
         
         
+    @traced()
     async def delete_task(self, task_id: int) -> None:
         """Delete a task by its ID"""
         try:
@@ -107,6 +112,7 @@ class TaskService:
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
+    @traced()
     async def get_task_by_id(self, task_id: int) -> TaskResponse:
         """Get a single task by its ID"""
         try:
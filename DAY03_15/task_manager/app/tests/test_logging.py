@@ -0,0 +1,81 @@
+import io
+import json
+import logging
+import queue
+import sys
+
+from app.core import logging_config
+from app.core.logging_config import DroppingQueueHandler, JsonFormatter, SamplingFilter, setup_logging, shutdown_logging
+
+
+def _record(message="request", level=logging.INFO, name="uvicorn.error", **extra):
+    record = logging.LogRecord(name, level, __file__, 1, message, (), None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_writes_extra_fields_and_traceback():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord("app", logging.ERROR, __file__, 1, "failed %s", ("task",), None)
+        record.exc_info = sys.exc_info()
+    record.trace_id = "abc"
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["level"] == "ERROR"
+    assert entry["logger"] == "app"
+    assert entry["message"] == "failed task"
+    assert entry["trace_id"] == "abc"
+    assert "ValueError: boom" in entry["exc_info"]
+    assert entry["time"].endswith("+00:00")
+
+
+def test_sampling_keeps_errors_slow_requests_and_other_records():
+    sampler = SamplingFilter(rate=0.0, slow_ms=500)
+    assert not sampler.filter(_record(status=200, duration_ms=3))
+    assert sampler.filter(_record(status=404, duration_ms=3))
+    assert sampler.filter(_record(status=200, duration_ms=800))
+    assert sampler.filter(_record("startup complete"))
+    assert sampler.filter(_record("retrying", level=logging.WARNING, status=200, duration_ms=3))
+
+    access = logging.LogRecord("uvicorn.access", logging.INFO, __file__, 1, '%s - "%s %s HTTP/%s" %d',
+                               ("127.0.0.1:1", "GET", "/", "1.1", 200), None)
+    assert not sampler.filter(access)
+    assert SamplingFilter(rate=1.0).filter(_record(status=200, duration_ms=3))
+
+
+def test_full_queue_drops_records_instead_of_blocking():
+    handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+    before = logging_config.log_records_dropped_total.samples().get((), 0.0)
+    for i in range(5):
+        handler.handle(_record(f"message {i}"))
+
+    assert handler.queue.qsize() == 2
+    assert logging_config.log_records_dropped_total.samples()[()] == before + 3
+
+
+def test_setup_logging_writes_json_lines_from_the_listener_thread(monkeypatch):
+    monkeypatch.setattr(logging_config.settings, "log_sample_rate", 0.0)
+    root = logging.getLogger()
+    level, handlers = root.level, list(root.handlers)
+    uvicorn_error = logging.getLogger("uvicorn.error")
+    saved = uvicorn_error.handlers, uvicorn_error.propagate
+    stream = io.StringIO()
+    listener = setup_logging(stream)
+    try:
+        uvicorn_error.info("request", extra={"status": 200, "duration_ms": 1})
+        uvicorn_error.info("request", extra={"status": 500, "duration_ms": 1})
+        logging.getLogger("app").warning("disk %s", "low")
+    finally:
+        shutdown_logging(listener)
+        root.setLevel(level)
+        uvicorn_error.handlers, uvicorn_error.propagate = saved
+
+    assert root.handlers == handlers
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [(line["logger"], line["message"]) for line in lines] == [
+        ("uvicorn.error", "request"),
+        ("app", "disk low"),
+    ]
+    assert lines[0]["status"] == 500
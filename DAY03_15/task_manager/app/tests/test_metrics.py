@@ -0,0 +1,221 @@
+import asyncio
+import json
+import os
+import threading
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.api.v1.routes import metrics as metrics_routes
+from app.core import metrics
+from app.core.metrics import (
+    AGGREGATE_FILE, Counter, Gauge, Histogram, Registry, fold_exited_snapshots, merge_snapshots, process_token, render,
+    snapshot_path, write_snapshot,
+)
+from app.middleware.metrics_middleware import MetricsMiddleware
+
+
+def test_render_counter_gauge_and_histogram():
+    registry = Registry()
+    requests = Counter("requests_total", "Requests.", ("route",), registry=registry)
+    in_flight = Gauge("in_flight", "In flight.", registry=registry)
+    latency = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0), registry=registry)
+
+    requests.inc(("/a",))
+    requests.inc(("/a",), 2)
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(("/a",), value)
+
+    output = render(registry.snapshot())
+    assert 'requests_total{route="/a"} 3.0' in output
+    assert "in_flight 1.0" in output
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1.0' in output
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2.0' in output
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3.0' in output
+    assert 'latency_seconds_count{route="/a"} 3.0' in output
+    assert 'latency_seconds_sum{route="/a"} 5.55' in output
+    assert "# TYPE latency_seconds histogram" in output
+
+
+def test_threads_record_into_their_own_shards():
+    registry = Registry()
+    counter = Counter("work_total", "Work.", registry=registry)
+
+    def work():
+        for _ in range(1000):
+            counter.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(counter._shards) == 8
+    assert counter.samples() == {(): 8000.0}
+
+
+# A pid above the Linux maximum (2**22), so no process has it
+EXITED_PID = 2 ** 22 + 12345
+
+
+def worker_snapshot(directory, pid, token, jobs, busy=0.0, latency=None):
+    metrics_ = {
+        "jobs_total": {"type": "counter", "help": "Jobs.", "labelnames": [], "buckets": [], "samples": [[[], jobs]]},
+        "busy": {"type": "gauge", "help": "Busy.", "labelnames": [], "buckets": [], "samples": [[[], busy]]},
+    }
+    if latency is not None:
+        metrics_["latency_seconds"] = {"type": "histogram", "help": "Latency.", "labelnames": [], "buckets": [1.0],
+                                       "samples": [[[], latency]]}
+    path = directory / f"metrics-{token}.json"
+    path.write_text(json.dumps({"pid": pid, "token": token, "metrics": metrics_}))
+    return path
+
+
+def worker_registry():
+    registry = Registry()
+    counter = Counter("jobs_total", "Jobs.", registry=registry)
+    gauge = Gauge("busy", "Busy.", registry=registry)
+    latency = Histogram("latency_seconds", "Latency.", buckets=(1.0,), registry=registry)
+    counter.inc(amount=2)
+    gauge.inc()
+    latency.observe((), 0.5)
+    return registry
+
+
+def totals(merged):
+    return {name: merged[name]["samples"] for name in ("jobs_total", "busy", "latency_seconds")}
+
+
+def test_merge_snapshots_sums_workers_and_drops_gauges_of_exited_ones(tmp_path):
+    registry = worker_registry()
+    worker_snapshot(tmp_path, EXITED_PID, f"{EXITED_PID}-1", 5.0, busy=3.0, latency=[0.0, 1.0, 2.0, 1.0])
+    write_snapshot(tmp_path, registry)
+    assert snapshot_path(tmp_path, process_token()).exists()
+
+    assert totals(merge_snapshots(tmp_path, registry)) == {
+        "jobs_total": [[[], 7.0]],
+        "busy": [[[], 1.0]],
+        "latency_seconds": [[[], [1.0, 1.0, 2.5, 2.0]]],
+    }
+
+
+def test_a_reused_pid_does_not_take_over_an_exited_workers_snapshot(tmp_path):
+    registry = worker_registry()
+    # An earlier process with this process's pid
+    earlier = worker_snapshot(tmp_path, os.getpid(), f"{os.getpid()}-1", 5.0, busy=3.0)
+    # Two snapshots of another pid: only the newer process can still be running
+    worker_snapshot(tmp_path, EXITED_PID, f"{EXITED_PID}-1", 10.0, busy=4.0)
+    write_snapshot(tmp_path, registry)
+
+    assert earlier.exists()
+    merged = merge_snapshots(tmp_path, registry)
+    assert merged["jobs_total"]["samples"] == [[[], 17.0]]
+    assert merged["busy"]["samples"] == [[[], 1.0]]
+
+
+def test_snapshots_of_exited_workers_are_folded_into_the_aggregate(tmp_path):
+    registry = worker_registry()
+    worker_snapshot(tmp_path, EXITED_PID, f"{EXITED_PID}-1", 5.0, busy=3.0, latency=[0.0, 1.0, 2.0, 1.0])
+    worker_snapshot(tmp_path, EXITED_PID, str(EXITED_PID), 4.0)  # named after the pid alone
+    write_snapshot(tmp_path, registry)
+    before = totals(merge_snapshots(tmp_path, registry))
+    assert before["jobs_total"] == [[[], 11.0]]
+
+    fold_exited_snapshots(tmp_path)
+    assert list(tmp_path.glob("metrics-*.json")) == [snapshot_path(tmp_path, process_token())]
+    assert totals(merge_snapshots(tmp_path, registry)) == before
+
+    # Folding again changes nothing; a worker exiting later is added to the aggregate
+    fold_exited_snapshots(tmp_path)
+    worker_snapshot(tmp_path, EXITED_PID + 1, f"{EXITED_PID + 1}-1", 1.0, busy=2.0)
+    fold_exited_snapshots(tmp_path)
+    assert merge_snapshots(tmp_path, registry)["jobs_total"]["samples"] == [[[], 12.0]]
+    assert merge_snapshots(tmp_path, registry)["busy"]["samples"] == [[[], 1.0]]
+
+
+def test_a_folded_snapshot_that_was_not_deleted_counts_once(tmp_path):
+    registry = worker_registry()
+    path = worker_snapshot(tmp_path, EXITED_PID, f"{EXITED_PID}-1", 5.0)
+    fold_exited_snapshots(tmp_path)
+    # As if the fold had stopped after writing the aggregate
+    worker_snapshot(tmp_path, EXITED_PID, f"{EXITED_PID}-1", 5.0)
+    aggregate = json.loads((tmp_path / AGGREGATE_FILE).read_text())
+    aggregate["folded"] = [f"{EXITED_PID}-1"]
+    (tmp_path / AGGREGATE_FILE).write_text(json.dumps(aggregate))
+
+    assert merge_snapshots(tmp_path, registry)["jobs_total"]["samples"] == [[[], 7.0]]
+    fold_exited_snapshots(tmp_path)
+    assert not path.exists()
+    # Listed until the next fold, for scrapes that read the snapshot just before it was deleted
+    assert json.loads((tmp_path / AGGREGATE_FILE).read_text())["folded"] == [f"{EXITED_PID}-1"]
+    fold_exited_snapshots(tmp_path)
+    assert json.loads((tmp_path / AGGREGATE_FILE).read_text())["folded"] == []
+    assert merge_snapshots(tmp_path, registry)["jobs_total"]["samples"] == [[[], 7.0]]
+
+
+@pytest.mark.asyncio
+async def test_middleware_records_route_templates_status_and_db_time():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    metrics.instrument_engine(engine)
+    metrics.instrument_engine(engine)  # a second call must not double count
+
+    test_app = FastAPI()
+    router = APIRouter(prefix="/items")
+    release = asyncio.Event()
+
+    @router.get("/{item_id}")
+    async def item(item_id: int):
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            await connection.execute(text("SELECT 1"))
+        return {"id": item_id}
+
+    @router.get("/{item_id}/slow")
+    async def slow(item_id: int):
+        await release.wait()
+        return {"id": item_id}
+
+    test_app.include_router(router, prefix="/api")
+    test_app.include_router(metrics_routes.router)
+    test_app.add_middleware(MetricsMiddleware)
+
+    route = ("GET", "/api/items/{item_id}")
+    before = metrics.http_request_db_seconds.samples().get(route, [0.0] * 20)[-1]
+    statements_before = metrics.db_statements_total.samples().get(("/api/items/{item_id}",), 0.0)
+
+    transport = ASGITransport(app=test_app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        assert (await ac.get("/api/items/1")).status_code == 200
+        assert (await ac.get("/api/items/2")).status_code == 200
+        assert (await ac.get("/api/items/x")).status_code == 422
+        assert (await ac.get("/nowhere/3")).status_code == 404
+
+        pending = asyncio.ensure_future(ac.get("/api/items/7/slow"))
+        while not metrics.active_requests:
+            await asyncio.sleep(0.01)
+        during = (await ac.get("/metrics")).text
+        release.set()
+        assert (await pending).status_code == 200
+        r = await ac.get("/metrics")
+    await engine.dispose()
+
+    assert 'http_requests_in_flight{method="GET",route="/api/items/{item_id}/slow"} 1.0' in during
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    output = r.text
+    assert 'http_requests_total{method="GET",route="/api/items/{item_id}",status="200"}' in output
+    assert 'http_requests_total{method="GET",route="/api/items/{item_id}",status="422"}' in output
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"}' in output
+    assert 'route="/metrics"' not in output
+    assert "http_requests_in_flight{" not in output
+    assert 'cache_hit_ratio{cache="sqlalchemy_compiled"}' in output
+
+    assert metrics.http_request_db_seconds.samples()[route][-1] == before + 2
+    assert metrics.db_statements_total.samples()[("/api/items/{item_id}",)] == statements_before + 4
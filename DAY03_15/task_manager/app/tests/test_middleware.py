@@ -1,7 +1,10 @@
 import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from httpx import AsyncClient, ASGITransport
 
 from app.main import app
+from app.middleware.exception_middleware import ProblemDetailsMiddleware
 
 
 @pytest.mark.asyncio
@@ -26,3 +29,83 @@ async def test_cors_preflight_options():
         r = await ac.options("/api/v1/tasks", headers=headers)
         assert r.status_code in (200, 204)
         assert r.headers.get("access-control-allow-origin") in ("http://localhost:5173", "*")
+
+
+def _problem_app() -> FastAPI:
+    test_app = FastAPI()
+    test_app.add_middleware(ProblemDetailsMiddleware)
+
+    @test_app.get("/ok")
+    async def ok():
+        return {"ok": True}
+
+    @test_app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk{i};".encode()
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @test_app.get("/missing")
+    async def missing():
+        raise HTTPException(status_code=404, detail="Task not found", headers={"X-Reason": "gone"})
+
+    @test_app.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    @test_app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    @test_app.get("/text-error")
+    async def text_error():
+        return PlainTextResponse("teapot", status_code=418)
+
+    return test_app
+
+
+@pytest.mark.asyncio
+async def test_success_responses_pass_through_unchanged():
+    transport = ASGITransport(app=_problem_app())
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        r = await ac.get("/ok")
+        assert r.status_code == 200
+        assert r.json() == {"ok": True}
+        assert r.headers["content-type"] == "application/json"
+
+        r = await ac.get("/stream")
+        assert r.text == "chunk0;chunk1;chunk2;"
+        assert r.headers["content-type"].startswith("text/plain")
+
+
+@pytest.mark.asyncio
+async def test_error_bodies_are_rewritten_as_problem_details():
+    transport = ASGITransport(app=_problem_app(), raise_app_exceptions=False)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        r = await ac.get("/missing")
+        assert r.status_code == 404
+        assert r.headers["x-reason"] == "gone"
+        assert int(r.headers["content-length"]) == len(r.content)
+        data = r.json()
+        assert data["detail"] == "Task not found"
+        assert data["title"] == "Not Found"
+        assert data["instance"] == "/missing"
+        assert data["type"] == "about:blank#http404"
+
+        r = await ac.get("/items/abc")
+        assert r.status_code == 422
+        data = r.json()
+        assert data["type"] == "about:blank#validation"
+        assert data["detail"][0]["loc"] == ["path", "item_id"]
+
+        r = await ac.get("/text-error")
+        assert r.status_code == 418
+        assert r.json()["detail"] == "teapot"
+
+        r = await ac.get("/boom")
+        assert r.status_code == 500
+        data = r.json()
+        assert data["type"] == "about:blank#internal"
+        assert data["detail"] == "An unexpected error occurred."
+        assert data["trace_id"]
@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.api.v1.routes import profiles as profile_routes
+from app.core.config import settings
+from app.core.profiling import Profile, ProfileStore, profiles
+from app.middleware.profiling_middleware import ProfilingMiddleware
+
+SECRET = "s3cret"
+
+
+def busy_loop(seconds: float) -> int:
+    total, deadline = 0, time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        total += 1
+    return total
+
+
+def _profiled_app(store: ProfileStore) -> FastAPI:
+    test_app = FastAPI()
+
+    @test_app.get("/busy")
+    async def busy():
+        busy_loop(0.05)
+        return {"ok": True}
+
+    @test_app.get("/idle")
+    async def idle():
+        await asyncio.sleep(0.02)
+        return {"ok": True}
+
+    test_app.include_router(profile_routes.router)
+    test_app.add_middleware(ProfilingMiddleware, secret=SECRET, store=store)
+    return test_app
+
+
+@pytest.mark.asyncio
+async def test_only_requests_with_the_secret_are_profiled():
+    store = ProfileStore(max_profiles=2)
+    transport = ASGITransport(app=_profiled_app(store))
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        plain = await ac.get("/busy")
+        wrong = await ac.get("/busy", headers={"X-Profile-Token": "guess"})
+        profiled = await ac.get("/busy", headers={"X-Profile-Token": SECRET})
+
+    assert "x-profile-id" not in plain.headers
+    assert "x-profile-id" not in wrong.headers
+    profile = store.get(profiled.headers["x-profile-id"])
+    assert profile.status == 200 and profile.path == "/busy"
+    assert profile.samples > 5
+    lines = profile.collapsed().splitlines()
+    assert any("busy_loop (test_profiling.py" in line for line in lines)
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0 and ";" in stack
+
+    for trace_id in ("t0", "t1"):
+        store.add(Profile(trace_id, "GET", "/", 200, 1.0, 0.001, {}))
+    assert store.get(profile.trace_id) is None
+    assert [p.trace_id for p in store.list()] == ["t1", "t0"]
+
+
+@pytest.mark.asyncio
+async def test_waiting_is_not_sampled_and_profiles_are_served_behind_the_secret(monkeypatch):
+    monkeypatch.setattr(settings, "profiling_secret", SECRET)
+    transport = ASGITransport(app=_profiled_app(profiles))
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        r = await ac.get("/idle", headers={"X-Profile-Token": SECRET})
+        trace_id = r.headers["x-profile-id"]
+
+        assert (await ac.get("/internal/profiles")).status_code == 404
+        assert (await ac.get(f"/internal/profiles/{trace_id}", headers={"X-Profile-Token": "guess"})).status_code == 404
+        listing = await ac.get("/internal/profiles", headers={"X-Profile-Token": SECRET})
+        collapsed = await ac.get(f"/internal/profiles/{trace_id}", headers={"X-Profile-Token": SECRET})
+        missing = await ac.get("/internal/profiles/unknown", headers={"X-Profile-Token": SECRET})
+
+    assert listing.json()[0]["trace_id"] == trace_id
+    assert listing.json()[0]["duration_ms"] >= 20
+    # The request spent its time suspended in asyncio.sleep, off the event loop
+    assert profiles.get(trace_id).samples < 10
+    assert collapsed.headers["content-type"].startswith("text/plain")
+    assert missing.status_code == 404
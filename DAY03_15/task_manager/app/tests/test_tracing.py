@@ -0,0 +1,108 @@
+import pytest
+from fastapi import FastAPI, HTTPException
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import tracing
+from app.core.tracing import InMemorySpanExporter, parse_traceparent, traced
+from app.middleware.exception_middleware import ProblemDetailsMiddleware
+from app.middleware.tracing_middleware import TracingMiddleware
+
+PARENT_TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_SPAN_ID = "00f067aa0ba902b7"
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    saved = tracing.tracer.sample_rate, tracing.tracer.exporter
+    tracing.tracer.configure(1.0, exporter)
+    yield exporter
+    tracing.tracer.sample_rate, tracing.tracer.exporter = saved
+
+
+def _traced_app(engine) -> FastAPI:
+    class Service:
+        @traced()
+        async def load(self, item_id: int):
+            async with engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+                await connection.execute(text("SELECT :id"), {"id": item_id})
+            if item_id == 0:
+                raise HTTPException(status_code=404, detail="Item not found")
+            return {"id": item_id}
+
+    test_app = FastAPI()
+
+    @test_app.get("/items/{item_id}")
+    @traced()
+    async def get_item(item_id: int):
+        return await Service().load(item_id)
+
+    test_app.add_middleware(ProblemDetailsMiddleware)
+    test_app.add_middleware(TracingMiddleware)
+    return test_app
+
+
+def test_parse_traceparent():
+    assert parse_traceparent(f"00-{PARENT_TRACE_ID}-{PARENT_SPAN_ID}-01") == (PARENT_TRACE_ID, PARENT_SPAN_ID, True)
+    assert parse_traceparent(f"00-{PARENT_TRACE_ID}-{PARENT_SPAN_ID}-00")[2] is False
+    for invalid in (None, "", "garbage", f"ff-{PARENT_TRACE_ID}-{PARENT_SPAN_ID}-01",
+                    f"00-{'0' * 32}-{PARENT_SPAN_ID}-01", f"00-{PARENT_TRACE_ID}-{'0' * 16}-01"):
+        assert parse_traceparent(invalid) is None
+
+
+@pytest.mark.asyncio
+async def test_spans_nest_from_route_to_sql(exporter):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    tracing.instrument_engine(engine)
+    tracing.instrument_engine(engine)  # a second call must not record statements twice
+
+    transport = ASGITransport(app=_traced_app(engine))
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        r = await ac.get("/items/5")
+    await engine.dispose()
+
+    assert r.status_code == 200
+    spans = {span.name: span for span in exporter.spans}
+    assert exporter.names() == ["SELECT", "SELECT", "_traced_app.<locals>.Service.load",
+                                "_traced_app.<locals>.get_item", "GET /items/{item_id}"]
+    root = spans["GET /items/{item_id}"]
+    assert root.parent_id is None
+    assert root.attributes["http.status_code"] == 200
+    assert spans["_traced_app.<locals>.get_item"].parent_id == root.span_id
+    service = spans["_traced_app.<locals>.Service.load"]
+    assert service.parent_id == spans["_traced_app.<locals>.get_item"].span_id
+    statements = [span for span in exporter.spans if span.name == "SELECT"]
+    assert all(span.parent_id == service.span_id for span in statements)
+    assert statements[1].attributes["db.statement"] == "SELECT ?"
+    assert {span.trace_id for span in exporter.spans} == {root.trace_id}
+
+
+@pytest.mark.asyncio
+async def test_incoming_traceparent_is_continued_and_decides_sampling(exporter):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    tracing.instrument_engine(engine)
+    tracing.tracer.sample_rate = 0.0
+
+    transport = ASGITransport(app=_traced_app(engine))
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        unsampled = await ac.get("/items/0")
+        assert not exporter.spans
+        sampled = await ac.get("/items/0", headers={"traceparent": f"00-{PARENT_TRACE_ID}-{PARENT_SPAN_ID}-01"})
+        declined = await ac.get("/items/1", headers={"traceparent": f"00-{PARENT_TRACE_ID}-{PARENT_SPAN_ID}-00"})
+    await engine.dispose()
+
+    assert unsampled.status_code == 404
+    assert len(unsampled.json()["trace_id"]) == 32
+    assert sampled.json()["trace_id"] == PARENT_TRACE_ID
+    assert declined.status_code == 200
+
+    root = exporter.spans[-1]
+    assert root.name == "GET /items/{item_id}"
+    assert (root.trace_id, root.parent_id) == (PARENT_TRACE_ID, PARENT_SPAN_ID)
+    service = next(span for span in exporter.spans if span.name.endswith("Service.load"))
+    assert service.status == "error"
+    assert service.attributes["exception.type"] == "HTTPException"
+    assert len(exporter.spans) == 5
@@ -5,6 +5,8 @@ from app.repositories.sqlalchemy_repository import SQLAlchemyTaskRepository
 from app.repositories.interfaces.task_repository_interface import ITaskRepository
 from app.utils.files_io import write_tasks
 from app.core.database import AsyncSessionLocal
+from app.core.metrics import uow_commits_total, uow_rollbacks_total
+from app.core.tracing import traced
 
 class IUnitOfWork(ABC):
     tasks: ITaskRepository  # Changed to use interface instead of concrete type
@@ -29,6 +31,7 @@ class SQLAlchemyUnitOfWork(IUnitOfWork):
     def __init__(self):
         self.session: AsyncSession = None
 
+    @traced("uow.enter")
     async def __aenter__(self):
         self.session = AsyncSessionLocal()
         self.tasks = SQLAlchemyTaskRepository(self.session)
@@ -41,16 +44,21 @@ class SQLAlchemyUnitOfWork(IUnitOfWork):
             await self.rollback()
         await self.session.close()
 
+    @traced("uow.commit")
     async def commit(self):
         await self.session.commit()
+        uow_commits_total.inc(("sqlalchemy",))
 
+    @traced("uow.rollback")
     async def rollback(self):
         await self.session.rollback()
+        uow_rollbacks_total.inc(("sqlalchemy",))
 
 class JsonUnitOfWork(IUnitOfWork):
     def __init__(self):
         self.tasks = JsonTaskRepository()
 
+    @traced("uow.enter")
     async def __aenter__(self):
         await self.tasks._load_data()
         return self
@@ -61,8 +69,11 @@ class JsonUnitOfWork(IUnitOfWork):
         else:
             await self.rollback()
 
+    @traced("uow.commit")
     async def commit(self):
         await write_tasks(self.tasks.tasks)
+        uow_commits_total.inc(("json",))
 
+    @traced("uow.rollback")
     async def rollback(self):
-        pass
+        uow_rollbacks_total.inc(("json",))
@@ -1,21 +1,26 @@
-from fastapi import APIRouter, Depends
-from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from typing import Optional
 from datetime import date
 
-from app.api.v1.schemas.tasks import TaskCreate, TaskUpdate, TaskListResponse, TaskResponse
+from app.api.v1.schemas.tasks import TaskCreate, TaskUpdate, PaginatedTaskResponse, TaskResponse, SORT_FIELDS
 from app.services.task_services import TaskService
 from app.dependencies import get_task_service
 
 router = APIRouter()
 
-@router.get("/", response_model=TaskListResponse)
+@router.get("/", response_model=PaginatedTaskResponse)
 async def list_tasks(
     status: Optional[str] = None,
     due_date: Optional[date] = None,
     search: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    sort_by: str = Query("created_at", pattern=SORT_FIELDS),
+    sort_order: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = None,
     service: TaskService = Depends(get_task_service)
 ):
-    return await service.list_tasks(status, due_date, search)
+    return await service.list_tasks(status, due_date, search, skip, limit, sort_by, sort_order, cursor)
 
 @router.post("/", response_model=TaskResponse, status_code=201)
 async def create_task(
@@ -1,27 +1,45 @@
 from fastapi import APIRouter, Query, Path, HTTPException, Depends
-from app.api.v1.schemas.tasks import TaskCreate, TaskUpdate, TaskResponse
+from fastapi.responses import StreamingResponse
+from app.api.v1.schemas.tasks import TaskCreate, TaskUpdate, TaskResponse, PaginatedTaskResponse, SORT_FIELDS
 from app.services.task_services import TaskService
 from datetime import date
-from typing import Optional, List
+from typing import Optional
 from app.dependencies import get_task_service
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
-@router.get("", response_model=List[TaskResponse], status_code=200)
+@router.get("", response_model=PaginatedTaskResponse, status_code=200)
 async def list_tasks(
     status: Optional[str] = Query(None, description="Filter tasks by status"),
     due_date: Optional[date] = Query(None, description="Filter tasks by due date"),
     search: Optional[str] = Query(None, description="Search tasks by title"),
+    skip: int = Query(0, ge=0, description="Number of tasks to skip for pagination"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of tasks to return (max 1000)"),
+    sort_by: str = Query("created_at", pattern=SORT_FIELDS, description="Field to sort by"),
+    sort_order: str = Query("desc", pattern="^(asc|desc)$", description="Sort order: asc or desc"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
     task_service: TaskService = Depends(get_task_service)
 ):
-    """List all tasks according to filters provided"""
-    result = await task_service.list_tasks(
+    """List tasks with pagination, filtering, and sorting"""
+    return await task_service.list_tasks(
         status=status,
         due_date=due_date,
-        search=search
+        search=search,
+        skip=skip,
+        limit=limit,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        cursor=cursor
     )
-    return result.tasks
+
+
+@router.get("/export", status_code=200)
+async def export_tasks(
+    task_service: TaskService = Depends(get_task_service)
+):
+    """Stream every task as newline-delimited JSON"""
+    return StreamingResponse(task_service.export_tasks(), media_type="application/x-ndjson")
 
 
 @router.post("/", response_model=TaskResponse, status_code=201)
@@ -35,7 +53,7 @@ async def create_task(
 
 @router.delete("/{task_id}", status_code=204)
 async def delete_task(
-    task_id: int = Path(..., description="The ID of the task to delete"),
+    task_id: str = Path(..., description="The ID of the task to delete"),
     task_service: TaskService = Depends(get_task_service)
 ):
     """Delete a task by its ID"""
@@ -44,7 +62,7 @@ async def delete_task(
 
 @router.put("/{task_id}", response_model=TaskResponse, status_code=200)
 async def update_task(
-    task_id: int = Path(..., description="The ID of the task to update"),
+    task_id: str = Path(..., description="The ID of the task to update"),
     task_update: TaskUpdate = ...,
     task_service: TaskService = Depends(get_task_service)
 ):
@@ -54,7 +72,7 @@ async def update_task(
 
 @router.get("/{task_id}", response_model=TaskResponse, status_code=200)
 async def get_task(
-    task_id: int = Path(..., description="The ID of the task to retrieve"),
+    task_id: str = Path(..., description="The ID of the task to retrieve"),
     task_service: TaskService = Depends(get_task_service)
 ):
     """Get a task by its ID"""
@@ -1,6 +1,9 @@
 from .health import HealthResponse
-from .tasks import Task, TaskCreate, TaskUpdate, TaskResponse, TaskListResponse, Status, Priority
+from .tasks import Task, TaskCreate, TaskUpdate, TaskResponse, TaskListResponse, PaginatedTaskResponse, Status, Priority
 from .user import UserBase,UserResponse,UserCreate,UserUpdate  
+
+# UserResponse refers to TaskResponse by name to avoid a circular import
+UserResponse.model_rebuild(_types_namespace={"TaskResponse": TaskResponse})
 __all__ = [
     "HealthResponse",
     "Task",
@@ -8,6 +11,7 @@ __all__ = [
     "TaskUpdate",
     "TaskResponse",
     "TaskListResponse",
+    "PaginatedTaskResponse",
     "Status",
     "Priority",
     "UserBase" ,
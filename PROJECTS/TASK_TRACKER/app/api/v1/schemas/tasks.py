@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_serializer
 from typing import Optional, Union
 from enum import Enum
 from datetime import date
@@ -16,6 +16,10 @@ class Status(str,Enum):
     completed = "completed"
     
 
+# Fields list endpoints can sort by (a regex for Query(pattern=...))
+SORT_FIELDS = "^(id|title|priority|status|due_date|created_at)$"
+
+
 class Task(BaseModel):
     id: Union[int, str]
     title: str
@@ -42,7 +46,7 @@ class TaskUpdate(BaseModel):
     
 class TaskResponse(BaseModel):
     id: Union[int, str]
-    user_id: Optional[Union[int, str]]
+    user_id: Optional[Union[int, str]] = None
     user: list[UserBase] = []
     title: str
     description: Optional[str]
@@ -50,6 +54,22 @@ class TaskResponse(BaseModel):
     status: Status
     due_date: Optional[date]
 
+    @field_serializer("id")
+    def serialize_id(self, task_id: Union[int, str]) -> str:
+        # Snowflake ids exceed 2**53: as JSON numbers, JavaScript would round them
+        return str(task_id)
+
 
 class TaskListResponse(BaseModel):
-    tasks: list[TaskResponse]
\ No newline at end of file
+    tasks: list[TaskResponse]
+
+class PaginatedTaskResponse(BaseModel):
+    """Paginated response for tasks with metadata"""
+    items: list[TaskResponse]
+    total: int
+    skip: int
+    limit: int
+    has_next: bool
+    has_previous: bool
+    # Pass back as ?cursor= to get the page after this one
+    next_cursor: Optional[str] = None
@@ -1,6 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, Union
-from app.api.v1.schemas.tasks import TaskResponse
 
 class UserBase(BaseModel):
     name: str = Field(..., min_length=2, max_length=50, json_schema_extra={'example': "John Doe"})
@@ -21,5 +20,5 @@ class UserResponse(BaseModel):
     id: Union[int, str]
     name: str
     email: EmailStr
-    tasks: list[TaskResponse] = []
+    tasks: list["TaskResponse"] = []
     is_active: bool
\ No newline at end of file
@@ -1,6 +1,9 @@
 """Application configuration using Pydantic settings.
 """
 
+from pathlib import Path
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -12,6 +15,32 @@ class Settings(BaseSettings):
     
     frontend_cors_origins: list = ["http://localhost:3000", "http://localhost:3001", "http://localhost:5173"]
 
+    # Task ids are time-ordered 64-bit integers; each process needs its own
+    # worker id (0-1023). It may only be left unset when a single process
+    # generates ids (it is then 0); server workers refuse to start without it.
+    id_worker_id: Optional[int] = None
+
+    # Task backend: "json" (tasks.json, see json_* below) or "sqlite"
+    task_backend: str = "json"
+    sqlite_path: str = str(Path(__file__).parent.parent / "tasks.db")
+    sqlite_pool_size: int = 5
+
+    # JSON task storage: "file" rewrites tasks.json on every commit, "journal"
+    # appends changed tasks to tasks.journal and compacts it in the background
+    # once it grows past json_journal_compact_ratio x the size of tasks.json,
+    # "snapshot" keeps a checksummed msgpack+zstd tasks.snapshot instead
+    json_storage_engine: str = "file"
+    json_journal_compact_ratio: float = 1.0
+    # Commits arriving within this many milliseconds share one write and fsync
+    json_commit_window_ms: float = 2.0
+    # Lock commits and share a generation counter between uvicorn workers
+    # (POSIX only); the files' mtimes are then checked at most this often
+    json_worker_coordination: bool = True
+    json_reload_poll_seconds: float = 1.0
+    # Above 1, split tasks by id hash over this many files in tasks.shards/
+    # (change it with python -m tools.reshard)
+    json_shards: int = 1
+
     class Config:
         env_file = ".env"
         case_sensitive = False
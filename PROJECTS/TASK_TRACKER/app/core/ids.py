@@ -0,0 +1,116 @@
+"""Time-ordered 64-bit task ids (Snowflake layout).
+
+An id packs, from the most significant bit down::
+
+    1 bit   always 0, so ids stay positive in signed 64-bit columns
+    41 bits milliseconds since EPOCH_MS (good for ~69 years)
+    10 bits worker id, unique per running process (``ID_WORKER_ID``)
+    12 bits sequence within the millisecond
+
+Ids from one process are strictly increasing, and ids from different
+workers cannot collide as long as their worker ids differ. Because they
+grow with time, new tasks are appended at the end of id indexes instead of
+landing at random positions.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from typing import List, Optional
+
+# 2024-01-01T00:00:00Z
+EPOCH_MS = 1_704_067_200_000
+
+WORKER_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+TIMESTAMP_SHIFT = WORKER_BITS + SEQUENCE_BITS
+
+
+MISSING_WORKER_ID = (
+    "ID_WORKER_ID must be set (0-1023, different for every process) "
+    "when more than one process generates task ids"
+)
+
+
+def single_process() -> bool:
+    """False when this process is one of several server workers.
+
+    Covers uvicorn/multiprocessing workers and ``WEB_CONCURRENCY``; forked
+    workers are caught by app/core/tasks.py. Replicas on other hosts or in
+    other containers cannot be detected: give them worker ids too.
+    """
+    try:
+        concurrency = int(os.environ.get("WEB_CONCURRENCY", "1"))
+    except ValueError:
+        concurrency = 1
+    return multiprocessing.parent_process() is None and concurrency <= 1
+
+
+class IdGenerator:
+    """Thread-safe Snowflake id generator for one worker id.
+
+    If more than 4096 ids are needed within one millisecond, or the system
+    clock steps backwards, the generator keeps counting on from the last
+    timestamp it used instead of waiting, so ids never repeat or go down.
+    The timestamp catches up with the clock once it moves on.
+    """
+
+    def __init__(self, worker_id: int, clock=time.time_ns):
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"Worker id must be between 0 and {MAX_WORKER_ID}")
+        self.worker_id = worker_id
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._sequence = MAX_SEQUENCE
+
+    def _now_ms(self) -> int:
+        return self._clock() // 1_000_000 - EPOCH_MS
+
+    def _reserve(self, count: int) -> List[range]:
+        # Caller holds the lock. Hands out `count` sequence numbers as runs of
+        # consecutive ids, one run per millisecond used.
+        now = self._now_ms()
+        if now > self._last_ms:
+            self._last_ms, self._sequence = now, -1
+        runs = []
+        while count:
+            if self._sequence == MAX_SEQUENCE:
+                self._last_ms, self._sequence = self._last_ms + 1, -1
+            start = self._sequence + 1
+            taken = min(count, MAX_SEQUENCE + 1 - start)
+            base = (self._last_ms << TIMESTAMP_SHIFT) | (self.worker_id << SEQUENCE_BITS)
+            runs.append(range(base | start, (base | start) + taken))
+            self._sequence += taken
+            count -= taken
+        return runs
+
+    def next_id(self) -> int:
+        with self._lock:
+            return self._reserve(1)[0].start
+
+    def next_ids(self, count: int) -> List[int]:
+        """Allocate ``count`` increasing ids at once (for batch inserts)."""
+        if count < 0:
+            raise ValueError("count must not be negative")
+        with self._lock:
+            runs = self._reserve(count)
+        return [task_id for run in runs for task_id in run]
+
+
+def id_timestamp_ms(task_id: int) -> int:
+    """Unix time in milliseconds at which ``task_id`` was generated."""
+    return (task_id >> TIMESTAMP_SHIFT) + EPOCH_MS
+
+
+def create_id_generator(worker_id: Optional[int] = None) -> IdGenerator:
+    """A generator for ``worker_id``; without one, worker 0 if this is the
+    only process generating ids, RuntimeError otherwise."""
+    if worker_id is None:
+        if not single_process():
+            raise RuntimeError(MISSING_WORKER_ID)
+        worker_id = 0
+    return IdGenerator(worker_id)
@@ -1,9 +1,25 @@
+import os
 import uuid
-import random
+from typing import Optional
+
+from app.core.config import settings
+from app.core.ids import MISSING_WORKER_ID, IdGenerator, create_id_generator
+
+id_generator: Optional[IdGenerator] = create_id_generator(settings.id_worker_id)
+
+if settings.id_worker_id is None and hasattr(os, "register_at_fork"):
+    # A forked worker would share its parent's worker id: refuse to generate ids
+    def _forget_generator():
+        global id_generator
+        id_generator = None
+
+    os.register_at_fork(after_in_child=_forget_generator)
 
 async def generate_id():
     return str(uuid.uuid4())
 
 async def generate_int_id():
-    """Generate a random integer ID for tasks"""
-    return random.randint(1000, 999999)
\ No newline at end of file
+    """Generate a time-ordered 64-bit integer ID for tasks"""
+    if id_generator is None:
+        raise RuntimeError(MISSING_WORKER_ID)
+    return id_generator.next_id()
@@ -1,10 +1,15 @@
 from fastapi import Depends
 
-from app.unit_of_work import JsonUnitOfWork, IUnitOfWork
+from app.core.config import settings
+from app.unit_of_work import JsonUnitOfWork, ShardedUnitOfWork, SqliteUnitOfWork, IUnitOfWork
 from app.services.task_services import TaskService
 
 
 def get_uow() -> IUnitOfWork:
+    if settings.task_backend == "sqlite":
+        return SqliteUnitOfWork()
+    if settings.json_shards > 1:
+        return ShardedUnitOfWork()
     return JsonUnitOfWork()
 
 
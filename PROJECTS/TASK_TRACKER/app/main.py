@@ -1,13 +1,38 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
 from app.api.v1.routes import health, tasks
 from app.middleware.exception_middleware import exception_middleware_factory
+from app.storage.sharding import sharded_task_store
+from app.storage.sqlite_database import sqlite_db
+from app.storage.task_store import task_store
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.task_backend == "sqlite":
+        await sqlite_db.init()
+        yield
+        await sqlite_db.close()
+    elif settings.task_backend == "json" and settings.json_shards > 1:
+        # Only checks the shard layout; each shard is parsed when first needed
+        await sharded_task_store.open()
+        yield
+        await sharded_task_store.close()
+    elif settings.task_backend == "json":
+        # Parse tasks.json once per process; requests then share the cached snapshot
+        await task_store.load()
+        yield
+        await task_store.close()
+    else:
+        raise ValueError(f"Unknown task backend: {settings.task_backend}")
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title=settings.app_name)
+    app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
     # Add CORS middleware
     app.add_middleware(
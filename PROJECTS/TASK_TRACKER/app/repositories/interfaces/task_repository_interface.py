@@ -1,10 +1,31 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
 from app.api.v1.schemas.tasks import TaskResponse
 
 class ITaskRepository(ABC):
     @abstractmethod
-    async def get_all(self) -> List[Dict[str, Any]]:
+    async def get_all(
+        self, 
+        skip: int = 0, 
+        limit: Optional[int] = 100,
+        sort_by: str = "created_at",
+        sort_order: str = "desc",
+        status_filter: Optional[str] = None,
+        due_date: Optional[str] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Return one page of tasks as items/total/skip/limit/has_next/has_previous/next_cursor.
+
+        Every filter is applied in the same query. ``limit=None`` returns
+        every matching task. ``cursor`` is a ``next_cursor`` from an earlier
+        page with the same sort; an unusable cursor raises ValueError.
+        """
+        ...
+
+    @abstractmethod
+    def iter_all(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every task one at a time, without building a list."""
         ...
 
     @abstractmethod
@@ -1,36 +1,111 @@
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional, Dict, Any
 from app.repositories.interfaces.task_repository_interface import ITaskRepository
-from app.utils.files_io import read_tasks, write_tasks
+from app.storage.change_set import ChangeSet
+from app.storage.task_index import TaskIndex
+from app.storage.task_store import TaskStore, task_store, to_record
+from app.utils.pagination import decode_cursor, encode_cursor
 
 class JsonTaskRepository(ITaskRepository):
-    def __init__(self):
-        self.tasks: List[Dict[str, Any]] = []
+    def __init__(self, store: TaskStore = task_store):
+        self.store = store
+        # The snapshot this request read; the store rebases commits against it
+        self.base = TaskIndex()
+        # Same object as base until the first write copies it
+        self.index = self.base
+        self.changes = ChangeSet()
         self.loaded = False
 
     async def _load_data(self):
         if not self.loaded:
-            self.tasks = await read_tasks()
+            self.index = self.base = await self.store.snapshot()
             self.loaded = True
 
-    async def get_all(self) -> List[Dict[str, Any]]:
+    def _writable(self) -> TaskIndex:
+        """Copy-on-write: detach from the shared snapshot before mutating."""
+        if self.index is self.base:
+            self.index = self.base.copy()
+        return self.index
+
+    def mark_committed(self, published: TaskIndex) -> None:
+        """Continue from the snapshot the store published for our changes."""
+        self.index = self.base = published
+        self.changes = ChangeSet()
+
+    def discard_changes(self) -> None:
+        self.index = self.base
+        self.changes = ChangeSet()
+
+    @property
+    def tasks(self) -> List[Dict[str, Any]]:
+        return [task.to_dict() for task in self.index]
+
+    async def get_all(
+        self, 
+        skip: int = 0, 
+        limit: Optional[int] = 100,
+        sort_by: str = "created_at",
+        sort_order: str = "desc",
+        status_filter: Optional[str] = None,
+        due_date: Optional[str] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        await self._load_data()
+        after = tuple(decode_cursor(cursor, sort_by, sort_order, TaskIndex.is_sort_key)) if cursor else None
+        # Fetch one extra task to learn whether another page follows
+        items, total = self.index.query(
+            skip=skip,
+            limit=limit + 1 if limit is not None else None,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            status_filter=status_filter,
+            due_date=due_date,
+            search=search,
+            after=after
+        )
+        has_next = limit is not None and len(items) > limit
+        items = items[:limit] if limit is not None else items
+        return {
+            "items": items,
+            "total": total,
+            "skip": skip,
+            "limit": limit,
+            "has_next": has_next,
+            "has_previous": skip > 0 or after is not None,
+            "next_cursor": encode_cursor(sort_by, sort_order, list(TaskIndex.sort_key(items[-1], sort_by))) if has_next else None
+        }
+
+    async def iter_all(self) -> AsyncIterator[Dict[str, Any]]:
         await self._load_data()
-        return self.tasks
+        # Iterates the immutable snapshot (or this request's private copy)
+        for task in self.index:
+            yield task.to_dict()
 
     async def get_by_id(self, task_id: str) -> Optional[Dict[str, Any]]:
         await self._load_data()
-        return next((task for task in self.tasks if str(task["id"]) == task_id), None)
+        task = self.index.get(task_id)
+        # Callers update the returned dict in place; records are never shared out
+        return task.to_dict() if task is not None else None
 
     async def add(self, task_data: Dict[str, Any]):
         await self._load_data()
-        self.tasks.append(task_data)
+        record = to_record(task_data)
+        record.setdefault("created_at", datetime.now(timezone.utc).isoformat())
+        self._writable().insert(record)
+        self.changes.record_insert(str(record["id"]))
 
     async def update(self, task_id: str, task_data: Dict[str, Any]):
         await self._load_data()
-        for i, task in enumerate(self.tasks):
-            if str(task["id"]) == task_id:
-                self.tasks[i] = task_data
-                break
+        existing = self.index.get(task_id)
+        record = to_record(task_data)
+        if existing is None or existing == record:
+            return
+        self._writable().replace(task_id, record)
+        self.changes.record_update(task_id)
 
     async def delete(self, task_id: str):
         await self._load_data()
-        self.tasks = [task for task in self.tasks if str(task["id"]) != task_id]
+        if self.index.get(task_id) is not None:
+            self._writable().remove(task_id)
+            self.changes.record_delete(task_id)
@@ -0,0 +1,90 @@
+import asyncio
+import heapq
+from itertools import islice
+from typing import AsyncIterator, List, Optional, Dict, Any
+from app.repositories.interfaces.task_repository_interface import ITaskRepository
+from app.repositories.json_repository import JsonTaskRepository
+from app.storage.sharding import ShardedTaskStore, sharded_task_store
+from app.storage.task_index import TaskIndex
+from app.utils.pagination import decode_cursor, encode_cursor
+
+class ShardedTaskRepository(ITaskRepository):
+    """One ``JsonTaskRepository`` per shard; single-task calls touch one shard only."""
+
+    def __init__(self, store: ShardedTaskStore = sharded_task_store):
+        self.store = store
+        self.shards = [JsonTaskRepository(shard) for shard in store.shards]
+
+    def _shard(self, task_id: Any) -> JsonTaskRepository:
+        return self.shards[self.store.shard_index(task_id)]
+
+    @property
+    def dirty(self) -> List[JsonTaskRepository]:
+        """Shards this unit of work changed."""
+        return [shard for shard in self.shards if shard.changes]
+
+    def discard_changes(self) -> None:
+        for shard in self.shards:
+            shard.discard_changes()
+
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: Optional[int] = 100,
+        sort_by: str = "created_at",
+        sort_order: str = "desc",
+        status_filter: Optional[str] = None,
+        due_date: Optional[str] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        await asyncio.gather(*(shard._load_data() for shard in self.shards))
+        after = tuple(decode_cursor(cursor, sort_by, sort_order, TaskIndex.is_sort_key)) if cursor else None
+        # Scatter: the page can only contain each shard's first skip + limit + 1
+        # matches. Gather: merge those runs, which are already in sort order.
+        window = skip + limit + 1 if limit is not None else None
+        runs, total = [], 0
+        for shard in self.shards:
+            items, count = shard.index.query(
+                skip=0,
+                limit=window,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                status_filter=status_filter,
+                due_date=due_date,
+                search=search,
+                after=after
+            )
+            runs.append(items)
+            total += count
+        merged = heapq.merge(*runs, key=lambda task: TaskIndex.sort_key(task, sort_by), reverse=sort_order.lower() == "desc")
+        items = list(islice(merged, skip, window))
+        has_next = limit is not None and len(items) > limit
+        items = items[:limit] if limit is not None else items
+        return {
+            "items": items,
+            "total": total,
+            "skip": skip,
+            "limit": limit,
+            "has_next": has_next,
+            "has_previous": skip > 0 or after is not None,
+            "next_cursor": encode_cursor(sort_by, sort_order, list(TaskIndex.sort_key(items[-1], sort_by))) if has_next else None
+        }
+
+    async def iter_all(self) -> AsyncIterator[Dict[str, Any]]:
+        # Shard by shard, so only one more shard is loaded at a time
+        for shard in self.shards:
+            async for task in shard.iter_all():
+                yield task
+
+    async def get_by_id(self, task_id: str) -> Optional[Dict[str, Any]]:
+        return await self._shard(task_id).get_by_id(task_id)
+
+    async def add(self, task_data: Dict[str, Any]):
+        await self._shard(task_data["id"]).add(task_data)
+
+    async def update(self, task_id: str, task_data: Dict[str, Any]):
+        await self._shard(task_id).update(task_id, task_data)
+
+    async def delete(self, task_id: str):
+        await self._shard(task_id).delete(task_id)
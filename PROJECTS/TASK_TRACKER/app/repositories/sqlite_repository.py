@@ -0,0 +1,133 @@
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional, Dict, Any, Union
+
+import aiosqlite
+
+from app.repositories.interfaces.task_repository_interface import ITaskRepository
+from app.storage.sqlite_database import COLUMNS
+from app.storage.task_store import to_record
+from app.utils.pagination import decode_cursor, encode_cursor
+
+# Column names are interpolated into ORDER BY, so only these are accepted
+SORTABLE_COLUMNS = frozenset(COLUMNS)
+
+INSERT_TASK = f"INSERT INTO tasks ({', '.join(COLUMNS)}) VALUES ({', '.join('?' for _ in COLUMNS)})"
+UPDATE_TASK = f"UPDATE tasks SET {', '.join(f'{column} = ?' for column in COLUMNS[1:])} WHERE id = ?"
+SELECT_TASK = "SELECT * FROM tasks WHERE id = ?"
+DELETE_TASK = "DELETE FROM tasks WHERE id = ?"
+
+
+def task_key(task_id: Union[int, str]) -> Union[int, str]:
+    """Map a path id back to the type it was stored with (ids are mostly ints)."""
+    if isinstance(task_id, str) and task_id.lstrip("-").isdigit() and str(int(task_id)) == task_id:
+        return int(task_id)
+    return task_id
+
+
+def like_pattern(search: str) -> str:
+    escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def is_position(position) -> bool:
+    """A keyset position is [sort column value, id], as ``get_all`` encodes it."""
+    if len(position) != 2:
+        return False
+    value, last_id = position
+    return (value is None or isinstance(value, (str, int, float))) and not isinstance(value, bool) \
+        and isinstance(last_id, (int, str)) and not isinstance(last_id, bool)
+
+
+def row_values(record: Dict[str, Any]) -> tuple:
+    return tuple(record.get(column) for column in COLUMNS)
+
+
+class SqliteTaskRepository(ITaskRepository):
+    def __init__(self, conn: aiosqlite.Connection):
+        self.conn = conn
+
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: Optional[int] = 100,
+        sort_by: str = "created_at",
+        sort_order: str = "desc",
+        status_filter: Optional[str] = None,
+        due_date: Optional[str] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        column = sort_by if sort_by in SORTABLE_COLUMNS else "created_at"
+        descending = sort_order.lower() == "desc"
+        direction = "DESC" if descending else "ASC"
+
+        conditions, params = [], []
+        if status_filter:
+            conditions.append("status = ?")
+            params.append(status_filter)
+        if due_date:
+            conditions.append("due_date = ?")
+            params.append(due_date)
+        if search:
+            conditions.append("title LIKE ? ESCAPE '\\'")
+            params.append(like_pattern(search))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        async with self.conn.execute(f"SELECT COUNT(*) FROM tasks {where}", params) as rows:
+            (total,) = await rows.fetchone()
+
+        after = decode_cursor(cursor, sort_by, sort_order, is_position) if cursor else None
+        if after is not None:
+            # Keyset condition matching ORDER BY column, id (NULLs sort first)
+            value, last_id = after
+            if value is None:
+                keyset = (f"({column} IS NULL AND id < ?)" if descending
+                          else f"(({column} IS NULL AND id > ?) OR {column} IS NOT NULL)")
+                keyset_params = [last_id]
+            else:
+                op = "<" if descending else ">"
+                keyset = f"({column} {op} ? OR ({column} = ? AND id {op} ?){f' OR {column} IS NULL' if descending else ''})"
+                keyset_params = [value, value, last_id]
+            where = f"{where} AND {keyset}" if where else f"WHERE {keyset}"
+            params = params + keyset_params
+
+        # LIMIT -1 means no limit in SQLite; one extra row tells us if a next page exists
+        async with self.conn.execute(
+            f"SELECT * FROM tasks {where} ORDER BY {column} {direction}, id {direction} LIMIT ? OFFSET ?",
+            (*params, limit + 1 if limit is not None else -1, skip),
+        ) as rows:
+            items = [dict(row) for row in await rows.fetchall()]
+
+        has_next = limit is not None and len(items) > limit
+        items = items[:limit] if limit is not None else items
+        return {
+            "items": items,
+            "total": total,
+            "skip": skip,
+            "limit": limit,
+            "has_next": has_next,
+            "has_previous": skip > 0 or after is not None,
+            "next_cursor": encode_cursor(sort_by, sort_order, [items[-1][column], items[-1]["id"]]) if has_next else None
+        }
+
+    async def iter_all(self) -> AsyncIterator[Dict[str, Any]]:
+        async with self.conn.execute("SELECT * FROM tasks") as cursor:
+            async for row in cursor:
+                yield dict(row)
+
+    async def get_by_id(self, task_id: str) -> Optional[Dict[str, Any]]:
+        async with self.conn.execute(SELECT_TASK, (task_key(task_id),)) as cursor:
+            row = await cursor.fetchone()
+        return dict(row) if row is not None else None
+
+    async def add(self, task_data: Dict[str, Any]):
+        record = to_record(task_data)
+        record.setdefault("created_at", datetime.now(timezone.utc).isoformat())
+        await self.conn.execute(INSERT_TASK, row_values(record))
+
+    async def update(self, task_id: str, task_data: Dict[str, Any]):
+        record = to_record(task_data)
+        await self.conn.execute(UPDATE_TASK, (*row_values(record)[1:], task_key(task_id)))
+
+    async def delete(self, task_id: str):
+        await self.conn.execute(DELETE_TASK, (task_key(task_id),))
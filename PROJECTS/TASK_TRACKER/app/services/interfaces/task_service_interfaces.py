@@ -1,10 +1,10 @@
 from abc import ABC,abstractmethod
 from typing import List, Optional
 from app.api.v1.schemas.tasks import Task
-from app.api.v1.schemas import TaskListResponse,TaskCreate,TaskResponse,TaskUpdate
+from app.api.v1.schemas import PaginatedTaskResponse,TaskCreate,TaskResponse,TaskUpdate
 class TaskServiceInterface(ABC):
     @abstractmethod
-    async def list_tasks(self,status: Optional[str],due_date: Optional[str],search: Optional[str]) -> TaskListResponse:
+    async def list_tasks(self,status: Optional[str],due_date: Optional[str],search: Optional[str],skip: int = 0,limit: int = 100,sort_by: str = "created_at",sort_order: str = "desc",cursor: Optional[str] = None) -> PaginatedTaskResponse:
         pass
 
     @abstractmethod
@@ -1,39 +1,62 @@
-from typing import Optional
-from app.api.v1.schemas.tasks import TaskListResponse, TaskCreate, TaskResponse, TaskUpdate
+import json
+from typing import AsyncIterator, Optional, Union
+from app.api.v1.schemas.tasks import PaginatedTaskResponse, TaskCreate, TaskResponse, TaskUpdate
 from app.core.tasks import generate_int_id
+from app.utils.files_io import date_converter
 # compatibility alias for tests that patch 'generate_id'
 generate_id = generate_int_id
 from fastapi import HTTPException
 from datetime import date
 from app.unit_of_work import IUnitOfWork
+from app.storage.task_store import ConcurrentUpdateError
 
 class TaskService:
     def __init__(self, uow: IUnitOfWork):
         self.uow = uow
 
-    async def list_tasks(self, status: Optional[str], due_date: Optional[date], search: Optional[str]) -> TaskListResponse:
-        """List all tasks according to filters provided"""
+    async def list_tasks(
+        self,
+        status: Optional[str],
+        due_date: Optional[date],
+        search: Optional[str],
+        skip: int = 0,
+        limit: int = 100,
+        sort_by: str = "created_at",
+        sort_order: str = "desc",
+        cursor: Optional[str] = None
+    ) -> PaginatedTaskResponse:
+        """List one page of tasks according to filters provided"""
         try:
             async with self.uow:
-                tasks = await self.uow.tasks.get_all()
+                result = await self.uow.tasks.get_all(
+                    skip=skip,
+                    limit=limit,
+                    sort_by=sort_by,
+                    sort_order=sort_order,
+                    status_filter=status,
+                    due_date=due_date.isoformat() if due_date else None,
+                    search=search,
+                    cursor=cursor
+                )
 
-                if status:
-                    tasks = [task for task in tasks if task.get("status") == status]
-                    if not tasks:
-                        raise HTTPException(status_code=404, detail="No tasks found")
-                if due_date:
-                    tasks = [task for task in tasks if task.get("due_date") == due_date.isoformat()]
-                    if not tasks:
-                        raise HTTPException(status_code=404, detail="No tasks found")
-                if search:
-                    tasks = [task for task in tasks if search.lower() in task.get("title", "").lower()]
-                    if not tasks:
-                        raise HTTPException(status_code=404, detail="No tasks found")
+                if (status or due_date or search) and not result["total"]:
+                    raise HTTPException(status_code=404, detail="No tasks found")
 
-                return TaskListResponse(tasks=[TaskResponse.model_validate(task) for task in tasks])
+                return PaginatedTaskResponse(
+                    items=[TaskResponse.model_validate(task) for task in result["items"]],
+                    total=result["total"],
+                    skip=result["skip"],
+                    limit=result["limit"],
+                    has_next=result["has_next"],
+                    has_previous=result["has_previous"],
+                    next_cursor=result["next_cursor"]
+                )
         except HTTPException:
             # Re-raise HTTPExceptions created by service logic (404 etc.)
             raise
+        except ValueError as e:
+            # Malformed or mismatched cursor
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
         
@@ -49,10 +72,12 @@ class TaskService:
                 return TaskResponse.model_validate(new_task_dict)
         except HTTPException:
             raise
+        except ConcurrentUpdateError as e:
+            raise HTTPException(status_code=409, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
-    async def update_task(self, task_id: int, task_data: TaskUpdate) -> TaskResponse:
+    async def update_task(self, task_id: Union[int, str], task_data: TaskUpdate) -> TaskResponse:
         """Update an existing task by its ID"""
         try:
             async with self.uow:
@@ -69,11 +94,13 @@ class TaskService:
                 return TaskResponse.model_validate(existing_task)
         except HTTPException:
             raise
+        except ConcurrentUpdateError as e:
+            raise HTTPException(status_code=409, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
         
         
-    async def delete_task(self, task_id: int) -> None:
+    async def delete_task(self, task_id: Union[int, str]) -> None:
         """Delete a task by its ID"""
         try:
             async with self.uow:
@@ -85,10 +112,12 @@ class TaskService:
                 await self.uow.commit()
         except HTTPException:
             raise
+        except ConcurrentUpdateError as e:
+            raise HTTPException(status_code=409, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
-    async def get_task_by_id(self, task_id: int) -> TaskResponse:
+    async def get_task_by_id(self, task_id: Union[int, str]) -> TaskResponse:
         """Get a single task by its ID"""
         try:
             async with self.uow:
@@ -101,3 +130,9 @@ class TaskService:
             raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
+
+    async def export_tasks(self) -> AsyncIterator[str]:
+        """Yield every task as one NDJSON line, without materializing the list"""
+        async with self.uow:
+            async for task in self.uow.tasks.iter_all():
+                yield json.dumps(task, default=date_converter) + "\n"
@@ -0,0 +1,29 @@
+from .task_index import TaskIndex
+from .task_record import TaskRecord
+from .task_store import TaskStore, task_store, to_record, create_storage_engine, create_task_store
+from .file_engine import JsonFileEngine
+from .journal import JournalEngine
+from .coordination import WorkerCoordinator, create_coordinator
+from .sharding import ShardedTaskStore, sharded_task_store, shard_of
+from .snapshot import SnapshotEngine, SnapshotError, read_snapshot, write_snapshot
+
+__all__ = [
+    "TaskIndex",
+    "TaskRecord",
+    "TaskStore",
+    "task_store",
+    "to_record",
+    "create_storage_engine",
+    "create_task_store",
+    "JsonFileEngine",
+    "JournalEngine",
+    "WorkerCoordinator",
+    "create_coordinator",
+    "ShardedTaskStore",
+    "sharded_task_store",
+    "shard_of",
+    "SnapshotEngine",
+    "SnapshotError",
+    "read_snapshot",
+    "write_snapshot",
+]
@@ -0,0 +1,70 @@
+"""Which tasks a unit of work inserted, updated or deleted."""
+
+from typing import Any, Dict, Iterator, List, Set
+
+from app.storage.task_index import TaskIndex
+
+
+class ChangeSet:
+    """Dirty tracking for one unit of work.
+
+    Ids are classified by their net effect relative to the snapshot the
+    request started from: inserting then deleting a task leaves nothing,
+    deleting then re-inserting one is an update, and so on.
+    """
+
+    def __init__(self):
+        self.inserted: Set[str] = set()
+        self.updated: Set[str] = set()
+        self.deleted: Set[str] = set()
+        # Every touched id, in the order it was first touched
+        self._order: Dict[str, None] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.inserted or self.updated or self.deleted)
+
+    def __iter__(self) -> Iterator[str]:
+        """Ids with a net change, in the order they were first touched."""
+        return (task_id for task_id in self._order if task_id in self.inserted or task_id in self.updated or task_id in self.deleted)
+
+    def record_insert(self, task_id: str) -> None:
+        self._order.setdefault(task_id, None)
+        if task_id in self.deleted:
+            self.deleted.discard(task_id)
+            self.updated.add(task_id)
+        else:
+            self.inserted.add(task_id)
+
+    def record_update(self, task_id: str) -> None:
+        self._order.setdefault(task_id, None)
+        if task_id not in self.inserted:
+            self.updated.add(task_id)
+
+    def record_delete(self, task_id: str) -> None:
+        self._order.setdefault(task_id, None)
+        if task_id in self.inserted:
+            self.inserted.discard(task_id)
+        else:
+            self.updated.discard(task_id)
+            self.deleted.add(task_id)
+
+    def merge(self, other: "ChangeSet") -> None:
+        """Fold in a change set that was applied after this one."""
+        for task_id in other:
+            if task_id in other.inserted:
+                self.record_insert(task_id)
+            elif task_id in other.updated:
+                self.record_update(task_id)
+            else:
+                self.record_delete(task_id)
+
+    def records(self, index: TaskIndex) -> List[Dict[str, Any]]:
+        """put/del records that bring a snapshot up to date with ``index``."""
+        records = []
+        for task_id in self:
+            task = index.get(task_id)
+            if task is None:
+                records.append({"op": "del", "id": task_id})
+            else:
+                records.append({"op": "put", "task": task})
+        return records
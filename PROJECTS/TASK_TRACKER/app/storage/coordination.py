@@ -0,0 +1,91 @@
+"""Coordination between worker processes sharing one JSON task store.
+
+Two small files next to ``tasks.json``:
+
+* ``tasks.lock`` is locked with ``fcntl.flock`` by whichever process is
+  committing, so writes from ``uvicorn --workers N`` are serialized.
+* ``tasks.gen`` holds a 64-bit generation counter, memory-mapped by every
+  worker. A writer bumps it after each commit; readers compare it with the
+  generation they loaded, which is a memory read rather than a ``stat``.
+
+Both need ``fcntl`` (POSIX); elsewhere ``create_coordinator`` returns None
+and each worker falls back to polling file modification times.
+"""
+
+import asyncio
+import mmap
+import os
+import struct
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+from app.utils.files_io import TASKS
+
+GENERATION = struct.Struct("<Q")
+
+
+class WorkerCoordinator:
+    """Inter-process writer lock plus shared generation counter for one store."""
+
+    def __init__(self, path: Path = TASKS):
+        self.lock_path = path.with_suffix(".lock")
+        self.generation_path = path.with_suffix(".gen")
+        self._lock_fd: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+
+    def _mapping(self) -> mmap.mmap:
+        if self._map is None:
+            fd = os.open(self.generation_path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if os.fstat(fd).st_size < GENERATION.size:
+                    # Every worker may race to do this; extending with zeros is idempotent
+                    os.ftruncate(fd, GENERATION.size)
+                self._map = mmap.mmap(fd, GENERATION.size)
+            finally:
+                os.close(fd)
+        return self._map
+
+    def generation(self) -> int:
+        return GENERATION.unpack_from(self._mapping())[0]
+
+    def bump(self) -> int:
+        """Advance the counter; only call while holding ``writer()``."""
+        generation = self.generation() + 1
+        GENERATION.pack_into(self._mapping(), 0, generation)
+        return generation
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[None]:
+        """Hold the inter-process writer lock (waiting in a thread, not on the loop)."""
+        if self._lock_fd is None:
+            self._lock_fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        fd = self._lock_fd
+        acquire = asyncio.ensure_future(asyncio.to_thread(fcntl.flock, fd, fcntl.LOCK_EX))
+        try:
+            await asyncio.shield(acquire)
+        except asyncio.CancelledError:
+            # The thread keeps waiting and will get the lock: hand it back then
+            acquire.add_done_callback(lambda done: done.exception() or fcntl.flock(fd, fcntl.LOCK_UN))
+            raise
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+
+def create_coordinator(path: Path = TASKS) -> Optional[WorkerCoordinator]:
+    return WorkerCoordinator(path) if fcntl is not None else None
@@ -0,0 +1,40 @@
+"""Storage engine that keeps everything in a single tasks.json."""
+
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.storage.change_set import ChangeSet
+from app.storage.interfaces.storage_engine_interface import IStorageEngine
+from app.storage.task_index import TaskIndex
+from app.utils.files_io import TASKS, read_tasks, write_tasks
+
+
+def file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """Cheap change detector: (mtime_ns, size), or None if the file is missing."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class JsonFileEngine(IStorageEngine):
+    """Rewrites the whole file on every commit (the original behaviour)."""
+
+    def __init__(self, path: Path = TASKS):
+        self.path = path
+        self._signature: Optional[Tuple[int, int]] = None
+
+    async def load(self) -> List[Dict[str, Any]]:
+        # Stat before reading: if the file changes mid-read the signature is
+        # already out of date and the store reloads again on the next request.
+        self._signature = file_signature(self.path)
+        return await read_tasks(self.path)
+
+    async def persist(self, previous: TaskIndex, current: TaskIndex, changes: ChangeSet) -> None:
+        await write_tasks([task.to_dict() for task in current], self.path)
+        self._signature = file_signature(self.path)
+
+    def changed_externally(self) -> bool:
+        return file_signature(self.path) != self._signature
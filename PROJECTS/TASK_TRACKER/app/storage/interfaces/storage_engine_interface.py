@@ -0,0 +1,42 @@
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional
+from app.storage.change_set import ChangeSet
+from app.storage.task_index import TaskIndex
+
+class IStorageEngine(ABC):
+    """Persistence behind TaskStore: how tasks get from disk and back."""
+
+    @abstractmethod
+    async def load(self) -> List[Mapping]:
+        """Read the full task set (including any recovery work).
+
+        Tasks are dicts, or ``TaskRecord``s for engines that build them directly.
+        """
+        ...
+
+    @abstractmethod
+    async def persist(self, previous: TaskIndex, current: TaskIndex, changes: ChangeSet) -> None:
+        """Make ``current`` durable, given that ``previous`` already is.
+
+        ``changes`` lists the ids that differ, so engines that can write
+        deltas only need to look at those tasks.
+        """
+        ...
+
+    async def catch_up(self) -> Optional[List[Dict[str, Any]]]:
+        """put/del records written by other processes since the last load or catch-up.
+
+        Returns None when the engine cannot tell, and the store then reloads
+        everything.
+        """
+        return None
+
+    @abstractmethod
+    def changed_externally(self) -> bool:
+        """True if the files changed since this engine last loaded or wrote them."""
+        ...
+
+    async def close(self) -> None:
+        """Wait for background work (e.g. compaction) to finish."""
+        return None
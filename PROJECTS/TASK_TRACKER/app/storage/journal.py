@@ -0,0 +1,239 @@
+"""Append-only journal storage engine for the JSON task store.
+
+Layout next to the snapshot (``tasks.json``):
+
+* ``tasks.journal``        one compact JSON record per changed task
+* ``tasks.journal.sealed`` a journal that is being folded into the snapshot
+* ``tasks.journal.lock``   locked by the one worker compacting (sealing and
+  folding), so workers sharing the files never compact at the same time
+
+Records are ``{"op": "put", "task": {...}}`` (full row) or
+``{"op": "del", "id": "..."}``. Both are idempotent, so replaying a journal
+whose effects already reached the snapshot is harmless. Recovery is
+snapshot + sealed journal + journal, ignoring a torn final line.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiofiles
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; there is then one worker per store
+    fcntl = None
+
+from app.storage.file_engine import file_signature
+from app.storage.interfaces.storage_engine_interface import IStorageEngine
+from app.storage.change_set import ChangeSet
+from app.storage.task_index import TaskIndex
+from app.utils.files_io import TASKS, date_converter, read_tasks, write_tasks
+
+logger = logging.getLogger("uvicorn.error")
+
+# Do not bother compacting journals smaller than this, whatever the ratio
+MIN_COMPACT_BYTES = 64 * 1024
+
+
+def encode_record(record: Dict[str, Any]) -> str:
+    if record["op"] == "put":
+        record = {"op": "put", "task": record["task"].to_dict()}
+    return json.dumps(record, separators=(",", ":"), default=date_converter) + "\n"
+
+
+def read_records(path: Path, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+    """Complete records in ``path`` from byte ``offset`` on, and the offset just past them.
+
+    Stops at the first incomplete line: the tail of a crashed append, or an
+    append another process is still writing.
+    """
+    records = []
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return records, offset
+    with f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+            offset += len(line)
+    return records, offset
+
+
+def apply_records(tasks: Dict[str, Dict[str, Any]], records: List[Dict[str, Any]]) -> None:
+    for record in records:
+        if record["op"] == "put":
+            tasks[str(record["task"]["id"])] = record["task"]
+        elif record["op"] == "del":
+            tasks.pop(str(record["id"]), None)
+
+
+def replay(tasks: Dict[str, Dict[str, Any]], path: Path) -> int:
+    """Apply the records in ``path`` to ``tasks``; returns the offset after the last one."""
+    records, offset = read_records(path)
+    if file_signature(path) is not None and os.path.getsize(path) > offset:
+        # A crash mid-append leaves a partial last line; nothing follows it
+        logger.warning("journal_truncated_record", extra={"path": str(path)})
+    apply_records(tasks, records)
+    return offset
+
+
+class JournalEngine(IStorageEngine):
+    """Writes O(changed rows) per commit and compacts in the background."""
+
+    def __init__(self, path: Path = TASKS, compact_ratio: float = 1.0):
+        self.path = path
+        self.journal_path = path.with_suffix(".journal")
+        self.sealed_path = path.with_suffix(".journal.sealed")
+        self.compact_lock_path = path.with_suffix(".journal.lock")
+        self.compact_ratio = compact_ratio
+        self._signature: Optional[Tuple[Any, ...]] = None
+        self._compaction: Optional[asyncio.Task] = None
+        self._compact_lock_fd: Optional[int] = None
+        # How far into the live journal this process has read or written
+        self._journal_offset = 0
+        self._journal_inode: Optional[int] = None
+
+    def _signatures(self) -> Tuple[Any, ...]:
+        return (
+            file_signature(self.path),
+            file_signature(self.sealed_path),
+            file_signature(self.journal_path),
+        )
+
+    def changed_externally(self) -> bool:
+        return self._signatures() != self._signature
+
+    async def load(self) -> List[Dict[str, Any]]:
+        self._signature = self._signatures()
+        snapshot = await read_tasks(self.path)
+        tasks = {str(task["id"]): task for task in snapshot}
+
+        def _replay() -> None:
+            replay(tasks, self.sealed_path)
+            self._journal_offset = replay(tasks, self.journal_path)
+            self._journal_inode = self._inode()
+
+        await asyncio.to_thread(_replay)
+        return list(tasks.values())
+
+    def _inode(self) -> Optional[int]:
+        try:
+            return os.stat(self.journal_path).st_ino
+        except FileNotFoundError:
+            return None
+
+    async def catch_up(self) -> Optional[List[Dict[str, Any]]]:
+        """Read only what other workers appended to the live journal since we last looked."""
+        if self._signature is None:
+            return None
+        signatures = self._signatures()
+        if signatures[:2] != self._signature[:2]:
+            # tasks.json or the sealed journal changed: a compaction ran
+            return None
+
+        def _tail() -> Optional[List[Dict[str, Any]]]:
+            journal = signatures[2]
+            if journal is None:
+                return [] if self._journal_offset == 0 else None
+            inode = self._inode()
+            if (self._journal_inode is not None and inode != self._journal_inode) or journal[1] < self._journal_offset:
+                return None
+            records, self._journal_offset = read_records(self.journal_path, self._journal_offset)
+            self._journal_inode = inode
+            return records
+
+        records = await asyncio.to_thread(_tail)
+        if records is not None:
+            self._signature = signatures
+        return records
+
+    async def persist(self, previous: TaskIndex, current: TaskIndex, changes: ChangeSet) -> None:
+        records = changes.records(current)
+        if records:
+            data = "".join(encode_record(record) for record in records)
+            async with aiofiles.open(str(self.journal_path), mode="a", encoding="utf-8") as f:
+                await f.write(data)
+                await f.flush()
+                await asyncio.to_thread(os.fsync, f.fileno())
+                self._journal_inode = os.fstat(f.fileno()).st_ino
+            self._journal_offset += len(data.encode("utf-8"))
+        if self._should_compact() and self._lock_compaction():
+            if self._should_compact():
+                self._start_compaction(current)
+            else:
+                # Another worker finished a compaction meanwhile
+                self._unlock_compaction()
+        self._signature = self._signatures()
+
+    def _should_compact(self) -> bool:
+        if self._compaction is not None and not self._compaction.done():
+            return False
+        if os.path.exists(self.sealed_path):
+            # Left behind by a compaction that did not finish, or being folded
+            # by another worker; the compaction lock tells the two apart
+            return True
+        journal = file_signature(self.journal_path)
+        if journal is None or journal[1] < MIN_COMPACT_BYTES:
+            return False
+        snapshot = file_signature(self.path)
+        snapshot_size = snapshot[1] if snapshot else 0
+        return journal[1] > snapshot_size * self.compact_ratio
+
+    def _lock_compaction(self) -> bool:
+        """Take the inter-process compaction lock without waiting.
+
+        False if another worker holds it: that worker is folding the sealed
+        journal, and a sealed journal seen while nobody holds the lock was
+        left behind by a compaction that did not finish.
+        """
+        if fcntl is None:
+            return True
+        fd = os.open(self.compact_lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._compact_lock_fd = fd
+        return True
+
+    def _unlock_compaction(self) -> None:
+        if self._compact_lock_fd is not None:
+            # Closing the descriptor releases the flock
+            os.close(self._compact_lock_fd)
+            self._compact_lock_fd = None
+
+    def _start_compaction(self, current: TaskIndex) -> None:
+        # Seal the journal now, while ``current`` is exactly snapshot + journal;
+        # new commits go to a fresh journal while the snapshot is rewritten.
+        # If a stale sealed journal is still around, keep appending to the
+        # live one instead: replaying it over the new snapshot is a no-op.
+        if not os.path.exists(self.sealed_path):
+            os.replace(self.journal_path, self.sealed_path)
+            self._journal_offset, self._journal_inode = 0, None
+        self._compaction = asyncio.create_task(self._compact(current))
+
+    async def _compact(self, current: TaskIndex) -> None:
+        try:
+            await write_tasks([task.to_dict() for task in current], self.path)
+            os.remove(self.sealed_path)
+        except Exception:
+            # The sealed journal stays in place and is replayed on next load
+            logger.exception("journal_compaction_failed")
+        finally:
+            self._signature = self._signatures()
+            self._unlock_compaction()
+
+    async def close(self) -> None:
+        if self._compaction is not None:
+            await self._compaction
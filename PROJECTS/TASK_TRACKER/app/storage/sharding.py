@@ -0,0 +1,132 @@
+"""Hash-sharded layout for the JSON task store.
+
+Instead of one ``tasks.json``, tasks are split by a hash of their id over N
+shard files in ``tasks.shards/``::
+
+    tasks.shards/manifest.json    {"version": 1, "shards": N}
+    tasks.shards/shard-000.json   tasks whose crc32(id) % N == 0
+    ...
+
+Every shard is a complete ``TaskStore`` with its own engine files, commit
+queue, lock and (across workers) ``.lock``/``.gen`` files. A write
+therefore rewrites or appends to one shard only, and writes to different
+shards never wait for each other. Shards are loaded the first time a
+request needs them. List queries ask every shard for its first page and
+merge them (see ``ShardedTaskRepository``).
+
+The manifest is written last, so a layout without one is incomplete.
+Change the number of shards with ``python -m tools.reshard``.
+"""
+
+import asyncio
+import json
+import os
+import zlib
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from app.storage.task_index import TaskIndex
+from app.storage.task_record import TaskRecord
+from app.storage.task_store import TaskStore, create_storage_engine, create_task_store
+from app.utils.files_io import TASKS, fsync_dir, write_tasks
+
+SHARDS = TASKS.with_suffix(".shards")
+MANIFEST = "manifest.json"
+LAYOUT_VERSION = 1
+
+
+def shard_of(task_id: Any, count: int) -> int:
+    """Shard number of a task id; stable across processes (unlike ``hash``)."""
+    return zlib.crc32(str(task_id).encode()) % count
+
+
+def shard_path(directory: Path, shard: int) -> Path:
+    return directory / f"shard-{shard:03d}.json"
+
+
+def read_manifest(directory: Path) -> Optional[int]:
+    """Number of shards in ``directory``, or None if there is no complete layout."""
+    try:
+        with open(directory / MANIFEST, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    if manifest.get("version") != LAYOUT_VERSION:
+        raise ValueError(f"{directory / MANIFEST} was written by a newer version")
+    return manifest["shards"]
+
+
+def _write_manifest(directory: Path, count: int) -> None:
+    path = directory / MANIFEST
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": LAYOUT_VERSION, "shards": count}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    fsync_dir(directory)
+
+
+async def write_layout(directory: Path, count: int, tasks: Iterable[Mapping]) -> None:
+    """Write ``tasks`` into ``directory`` as ``count`` JSON shards plus the manifest.
+
+    Shards are plain JSON arrays, which every storage engine can start from.
+    """
+    buckets: List[List[Dict[str, Any]]] = [[] for _ in range(count)]
+    for task in tasks:
+        buckets[shard_of(task["id"], count)].append(task.to_dict() if isinstance(task, TaskRecord) else task)
+    directory.mkdir(parents=True, exist_ok=True)
+    for shard, bucket in enumerate(buckets):
+        await write_tasks(bucket, shard_path(directory, shard))
+    await asyncio.to_thread(_write_manifest, directory, count)
+
+
+class ShardedTaskStore:
+    """N independent ``TaskStore``s, one per shard file."""
+
+    def __init__(
+        self,
+        directory: Path = SHARDS,
+        count: int = 1,
+        store_factory: Callable[[Path], TaskStore] = create_task_store,
+    ):
+        if count < 1:
+            raise ValueError("A sharded task store needs at least one shard")
+        self.directory = directory
+        self.count = count
+        self.shards = [store_factory(shard_path(directory, shard)) for shard in range(count)]
+
+    def shard_index(self, task_id: Any) -> int:
+        return shard_of(task_id, self.count)
+
+    def shard_for(self, task_id: Any) -> TaskStore:
+        return self.shards[self.shard_index(task_id)]
+
+    async def open(self, legacy_path: Path = TASKS) -> None:
+        """Check the layout on disk, creating it from ``legacy_path`` on first start.
+
+        Shards themselves are not read here; each loads on first use.
+        """
+        count = read_manifest(self.directory)
+        if count is None:
+            engine = create_storage_engine(settings.json_storage_engine, legacy_path)
+            tasks = await engine.load()
+            await engine.close()
+            await write_layout(self.directory, self.count, tasks)
+        elif count != self.count:
+            raise ValueError(
+                f"{self.directory} has {count} shards but {self.count} are configured; "
+                f"run python -m tools.reshard --shards {self.count}"
+            )
+
+    async def snapshots(self) -> List[TaskIndex]:
+        """Current snapshot of every shard, loading the ones not read yet."""
+        return list(await asyncio.gather(*(store.snapshot() for store in self.shards)))
+
+    async def close(self) -> None:
+        await asyncio.gather(*(store.close() for store in self.shards))
+
+
+sharded_task_store = ShardedTaskStore(count=max(settings.json_shards, 1))
@@ -0,0 +1,203 @@
+"""Binary snapshot format for fast startup of the JSON task store.
+
+Layout of ``tasks.snapshot``::
+
+    magic    6 bytes  b"TTSNAP"
+    version  1 byte
+    codec    1 byte   0 = uncompressed, 1 = zstd
+    length   8 bytes  size of the uncompressed payload (big endian)
+    digest  16 bytes  BLAKE2b of the payload as stored
+    payload           msgpack map, possibly compressed
+
+The payload is columnar: ``{"fields": [...], "columns": [[...], ...],
+"extra": [...]}`` with one array per ``TaskRecord`` field and a map (or nil)
+of unknown fields per task. A field the task does not have is stored as
+the ext type ``MISSING_EXT``. Columns unpack much faster than one map per
+task, and are turned into ``TaskRecord``s without building dicts.
+
+msgpack is required; zstd compression is used when ``zstandard`` is
+installed, and snapshots written without it stay readable.
+"""
+
+import asyncio
+import hashlib
+import os
+import struct
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:  # optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+from app.storage.change_set import ChangeSet
+from app.storage.file_engine import file_signature
+from app.storage.interfaces.storage_engine_interface import IStorageEngine
+from app.storage.task_index import TaskIndex
+from app.storage.task_record import FIELDS, INTERNED_FIELDS, TaskRecord
+from app.utils.files_io import TASKS, fsync_dir, read_tasks
+
+MAGIC = b"TTSNAP"
+VERSION = 1
+CODEC_NONE, CODEC_ZSTD = 0, 1
+HEADER = struct.Struct(">6sBBQ16s")
+ZSTD_LEVEL = 3
+MISSING_EXT = 1
+
+# Placeholder for a field a task does not have (as opposed to null)
+MISSING = object()
+
+
+class SnapshotError(ValueError):
+    """The snapshot file is truncated, corrupt or in an unknown format."""
+
+
+def _require_msgpack() -> None:
+    if msgpack is None:
+        raise RuntimeError("The binary snapshot format needs the 'msgpack' package (pip install msgpack zstandard)")
+
+
+def _digest(payload: bytes) -> bytes:
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def _pack_default(value: Any) -> Any:
+    if value is MISSING:
+        return msgpack.ExtType(MISSING_EXT, b"")
+    raise TypeError(f"Cannot store {type(value).__name__} in a snapshot")
+
+
+def _ext_hook(code: int, data: bytes) -> Any:
+    if code == MISSING_EXT:
+        return MISSING
+    return msgpack.ExtType(code, data)
+
+
+def _extra(task: Mapping) -> Optional[Dict[str, Any]]:
+    if isinstance(task, TaskRecord):
+        return task.extra
+    return {key: value for key, value in task.items() if key not in FIELDS} or None
+
+
+def encode_snapshot(tasks: Iterable[Mapping]) -> bytes:
+    _require_msgpack()
+    tasks = list(tasks)
+    raw = msgpack.packb({
+        "fields": list(FIELDS),
+        "columns": [[task.get(field, MISSING) for task in tasks] for field in FIELDS],
+        "extra": [_extra(task) for task in tasks],
+    }, use_bin_type=True, default=_pack_default)
+    if zstandard is not None:
+        codec, payload = CODEC_ZSTD, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    else:
+        codec, payload = CODEC_NONE, raw
+    return HEADER.pack(MAGIC, VERSION, codec, len(raw), _digest(payload)) + payload
+
+
+def _records(fields: List[str], columns: List[List[Any]], extras: List[Optional[Dict[str, Any]]]) -> List[TaskRecord]:
+    new = TaskRecord.__new__
+    records = [new(TaskRecord) for _ in extras]
+    for record, extra in zip(records, extras):
+        record.extra = extra
+    for field, column in zip(fields, columns):
+        if field not in FIELDS:
+            # Written by a version with more fields: keep them as extras
+            for record, value in zip(records, column):
+                if value is not MISSING:
+                    record.extra = {**(record.extra or {}), field: value}
+            continue
+        setter = getattr(TaskRecord, field).__set__
+        interned = field in INTERNED_FIELDS
+        for record, value in zip(records, column):
+            if value is MISSING:
+                continue
+            if interned and type(value) is str:
+                value = sys.intern(value)
+            setter(record, value)
+    for record in records:
+        record.key = str(record.id)
+    return records
+
+
+def decode_snapshot(data: bytes) -> List[TaskRecord]:
+    _require_msgpack()
+    if len(data) < HEADER.size:
+        raise SnapshotError("Snapshot is truncated")
+    magic, version, codec, length, digest = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise SnapshotError("Not a task snapshot, or written by a newer version")
+    payload = memoryview(data)[HEADER.size:]
+    if _digest(payload) != digest:
+        raise SnapshotError("Snapshot checksum mismatch")
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("This snapshot is zstd-compressed; install the 'zstandard' package to read it")
+        raw = zstandard.ZstdDecompressor().decompress(payload, max_output_size=length)
+    elif codec == CODEC_NONE:
+        raw = payload
+    else:
+        raise SnapshotError(f"Unknown snapshot codec {codec}")
+    if len(raw) != length:
+        raise SnapshotError("Snapshot payload has the wrong length")
+    content = msgpack.unpackb(raw, raw=False, ext_hook=_ext_hook)
+    return _records(content["fields"], content["columns"], content["extra"])
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    fsync_dir(path.parent)
+
+
+def _read_file(path: Path) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+async def read_snapshot(path: Path) -> List[TaskRecord]:
+    """Load a snapshot; checksum verification and decoding run off the event loop."""
+    return await asyncio.to_thread(lambda: decode_snapshot(_read_file(path)))
+
+
+async def write_snapshot(tasks: Iterable[Mapping], path: Path) -> None:
+    """Atomically replace ``path`` with a snapshot of ``tasks``."""
+    await asyncio.to_thread(lambda: _write_atomic(path, encode_snapshot(tasks)))
+
+
+class SnapshotEngine(IStorageEngine):
+    """Keeps the tasks in ``tasks.snapshot`` instead of ``tasks.json``.
+
+    Every commit rewrites the snapshot, like the file engine does with the
+    JSON file. On first start, an existing ``tasks.json`` is imported.
+    """
+
+    def __init__(self, path: Path = TASKS):
+        _require_msgpack()
+        self.json_path = path
+        self.path = path.with_suffix(".snapshot")
+        self._signature: Optional[Tuple[int, int]] = None
+
+    async def load(self) -> List[Mapping]:
+        self._signature = file_signature(self.path)
+        if self._signature is None:
+            return await read_tasks(self.json_path)
+        return await read_snapshot(self.path)
+
+    async def persist(self, previous: TaskIndex, current: TaskIndex, changes: ChangeSet) -> None:
+        await write_snapshot(current, self.path)
+        self._signature = file_signature(self.path)
+
+    def changed_externally(self) -> bool:
+        return file_signature(self.path) != self._signature
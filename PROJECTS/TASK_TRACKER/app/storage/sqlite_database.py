@@ -0,0 +1,112 @@
+"""Embedded SQLite database for the task backend.
+
+The whole database is still one file next to the application (plus the
+``-wal``/``-shm`` files WAL mode keeps beside it). Connections are pooled
+and reused, so the statements each one has already compiled stay in
+sqlite3's per-connection statement cache.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, List, Union
+
+import aiosqlite
+
+from app.core.config import settings
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    -- No declared type: integer ids stay integers and string ids stay strings
+    id PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT,
+    priority TEXT,
+    status TEXT,
+    due_date TEXT,
+    created_at TEXT,
+    user_id
+);
+CREATE INDEX IF NOT EXISTS ix_tasks_status_due_date ON tasks (status, due_date);
+CREATE INDEX IF NOT EXISTS ix_tasks_status_created_at ON tasks (status, created_at);
+CREATE INDEX IF NOT EXISTS ix_tasks_due_date ON tasks (due_date);
+CREATE INDEX IF NOT EXISTS ix_tasks_created_at ON tasks (created_at);
+"""
+
+COLUMNS = ("id", "title", "description", "priority", "status", "due_date", "created_at", "user_id")
+
+# Statements compiled and kept per connection (sqlite3 defaults to 128)
+STATEMENT_CACHE_SIZE = 256
+
+
+class SqliteDatabase:
+    """A small pool of aiosqlite connections to one database file.
+
+    WAL mode lets any number of pooled connections read while one of them
+    writes; writers wait on each other for up to ``busy_timeout`` ms.
+    """
+
+    def __init__(self, path: Union[str, Path], pool_size: int = 5, busy_timeout: int = 5000):
+        self.path = str(path)
+        self.pool_size = pool_size
+        self.busy_timeout = busy_timeout
+        self._idle: List[aiosqlite.Connection] = []
+        self._opened = 0
+        self._available = asyncio.Condition()
+        self._initialized = False
+
+    async def _connect(self) -> aiosqlite.Connection:
+        conn = await aiosqlite.connect(self.path, cached_statements=STATEMENT_CACHE_SIZE)
+        conn.row_factory = aiosqlite.Row
+        await conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL is durable across application crashes, and only the
+        # last commits can be lost on power failure
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        await conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout)}")
+        return conn
+
+    async def init(self) -> None:
+        """Create the schema if needed (run once at startup)."""
+        if self._initialized:
+            return
+        async with self.connection() as conn:
+            await conn.executescript(SCHEMA)
+            await conn.commit()
+        self._initialized = True
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a pooled connection, opening one if the pool is not full."""
+        async with self._available:
+            while not self._idle and self._opened >= self.pool_size:
+                await self._available.wait()
+            conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                self._opened += 1
+        if conn is None:
+            try:
+                conn = await self._connect()
+            except Exception:
+                async with self._available:
+                    self._opened -= 1
+                    self._available.notify()
+                raise
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                await conn.rollback()
+            async with self._available:
+                self._idle.append(conn)
+                self._available.notify()
+
+    async def close(self) -> None:
+        async with self._available:
+            idle, self._idle = self._idle, []
+            self._opened -= len(idle)
+        for conn in idle:
+            await conn.close()
+        self._initialized = False
+
+
+sqlite_db = SqliteDatabase(settings.sqlite_path, pool_size=settings.sqlite_pool_size)
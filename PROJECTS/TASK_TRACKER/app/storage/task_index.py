@@ -0,0 +1,241 @@
+"""In-memory indexes over the JSON task set.
+
+``TaskIndex`` keeps an id hash index plus sorted secondary indexes so that
+the JSON repository can answer the same filtered, sorted and paginated
+queries as a database without scanning every task. Tasks are held as
+``TaskRecord`` objects; queries return plain dicts for the page only.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.storage.task_record import TaskRecord, as_record
+
+# Fields with a maintained sort order; other fields fall back to a sort of the
+# (already status-filtered) candidates.
+SORTED_FIELDS = ("created_at", "due_date")
+
+Entry = Tuple[Any, ...]
+
+
+def _sort_value(value: Any) -> Tuple[int, Any]:
+    """Total order over the values found in tasks.json (None < numbers < text)."""
+    if value is None:
+        return (0, "")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (1, value)
+    return (2, str(value))
+
+
+def _status(task: TaskRecord) -> str:
+    return task.get("status") or ""
+
+
+class TaskIndex:
+    """Id hash index plus sorted indexes on created_at, due_date and status.
+
+    For every field in ``SORTED_FIELDS`` two sorted lists are maintained:
+
+    * ``(*sort_value, id)`` for unfiltered queries
+    * ``(status, *sort_value, id)`` so a status filter is a contiguous range
+
+    A query is then two bisects plus a slice: O(log n + page size), and the
+    width of the range is the exact total. Entries are flat tuples that
+    share the record's id string, to keep the per-task overhead small.
+    """
+
+    def __init__(self, tasks: Iterable[Mapping] = ()):
+        self.by_id: Dict[str, TaskRecord] = {}
+        for task in tasks:
+            record = as_record(task)
+            self.by_id[record.key] = record
+        self.sorted: Dict[str, List[Entry]] = {}
+        self.by_status: Dict[str, List[Entry]] = {}
+        for field in SORTED_FIELDS:
+            self.sorted[field] = sorted(self._entry(task, field) for task in self.by_id.values())
+            self.by_status[field] = sorted(self._status_entry(task, field) for task in self.by_id.values())
+
+    @staticmethod
+    def _entry(task: TaskRecord, field: str) -> Entry:
+        return (*_sort_value(task.get(field)), task.key)
+
+    @staticmethod
+    def _status_entry(task: TaskRecord, field: str) -> Entry:
+        return (_status(task), *_sort_value(task.get(field)), task.key)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __iter__(self) -> Iterator[TaskRecord]:
+        return iter(self.by_id.values())
+
+    def copy(self) -> "TaskIndex":
+        """Shallow copy used for copy-on-write; records are shared, never mutated."""
+        clone = TaskIndex.__new__(TaskIndex)
+        clone.by_id = dict(self.by_id)
+        clone.sorted = {field: list(entries) for field, entries in self.sorted.items()}
+        clone.by_status = {field: list(entries) for field, entries in self.by_status.items()}
+        return clone
+
+    def get(self, task_id: str) -> Optional[TaskRecord]:
+        return self.by_id.get(task_id)
+
+    def _link(self, task: TaskRecord) -> None:
+        for field in SORTED_FIELDS:
+            insort(self.sorted[field], self._entry(task, field))
+            insort(self.by_status[field], self._status_entry(task, field))
+
+    def _unlink(self, task: TaskRecord) -> None:
+        for field in SORTED_FIELDS:
+            for entries, entry in (
+                (self.sorted[field], self._entry(task, field)),
+                (self.by_status[field], self._status_entry(task, field)),
+            ):
+                del entries[bisect_left(entries, entry)]
+
+    def insert(self, task: Mapping) -> None:
+        task = as_record(task)
+        if task.key in self.by_id:
+            raise ValueError(f"Task {task.key} already exists")
+        self.by_id[task.key] = task
+        self._link(task)
+
+    def replace(self, task_id: str, task: Mapping) -> bool:
+        old = self.by_id.get(task_id)
+        if old is None:
+            return False
+        task = as_record(task)
+        self._unlink(old)
+        self.by_id[task_id] = task
+        self._link(task)
+        return True
+
+    def remove(self, task_id: str) -> bool:
+        old = self.by_id.pop(task_id, None)
+        if old is None:
+            return False
+        self._unlink(old)
+        return True
+
+    def apply(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Apply put/del records (see ``ChangeSet.records``) in place."""
+        for record in records:
+            if record["op"] == "put":
+                task = as_record(record["task"])
+                if not self.replace(task.key, task):
+                    self.insert(task)
+            else:
+                self.remove(str(record["id"]))
+
+    @staticmethod
+    def sort_key(task: Mapping, sort_by: str) -> Entry:
+        """Position of ``task`` in ``sort_by`` order; ``query(after=...)`` resumes after it."""
+        return (*_sort_value(task.get(sort_by)), str(task["id"]))
+
+    @staticmethod
+    def is_sort_key(position: List[Any]) -> bool:
+        """Whether ``position`` has the shape of a ``sort_key``: a rank, a value
+        of the type that rank stands for, and an id (so comparing it with the
+        index entries cannot raise)."""
+        if len(position) != 3 or type(position[0]) is not int or not isinstance(position[2], str):
+            return False
+        rank, value = position[0], position[1]
+        if rank == 0:
+            return value == ""
+        if rank == 1:
+            return isinstance(value, (int, float)) and not isinstance(value, bool)
+        return rank == 2 and isinstance(value, str)
+
+    def query(
+        self,
+        skip: int = 0,
+        limit: Optional[int] = 100,
+        sort_by: str = "created_at",
+        sort_order: str = "desc",
+        status_filter: Optional[str] = None,
+        due_date: Optional[str] = None,
+        search: Optional[str] = None,
+        after: Optional[Entry] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Return one page of tasks (as dicts) and the total number of matches.
+
+        ``due_date`` is an ISO date; like ``status_filter`` it selects a
+        contiguous range of a sorted index rather than scanning. ``search``
+        (case-insensitive title substring) is checked in the same pass that
+        collects the page. ``after`` is a ``sort_key`` from a previous page:
+        the page then starts right after that task, then ``skip`` applies.
+        """
+        descending = sort_order.lower() == "desc"
+        prefix: Tuple[Any, ...] = (status_filter,) if status_filter else ()
+
+        if due_date is not None:
+            entries, lo, hi = self._due_date_range(status_filter, due_date)
+            # Within one due date, entries are ordered by id: the due_date order
+            in_order = sort_by == "due_date"
+        elif sort_by in SORTED_FIELDS:
+            entries = self.by_status[sort_by] if status_filter else self.sorted[sort_by]
+            lo, hi = self._range(entries, status_filter)
+            in_order = True
+        else:
+            # Unindexed sort key: narrow by status through the index, then sort
+            entries = self.by_status[SORTED_FIELDS[0]]
+            lo, hi = self._range(entries, status_filter)
+            in_order = False
+
+        if in_order and not search:
+            total = hi - lo
+            if after is not None:
+                position = (*prefix, *after)
+                if descending:
+                    hi = bisect_left(entries, position, lo, hi)
+                else:
+                    lo = bisect_right(entries, position, lo, hi)
+            if descending:
+                stop = hi - skip
+                start = stop - limit if limit is not None else lo
+                page = entries[max(start, lo):max(stop, lo)][::-1]
+            else:
+                start = lo + skip
+                stop = start + limit if limit is not None else hi
+                page = entries[min(start, hi):min(stop, hi)]
+            return [self.by_id[entry[-1]].to_dict() for entry in page], total
+
+        # One pass over the candidate range, keeping (sort key, task) pairs
+        needle = search.lower() if search else None
+        matches = []
+        for entry in entries[lo:hi]:
+            task = self.by_id[entry[-1]]
+            if needle is not None and needle not in (task.get("title") or "").lower():
+                continue
+            matches.append((entry[len(prefix):] if in_order else (*_sort_value(task.get(sort_by)), task.key), task))
+        if not in_order:
+            matches.sort(key=lambda match: match[0])
+        total = len(matches)
+        if after is not None:
+            keys = [key for key, _ in matches]
+            if descending:
+                matches = matches[:bisect_left(keys, after)]
+            else:
+                matches = matches[bisect_right(keys, after):]
+        if descending:
+            matches.reverse()
+        stop = skip + limit if limit is not None else None
+        return [task.to_dict() for _, task in matches[skip:stop]], total
+
+    @staticmethod
+    def _range(entries: List[Entry], status_filter: Optional[str]) -> Tuple[int, int]:
+        if not status_filter:
+            return 0, len(entries)
+        # Entries are (status, ...) tuples: every entry for this status sorts
+        # before (status + "\0",), and nothing for another status does.
+        return bisect_left(entries, (status_filter,)), bisect_left(entries, (status_filter + "\0",))
+
+    def _due_date_range(self, status_filter: Optional[str], due_date: str) -> Tuple[List[Entry], int, int]:
+        # Same prefix trick one level down: (status, rank, due_date, id)
+        prefix: Tuple[Any, ...] = (status_filter,) if status_filter else ()
+        entries = self.by_status["due_date"] if status_filter else self.sorted["due_date"]
+        rank, value = _sort_value(due_date)
+        lo = bisect_left(entries, (*prefix, rank, value))
+        hi = bisect_left(entries, (*prefix, rank, value + "\0"))
+        return entries, lo, hi
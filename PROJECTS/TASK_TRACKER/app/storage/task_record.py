@@ -0,0 +1,93 @@
+"""Compact in-memory form of one task.
+
+A parsed task is a dict with its own copy of every string, which costs
+several hundred bytes per task before any index is built. ``TaskRecord``
+keeps the known fields in ``__slots__``, interns the low-cardinality values
+(status, priority, due date) so all tasks share one string each, and keeps
+its id key as a string that the indexes reuse instead of re-formatting it.
+Dicts are only built for the tasks a request actually returns.
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional
+
+FIELDS = ("id", "title", "description", "priority", "status", "due_date", "created_at", "user_id")
+INTERNED_FIELDS = frozenset(("priority", "status", "due_date"))
+
+_UNSET = object()
+
+
+class TaskRecord(Mapping):
+    """Read-only task that behaves like the dict it was built from.
+
+    A field missing from the source dict is left unset, so ``to_dict``
+    round-trips tasks exactly; unknown fields go to ``extra``.
+    """
+
+    __slots__ = FIELDS + ("key", "extra")
+
+    @classmethod
+    def from_dict(cls, task: Dict[str, Any]) -> "TaskRecord":
+        record = cls.__new__(cls)
+        extra = None
+        for field, value in task.items():
+            if field in INTERNED_FIELDS and type(value) is str:
+                value = sys.intern(value)
+            if field in FIELDS:
+                setattr(record, field, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[field] = value
+        record.key = str(task["id"])
+        record.extra = extra
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        task = {}
+        for field in FIELDS:
+            try:
+                task[field] = getattr(self, field)
+            except AttributeError:
+                pass
+        if self.extra:
+            task.update(self.extra)
+        return task
+
+    def __getitem__(self, field: str) -> Any:
+        if field in FIELDS:
+            try:
+                return getattr(self, field)
+            except AttributeError:
+                raise KeyError(field) from None
+        if self.extra and field in self.extra:
+            return self.extra[field]
+        raise KeyError(field)
+
+    def get(self, field: str, default: Optional[Any] = None) -> Any:
+        if field in FIELDS:
+            return getattr(self, field, default)
+        return self.extra.get(field, default) if self.extra else default
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, TaskRecord):
+            # Slot by slot, without building dicts (used to match reloaded tasks)
+            for field in FIELDS:
+                if getattr(self, field, _UNSET) != getattr(other, field, _UNSET):
+                    return False
+            return self.extra == other.extra
+        return Mapping.__eq__(self, other)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def __len__(self) -> int:
+        return len(self.to_dict())
+
+    def __repr__(self) -> str:
+        return f"TaskRecord({self.to_dict()!r})"
+
+
+def as_record(task: Mapping) -> TaskRecord:
+    return task if isinstance(task, TaskRecord) else TaskRecord.from_dict(task)
@@ -0,0 +1,244 @@
+"""Process-wide, cached view of the JSON task file."""
+
+import asyncio
+import time
+from contextlib import nullcontext
+from datetime import date
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.storage.coordination import WorkerCoordinator, create_coordinator
+from app.storage.file_engine import JsonFileEngine
+from app.storage.interfaces.storage_engine_interface import IStorageEngine
+from app.storage.journal import JournalEngine
+from app.storage.snapshot import SnapshotEngine
+from app.storage.change_set import ChangeSet
+from app.storage.task_index import TaskIndex
+from app.utils.files_io import TASKS
+
+
+def to_record(task_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a task dict into the JSON-compatible form kept in the store."""
+    record = {}
+    for key, value in task_data.items():
+        if isinstance(value, Enum):
+            value = value.value
+        elif isinstance(value, date):
+            value = value.isoformat()
+        record[key] = value
+    return record
+
+
+class ConcurrentUpdateError(Exception):
+    """A task was changed by another commit after this request read it."""
+
+    def __init__(self, task_id: str):
+        super().__init__(f"Task {task_id} was modified by a concurrent request")
+        self.task_id = task_id
+
+
+def _resolve(future: asyncio.Future, result: Any = None, exception: Optional[BaseException] = None) -> None:
+    # The committing request may have been cancelled while it waited
+    if future.done():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+
+
+def create_storage_engine(name: str, path: Path = TASKS) -> IStorageEngine:
+    """Build the storage engine selected by ``settings.json_storage_engine``."""
+    if name == "file":
+        return JsonFileEngine(path)
+    if name == "journal":
+        return JournalEngine(path, compact_ratio=settings.json_journal_compact_ratio)
+    if name == "snapshot":
+        return SnapshotEngine(path)
+    raise ValueError(f"Unknown JSON storage engine: {name}")
+
+
+class TaskStore:
+    """Loads the task set once and shares it between requests.
+
+    Readers get an immutable snapshot: a ``TaskIndex`` that is never
+    modified once published (writers copy it first). The files are only
+    re-read when they change outside this process, which the engine detects
+    from their mtime and size.
+
+    Writes go through a single-writer commit queue. Each commit carries the
+    snapshot it was based on; that snapshot is its version. If another
+    commit was published in between, the writer rebases the request's
+    changes onto the latest snapshot, and rejects them with
+    ``ConcurrentUpdateError`` if one of the same tasks changed meanwhile.
+    Commits that arrive within ``commit_window`` seconds of each other are
+    persisted together with one write and one fsync.
+
+    With a ``coordinator``, several worker processes can share the files:
+    commits hold its inter-process lock and first catch up with what other
+    workers wrote, and readers notice those writes through its generation
+    counter. The files' mtimes are then only polled every
+    ``reload_poll_interval`` seconds, to pick up edits made outside the app.
+    """
+
+    def __init__(
+        self,
+        path: Path = TASKS,
+        engine: Optional[IStorageEngine] = None,
+        commit_window: float = 0.0,
+        coordinator: Optional[WorkerCoordinator] = None,
+        reload_poll_interval: float = 0.0,
+    ):
+        self.path = path
+        self.engine = engine or JsonFileEngine(path)
+        self.commit_window = commit_window
+        self.coordinator = coordinator
+        self.reload_poll_interval = reload_poll_interval
+        self._snapshot = TaskIndex()
+        self._loaded = False
+        self._generation: Optional[int] = None
+        self._polled_at = 0.0
+        self._lock = asyncio.Lock()
+        self._pending: List[Tuple[TaskIndex, TaskIndex, ChangeSet, asyncio.Future]] = []
+        self._writer: Optional[asyncio.Task] = None
+
+    def _is_stale(self, poll: bool = False) -> bool:
+        if not self._loaded:
+            return True
+        if self.coordinator is not None and self.coordinator.generation() != self._generation:
+            return True
+        now = time.monotonic()
+        if not poll and now - self._polled_at < self.reload_poll_interval:
+            return False
+        self._polled_at = now
+        return self.engine.changed_externally()
+
+    def _reconcile(self, tasks: TaskIndex) -> TaskIndex:
+        # Keep the old record objects for tasks that did not change, so
+        # commits based on the previous snapshot only conflict on real changes.
+        previous = self._snapshot.by_id
+        for key, record in tasks.by_id.items():
+            old = previous.get(key)
+            if old is not None and old == record:
+                tasks.by_id[key] = old
+        return tasks
+
+    async def _reload(self, full: bool = True) -> None:
+        generation = self.coordinator.generation() if self.coordinator is not None else None
+        records = None if full or not self._loaded else await self.engine.catch_up()
+        if records is None:
+            self._snapshot = self._reconcile(TaskIndex(await self.engine.load()))
+        elif records:
+            snapshot = self._snapshot.copy()
+            snapshot.apply(records)
+            self._snapshot = snapshot
+        self._loaded = True
+        self._generation = generation
+
+    async def load(self) -> TaskIndex:
+        """Read the files unconditionally (used at application startup)."""
+        async with self._lock:
+            await self._reload()
+            return self._snapshot
+
+    async def snapshot(self) -> TaskIndex:
+        """Return the current snapshot, reloading only if the files changed."""
+        if self._is_stale():
+            async with self._lock:
+                if self._is_stale():
+                    await self._reload(full=False)
+        return self._snapshot
+
+    async def commit(self, base: TaskIndex, index: TaskIndex, changes: ChangeSet) -> TaskIndex:
+        """Persist ``changes`` (made on ``base``, giving ``index``) and publish them.
+
+        Returns the published snapshot, which is ``index`` itself unless the
+        changes had to be rebased. The caller must not modify ``index``
+        afterwards.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((base, index, changes, future))
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.ensure_future(self._write_pending())
+        return await future
+
+    async def _write_pending(self) -> None:
+        while self._pending:
+            if self.commit_window:
+                # Let concurrent commits pile up so they share one fsync
+                await asyncio.sleep(self.commit_window)
+            batch, self._pending = self._pending, []
+            try:
+                async with self._lock:
+                    async with self.coordinator.writer() if self.coordinator is not None else nullcontext():
+                        # Another worker may have committed since we last looked
+                        if self._is_stale(poll=True):
+                            await self._reload(full=False)
+                        await self._write_batch(batch)
+            except Exception as exc:
+                # E.g. tasks.json edited into invalid JSON: fail this batch's
+                # commits and keep serving the ones queued behind it
+                for _, _, _, future in batch:
+                    _resolve(future, exception=exc)
+
+    async def _write_batch(self, batch: List[Tuple[TaskIndex, TaskIndex, ChangeSet, asyncio.Future]]) -> None:
+        published = self._snapshot
+        current = published
+        batch_changes = ChangeSet()
+        accepted = []
+        for base, index, changes, future in batch:
+            try:
+                current = self._rebase(current, base, index, changes)
+                batch_changes.merge(changes)
+                accepted.append(future)
+            except ConcurrentUpdateError as exc:
+                _resolve(future, exception=exc)
+        if batch_changes:
+            try:
+                await self.engine.persist(published, current, batch_changes)
+            except Exception as exc:
+                for future in accepted:
+                    _resolve(future, exception=exc)
+                return
+            self._snapshot = current
+            self._loaded = True
+            if self.coordinator is not None:
+                self._generation = self.coordinator.bump()
+        for future in accepted:
+            _resolve(future, result=current)
+
+    @staticmethod
+    def _rebase(current: TaskIndex, base: TaskIndex, index: TaskIndex, changes: ChangeSet) -> TaskIndex:
+        if base is current:
+            # Fast path: nothing was published since this request read
+            return index
+        for task_id in changes:
+            if current.get(task_id) is not base.get(task_id):
+                raise ConcurrentUpdateError(task_id)
+        rebased = current.copy()
+        rebased.apply(changes.records(index))
+        return rebased
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            await self._writer
+        await self.engine.close()
+        if self.coordinator is not None:
+            self.coordinator.close()
+
+
+def create_task_store(path: Path = TASKS) -> TaskStore:
+    """A store for ``path`` configured from settings (engine, commit window, coordination)."""
+    coordinator = create_coordinator(path) if settings.json_worker_coordination else None
+    return TaskStore(
+        path,
+        engine=create_storage_engine(settings.json_storage_engine, path),
+        commit_window=settings.json_commit_window_ms / 1000,
+        coordinator=coordinator,
+        reload_poll_interval=settings.json_reload_poll_seconds if coordinator is not None else 0.0,
+    )
+
+
+task_store = create_task_store()
@@ -0,0 +1,59 @@
+import json
+import pytest
+from app.storage.change_set import ChangeSet
+from app.storage.task_store import TaskStore
+from app.unit_of_work import JsonUnitOfWork
+
+def test_insert_then_delete_cancels_out():
+    changes = ChangeSet()
+    changes.record_insert("1")
+    changes.record_update("1")
+    assert changes.inserted == {"1"}
+    changes.record_delete("1")
+    assert not changes
+
+def test_delete_then_insert_is_an_update():
+    changes = ChangeSet()
+    changes.record_delete("1")
+    changes.record_insert("1")
+    assert (changes.inserted, changes.updated, changes.deleted) == (set(), {"1"}, set())
+
+def test_merge_keeps_net_effect():
+    first, second = ChangeSet(), ChangeSet()
+    first.record_insert("1")
+    first.record_update("2")
+    second.record_delete("1")
+    second.record_delete("2")
+    first.merge(second)
+    assert (first.inserted, first.updated, first.deleted) == (set(), set(), {"2"})
+    assert list(first) == ["2"]
+
+@pytest.fixture
+def store(tmp_path) -> TaskStore:
+    path = tmp_path / "tasks.json"
+    path.write_text(json.dumps([{"id": 1, "title": "Task 1", "status": "pending"}]))
+    return TaskStore(path)
+
+@pytest.mark.asyncio
+async def test_rollback_discards_in_memory_changes(store: TaskStore):
+    uow = JsonUnitOfWork(store)
+    async with uow:
+        await uow.tasks.delete("1")
+        await uow.tasks.add({"id": 2, "title": "Task 2", "status": "pending"})
+        await uow.rollback()
+        assert await uow.tasks.get_by_id("1") is not None
+        assert await uow.tasks.get_by_id("2") is None
+
+    with pytest.raises(RuntimeError):
+        async with uow:
+            await uow.tasks.delete("1")
+            raise RuntimeError("boom")
+    assert not uow.tasks.changes
+    assert (await store.snapshot()).get("1") is not None
+
+@pytest.mark.asyncio
+async def test_unchanged_update_is_not_committed(store: TaskStore):
+    async with JsonUnitOfWork(store) as uow:
+        task = await uow.tasks.get_by_id("1")
+        await uow.tasks.update("1", task)
+        assert not uow.tasks.changes
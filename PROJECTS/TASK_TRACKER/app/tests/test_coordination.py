@@ -0,0 +1,101 @@
+import asyncio
+import json
+import multiprocessing
+import pytest
+from app.storage.coordination import WorkerCoordinator
+from app.storage.file_engine import JsonFileEngine
+from app.storage.journal import JournalEngine
+from app.storage.task_store import ConcurrentUpdateError, TaskStore
+from app.unit_of_work import JsonUnitOfWork
+
+pytest.importorskip("fcntl")
+
+@pytest.fixture
+def tasks_file(tmp_path):
+    path = tmp_path / "tasks.json"
+    path.write_text(json.dumps([
+        {"id": i, "title": f"Task {i}", "status": "pending", "priority": "low", "due_date": "2025-12-01"}
+        for i in range(1, 4)
+    ]))
+    return path
+
+def worker_store(path, engine="file") -> TaskStore:
+    # A long poll interval: only the generation counter can reveal other workers' writes
+    make_engine = JournalEngine if engine == "journal" else JsonFileEngine
+    return TaskStore(path, engine=make_engine(path), coordinator=WorkerCoordinator(path), reload_poll_interval=3600)
+
+async def rename(store: TaskStore, task_id: str, title: str) -> None:
+    async with JsonUnitOfWork(store) as uow:
+        task = await uow.tasks.get_by_id(task_id)
+        task["title"] = title
+        await uow.tasks.update(task_id, task)
+
+def test_generation_is_shared_between_coordinators(tasks_file):
+    first, second = WorkerCoordinator(tasks_file), WorkerCoordinator(tasks_file)
+    assert first.generation() == second.generation() == 0
+    assert first.bump() == 1
+    assert second.generation() == 1
+    first.close()
+    second.close()
+
+@pytest.mark.asyncio
+async def test_other_worker_catches_up_from_journal_tail(tasks_file):
+    a, b = worker_store(tasks_file, "journal"), worker_store(tasks_file, "journal")
+    await a.load()
+    await b.load()
+
+    async def no_full_reload():
+        raise AssertionError("expected an incremental catch-up")
+    b.engine.load = no_full_reload
+    untouched = (await b.snapshot()).get("1")
+
+    await rename(a, "2", "Renamed by A")
+    assert (await b.snapshot()).get("2")["title"] == "Renamed by A"
+    # untouched tasks keep their identity, so B's in-flight commits on them still rebase
+    assert (await b.snapshot()).get("1") is untouched
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("engine", ["file", "journal"])
+async def test_writes_from_two_workers_are_not_lost(tasks_file, engine):
+    a, b = worker_store(tasks_file, engine), worker_store(tasks_file, engine)
+    await a.load()
+    await b.load()
+    await rename(a, "1", "From A")
+    # B has not read since A's commit; its commit must not overwrite A's
+    await rename(b, "2", "From B")
+
+    final = await worker_store(tasks_file, engine).load()
+    assert final.get("1")["title"] == "From A"
+    assert final.get("2")["title"] == "From B"
+
+@pytest.mark.asyncio
+async def test_conflicting_writes_across_workers_are_rejected(tasks_file):
+    a, b = worker_store(tasks_file), worker_store(tasks_file)
+    with pytest.raises(ConcurrentUpdateError):
+        async with JsonUnitOfWork(b) as uow_b:
+            task = await uow_b.tasks.get_by_id("1")
+            await rename(a, "1", "From A")
+            task["title"] = "From B"
+            await uow_b.tasks.update("1", task)
+    assert (await b.snapshot()).get("1")["title"] == "From A"
+
+def _insert_many(path, worker: int, count: int) -> None:
+    async def run():
+        store = worker_store(path, "journal")
+        for i in range(count):
+            async with JsonUnitOfWork(store) as uow:
+                await uow.tasks.add({"id": f"{worker}-{i}", "title": "x", "status": "pending"})
+        await store.close()
+    asyncio.run(run())
+
+def test_separate_processes_serialize_commits(tasks_file):
+    ctx = multiprocessing.get_context("spawn")
+    workers = [ctx.Process(target=_insert_many, args=(tasks_file, n, 25)) for n in range(2)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(60)
+        assert process.exitcode == 0
+
+    final = asyncio.run(worker_store(tasks_file, "journal").load())
+    assert len(final) == 3 + 50
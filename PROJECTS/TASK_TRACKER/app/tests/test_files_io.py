@@ -0,0 +1,58 @@
+import json
+import pytest
+from app.storage.task_store import TaskStore
+from app.unit_of_work import JsonUnitOfWork
+from app.services.task_services import TaskService
+from app.utils import files_io
+from app.utils.files_io import iter_tasks, read_tasks, stream_tasks
+
+TASKS = [
+    {"id": i, "title": f"Täsk {i} with some padding {'x' * i}", "status": "pending", "due_date": "2025-12-01"}
+    for i in range(1, 41)
+]
+
+@pytest.fixture
+def tasks_file(tmp_path):
+    path = tmp_path / "tasks.json"
+    path.write_text(json.dumps(TASKS, indent=4), encoding="utf-8")
+    return path
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 16])
+def test_iter_tasks_across_chunk_boundaries(tasks_file, monkeypatch, chunk_size):
+    monkeypatch.setattr(files_io, "CHUNK_SIZE", chunk_size)
+    assert list(iter_tasks(tasks_file)) == TASKS
+
+@pytest.mark.parametrize("content, expected", [
+    ("", []),
+    ("[]", []),
+    ("  [ ]\n", []),
+    ("[1, 22, 333]", [1, 22, 333]),
+])
+def test_iter_tasks_small_documents(tmp_path, monkeypatch, content, expected):
+    monkeypatch.setattr(files_io, "CHUNK_SIZE", 2)
+    path = tmp_path / "tasks.json"
+    path.write_text(content)
+    assert list(iter_tasks(path)) == expected
+
+def test_iter_tasks_missing_file(tmp_path):
+    assert list(iter_tasks(tmp_path / "missing.json")) == []
+
+@pytest.mark.parametrize("content", ['{"id": 1}', '[{"id": 1} {"id": 2}]', '[{"id": 1'])
+def test_iter_tasks_rejects_malformed_files(tmp_path, content):
+    path = tmp_path / "tasks.json"
+    path.write_text(content)
+    with pytest.raises(ValueError):
+        list(iter_tasks(path))
+
+@pytest.mark.asyncio
+async def test_stream_and_read_tasks(tasks_file, monkeypatch):
+    monkeypatch.setattr(files_io, "STREAM_BATCH_SIZE", 3)
+    assert [task async for task in stream_tasks(tasks_file)] == TASKS
+    assert await read_tasks(tasks_file) == TASKS
+
+@pytest.mark.asyncio
+async def test_export_yields_one_line_per_task(tasks_file):
+    service = TaskService(JsonUnitOfWork(TaskStore(tasks_file)))
+    lines = [line async for line in service.export_tasks()]
+    assert all(line.endswith("\n") for line in lines)
+    assert sorted((json.loads(line) for line in lines), key=lambda task: task["id"]) == TASKS
@@ -0,0 +1,109 @@
+import threading
+import pytest
+from datetime import date
+from fastapi.testclient import TestClient
+from app.api.v1.schemas.tasks import TaskCreate
+from app.core.ids import EPOCH_MS, MAX_SEQUENCE, SEQUENCE_BITS, IdGenerator, create_id_generator, id_timestamp_ms
+from app.dependencies import get_task_service
+from app.main import app
+from app.services.task_services import TaskService
+from app.storage.sqlite_database import SqliteDatabase
+from app.storage.task_store import TaskStore
+from app.unit_of_work import JsonUnitOfWork, SqliteUnitOfWork
+
+class FakeClock:
+    def __init__(self, ms):
+        self.ms = ms
+
+    def __call__(self):
+        return self.ms * 1_000_000
+
+def test_layout_and_timestamp():
+    generator = IdGenerator(5, clock=FakeClock(EPOCH_MS + 1234))
+    first = generator.next_id()
+    assert first.bit_length() <= 63
+    assert (first >> SEQUENCE_BITS) & 0x3FF == 5
+    assert id_timestamp_ms(first) == EPOCH_MS + 1234
+    assert generator.next_id() == first + 1
+
+def test_sequence_overflow_and_clock_going_back_stay_monotonic():
+    clock = FakeClock(EPOCH_MS + 10)
+    generator = IdGenerator(1, clock=clock)
+    ids = generator.next_ids(MAX_SEQUENCE + 10)
+    assert id_timestamp_ms(ids[-1]) == EPOCH_MS + 11
+    clock.ms -= 5
+    later = generator.next_id()
+    assert ids == sorted(set(ids)) and later > ids[-1]
+
+def test_workers_never_collide():
+    clock = FakeClock(EPOCH_MS + 99)
+    a, b = IdGenerator(1, clock=clock), IdGenerator(2, clock=clock)
+    assert not set(a.next_ids(100)) & set(b.next_ids(100))
+
+def test_invalid_worker_id():
+    with pytest.raises(ValueError):
+        IdGenerator(1024)
+
+def test_concurrent_threads_get_unique_increasing_ids():
+    generator = IdGenerator(3)
+    results = [[] for _ in range(8)]
+
+    def take(out):
+        for _ in range(2000):
+            out.append(generator.next_id())
+
+    threads = [threading.Thread(target=take, args=(out,)) for out in results]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(out == sorted(out) for out in results)
+    assert len(set().union(*results)) == 16000
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+async def test_backends_store_generated_ids_in_creation_order(tmp_path, backend):
+    if backend == "json":
+        path = tmp_path / "tasks.json"
+        path.write_text("[]")
+        store = TaskStore(path)
+        make_uow = lambda: JsonUnitOfWork(store)
+    else:
+        db = SqliteDatabase(tmp_path / "tasks.db")
+        await db.init()
+        make_uow = lambda: SqliteUnitOfWork(db)
+    created = []
+    for i in range(3):
+        task = await TaskService(make_uow()).create_task(TaskCreate(title=f"Task {i}", due_date=date(2025, 12, 1)))
+        created.append(task.id)
+    assert all(isinstance(task_id, int) for task_id in created) and created == sorted(created)
+    page = await TaskService(make_uow()).list_tasks(None, None, None, sort_by="id", sort_order="asc")
+    assert [task.id for task in page.items] == created
+    if backend == "sqlite":
+        await db.close()
+
+def test_worker_id_is_required_when_several_processes_generate_ids(monkeypatch):
+    assert create_id_generator().worker_id == 0
+    assert create_id_generator(7).worker_id == 7
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    with pytest.raises(RuntimeError, match="ID_WORKER_ID"):
+        create_id_generator()
+    assert create_id_generator(7).worker_id == 7
+
+def test_api_returns_ids_as_strings_and_accepts_them_back(tmp_path):
+    path = tmp_path / "tasks.json"
+    path.write_text("[]")
+    store = TaskStore(path)
+    app.dependency_overrides[get_task_service] = lambda: TaskService(JsonUnitOfWork(store))
+    try:
+        client = TestClient(app)
+        created = client.post("/api/v1/tasks/", json={"title": "Big id", "due_date": "2025-12-01"}).json()
+        assert isinstance(created["id"], str) and int(created["id"]) > 2 ** 53
+        listed = client.get("/api/v1/tasks").json()["items"]
+        assert [task["id"] for task in listed] == [created["id"]]
+        updated = client.put(f"/api/v1/tasks/{created['id']}", json={"status": "completed"})
+        assert updated.status_code == 200 and updated.json()["id"] == created["id"]
+        assert client.delete(f"/api/v1/tasks/{created['id']}").status_code == 204
+        assert client.get(f"/api/v1/tasks/{created['id']}").status_code == 404
+    finally:
+        app.dependency_overrides.clear()
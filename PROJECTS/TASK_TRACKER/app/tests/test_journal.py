@@ -0,0 +1,115 @@
+import asyncio
+import json
+import pytest
+from app.storage import journal
+from app.storage.journal import JournalEngine
+from app.storage.task_store import TaskStore
+from app.unit_of_work import JsonUnitOfWork
+
+@pytest.fixture
+def tasks_file(tmp_path):
+    path = tmp_path / "tasks.json"
+    path.write_text(json.dumps([
+        {"id": i, "title": f"Task {i}", "status": "pending", "priority": "low", "due_date": "2025-12-01"}
+        for i in range(1, 6)
+    ], indent=4))
+    return path
+
+def make_store(path, compact_ratio=1.0) -> TaskStore:
+    return TaskStore(path, engine=JournalEngine(path, compact_ratio=compact_ratio))
+
+def journal_lines(path):
+    return [json.loads(line) for line in path.with_suffix(".journal").read_text().splitlines()]
+
+@pytest.mark.asyncio
+async def test_commit_appends_only_changed_tasks(tasks_file):
+    store = make_store(tasks_file)
+    snapshot_before = tasks_file.read_text()
+    async with JsonUnitOfWork(store) as uow:
+        task = await uow.tasks.get_by_id("2")
+        task["title"] = "Renamed"
+        await uow.tasks.update("2", task)
+        await uow.tasks.delete("4")
+
+    assert tasks_file.read_text() == snapshot_before
+    assert journal_lines(tasks_file) == [
+        {"op": "put", "task": {"id": 2, "title": "Renamed", "status": "pending", "priority": "low", "due_date": "2025-12-01"}},
+        {"op": "del", "id": "4"},
+    ]
+
+@pytest.mark.asyncio
+async def test_reads_never_touch_the_journal(tasks_file):
+    store = make_store(tasks_file)
+    async with JsonUnitOfWork(store) as uow:
+        await uow.tasks.get_all()
+        await uow.tasks.get_by_id("1")
+    assert not tasks_file.with_suffix(".journal").exists()
+
+@pytest.mark.asyncio
+async def test_recovery_replays_journal_and_ignores_torn_record(tasks_file):
+    store = make_store(tasks_file)
+    async with JsonUnitOfWork(store) as uow:
+        await uow.tasks.delete("1")
+        await uow.tasks.add({"id": 6, "title": "Task 6", "status": "completed"})
+    with open(tasks_file.with_suffix(".journal"), "a") as f:
+        f.write('{"op":"del","id":"2"')  # crash mid-append
+
+    recovered = await make_store(tasks_file).load()
+    assert sorted(recovered.by_id) == ["2", "3", "4", "5", "6"]
+
+@pytest.mark.asyncio
+async def test_compaction_folds_journal_into_snapshot(tasks_file, monkeypatch):
+    monkeypatch.setattr(journal, "MIN_COMPACT_BYTES", 0)
+    store = make_store(tasks_file, compact_ratio=0.01)
+    async with JsonUnitOfWork(store) as uow:
+        await uow.tasks.delete("5")
+    await store.close()
+
+    assert not tasks_file.with_suffix(".journal").exists()
+    assert not tasks_file.with_suffix(".journal.sealed").exists()
+    assert [task["id"] for task in json.loads(tasks_file.read_text())] == [1, 2, 3, 4]
+    # the store's own compaction must not look like an external change
+    assert not store.engine.changed_externally()
+
+@pytest.mark.asyncio
+async def test_only_one_worker_folds_a_sealed_journal(tasks_file, monkeypatch):
+    monkeypatch.setattr(journal, "MIN_COMPACT_BYTES", 0)
+    pytest.importorskip("fcntl")
+    release = asyncio.Event()
+    compactions = []
+    write_tasks = journal.write_tasks
+
+    async def slow_write_tasks(tasks, path):
+        compactions.append(len(tasks))
+        await release.wait()
+        await write_tasks(tasks, path)
+
+    monkeypatch.setattr(journal, "write_tasks", slow_write_tasks)
+    a, b = make_store(tasks_file, compact_ratio=0.01), make_store(tasks_file, compact_ratio=0.01)
+    async with JsonUnitOfWork(a) as uow:
+        await uow.tasks.delete("5")
+    assert tasks_file.with_suffix(".journal.sealed").exists()
+
+    # B sees the sealed journal while A is still folding it: it must not compact too
+    async with JsonUnitOfWork(b) as uow:
+        await uow.tasks.delete("4")
+    assert compactions == [4]
+
+    release.set()
+    await a.close()
+    await b.close()
+    assert not tasks_file.with_suffix(".journal.sealed").exists()
+    recovered = await make_store(tasks_file).load()
+    assert sorted(recovered.by_id) == ["1", "2", "3"]
+
+@pytest.mark.asyncio
+async def test_a_sealed_journal_nobody_is_folding_is_folded_by_the_next_commit(tasks_file, monkeypatch):
+    pytest.importorskip("fcntl")
+    tasks_file.with_suffix(".journal.sealed").write_text('{"op":"del","id":"1"}\n')
+    store = make_store(tasks_file)
+    async with JsonUnitOfWork(store) as uow:
+        await uow.tasks.delete("2")
+    await store.close()
+
+    assert not tasks_file.with_suffix(".journal.sealed").exists()
+    assert [task["id"] for task in json.loads(tasks_file.read_text())] == [3, 4, 5]
@@ -0,0 +1,91 @@
+import json
+import random
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from app.services.task_services import TaskService
+from app.storage.sharding import ShardedTaskStore
+from app.storage.sqlite_database import SqliteDatabase
+from app.storage.task_store import TaskStore
+from app.unit_of_work import JsonUnitOfWork, ShardedUnitOfWork, SqliteUnitOfWork
+from app.utils.pagination import encode_cursor
+
+rng = random.Random(3)
+TASKS = [
+    {"id": i, "title": f"{rng.choice(['Buy', 'Call', 'Read'])} item {i}", "description": None,
+     "priority": "low", "status": rng.choice(["pending", "completed"]),
+     "due_date": f"2025-12-{rng.randint(1, 3):02d}",
+     "created_at": None if i % 7 == 0 else f"2025-01-01T00:00:{rng.randint(0, 9):02d}"}
+    for i in range(1, 61)
+]
+
+@pytest_asyncio.fixture(params=["json", "sharded", "sqlite"])
+async def make_uow(request, tmp_path):
+    if request.param == "json":
+        path = tmp_path / "tasks.json"
+        path.write_text(json.dumps(TASKS))
+        store = TaskStore(path)
+        yield lambda: JsonUnitOfWork(store)
+    elif request.param == "sharded":
+        path = tmp_path / "tasks.json"
+        path.write_text(json.dumps(TASKS))
+        store = ShardedTaskStore(tmp_path / "tasks.shards", 4, store_factory=TaskStore)
+        await store.open(path)
+        yield lambda: ShardedUnitOfWork(store)
+    else:
+        db = SqliteDatabase(tmp_path / "tasks.db")
+        await db.init()
+        async with SqliteUnitOfWork(db) as uow:
+            for task in TASKS:
+                await uow.tasks.add(task)
+        yield lambda: SqliteUnitOfWork(db)
+        await db.close()
+
+def matching(status=None, due_date=None, search=None):
+    return {t["id"] for t in TASKS
+            if (status is None or t["status"] == status)
+            and (due_date is None or t["due_date"] == due_date)
+            and (search is None or search.lower() in t["title"].lower())}
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort_by", ["created_at", "due_date", "title"])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+@pytest.mark.parametrize("filters", [{}, {"status_filter": "pending"}, {"due_date": "2025-12-02", "search": "buy"}])
+async def test_cursor_walk_visits_every_match_once(make_uow, sort_by, sort_order, filters):
+    expected = matching(filters.get("status_filter"), filters.get("due_date"), filters.get("search"))
+    seen, cursor = [], None
+    while True:
+        async with make_uow() as uow:
+            page = await uow.tasks.get_all(limit=7, sort_by=sort_by, sort_order=sort_order, cursor=cursor, **filters)
+        assert page["total"] == len(expected)
+        seen.extend(t["id"] for t in page["items"])
+        if not page["has_next"]:
+            assert page["next_cursor"] is None
+            break
+        cursor = page["next_cursor"]
+    assert len(seen) == len(set(seen)) and set(seen) == expected
+
+    # the cursor walk and offset pagination agree on the order
+    async with make_uow() as uow:
+        everything = await uow.tasks.get_all(limit=None, sort_by=sort_by, sort_order=sort_order, **filters)
+    assert [t["id"] for t in everything["items"]] == seen
+
+@pytest.mark.asyncio
+async def test_cursor_for_another_sort_is_rejected(make_uow):
+    service = TaskService(make_uow())
+    page = await service.list_tasks(None, None, None, limit=5, sort_by="due_date")
+    with pytest.raises(HTTPException) as exc:
+        await TaskService(make_uow()).list_tasks(None, None, None, limit=5, sort_by="title", cursor=page.next_cursor)
+    assert exc.value.status_code == 400
+    with pytest.raises(HTTPException) as exc:
+        await TaskService(make_uow()).list_tasks(None, None, None, cursor="not-a-cursor")
+    assert exc.value.status_code == 400
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("position", [["x", None], [2, 5, "1"], ["2", "2025-12-01", "1"], [1, "2025-12-01", "1"],
+                                      [2, "2025-12-01", "1", "extra"], [[], {}], [None, True]])
+async def test_forged_cursor_positions_are_rejected(make_uow, position):
+    cursor = encode_cursor("due_date", "asc", position)
+    with pytest.raises(HTTPException) as exc:
+        await TaskService(make_uow()).list_tasks(None, None, None, limit=5, sort_by="due_date", sort_order="asc", cursor=cursor)
+    assert exc.value.status_code == 400
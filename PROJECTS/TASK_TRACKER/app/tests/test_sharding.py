@@ -0,0 +1,96 @@
+import json
+import pytest
+from app.services.task_services import TaskService
+from app.storage.sharding import ShardedTaskStore, read_manifest, shard_of, shard_path
+from app.storage.task_store import ConcurrentUpdateError, TaskStore
+from app.unit_of_work import ShardedUnitOfWork
+from tools.reshard import reshard, to_json
+
+TASKS = [{"id": i, "title": f"Task {i}", "description": None, "priority": "low", "status": "pending",
+          "due_date": "2025-12-01", "created_at": f"2025-01-01T00:00:{i:02d}"} for i in range(1, 41)]
+
+async def open_store(tmp_path, count=4):
+    legacy = tmp_path / "tasks.json"
+    if not legacy.exists():
+        legacy.write_text(json.dumps(TASKS))
+    store = ShardedTaskStore(tmp_path / "tasks.shards", count, store_factory=TaskStore)
+    await store.open(legacy)
+    return store
+
+def shard_ids(store, shard):
+    return {task["id"] for task in json.loads(shard_path(store.directory, shard).read_text())}
+
+def test_shard_of_is_stable_and_spreads_ids():
+    assert shard_of(17, 8) == shard_of("17", 8)
+    counts = [0] * 8
+    for i in range(8000):
+        counts[shard_of(i, 8)] += 1
+    assert min(counts) > 800
+
+@pytest.mark.asyncio
+async def test_first_start_splits_tasks_json_without_loading_shards(tmp_path):
+    store = await open_store(tmp_path)
+    assert read_manifest(store.directory) == 4
+    assert set().union(*(shard_ids(store, shard) for shard in range(4))) == {t["id"] for t in TASKS}
+    assert all(shard_ids(store, shard) == {i for i in range(1, 41) if shard_of(i, 4) == shard} for shard in range(4))
+
+    async with ShardedUnitOfWork(store) as uow:
+        assert (await uow.tasks.get_by_id("7"))["title"] == "Task 7"
+    assert [shard._loaded for shard in store.shards] == [shard == shard_of(7, 4) for shard in range(4)]
+
+@pytest.mark.asyncio
+async def test_write_touches_one_shard(tmp_path):
+    store = await open_store(tmp_path)
+    before = {shard: shard_path(store.directory, shard).stat().st_mtime_ns for shard in range(4)}
+    async with ShardedUnitOfWork(store) as uow:
+        await uow.tasks.add({"id": 99, "title": "New", "status": "pending"})
+    target = shard_of(99, 4)
+    assert 99 in shard_ids(store, target)
+    for shard in range(4):
+        assert (shard_path(store.directory, shard).stat().st_mtime_ns == before[shard]) == (shard != target)
+
+@pytest.mark.asyncio
+async def test_list_merges_all_shards(tmp_path):
+    store = await open_store(tmp_path)
+    page = await TaskService(ShardedUnitOfWork(store)).list_tasks(None, None, None, skip=5, limit=10, sort_order="asc")
+    assert [task.id for task in page.items] == list(range(6, 16))
+    assert page.total == 40 and page.has_next and page.has_previous
+
+@pytest.mark.asyncio
+async def test_commit_spanning_shards_keeps_the_shards_that_succeeded(tmp_path):
+    store = await open_store(tmp_path)
+    a, b = next((i, j) for i in range(1, 41) for j in range(1, 41) if shard_of(i, 4) != shard_of(j, 4))
+    uow = ShardedUnitOfWork(store)
+    await uow.tasks.update(str(a), {**TASKS[a - 1], "title": "Changed"})
+    await uow.tasks.update(str(b), {**TASKS[b - 1], "title": "Changed"})
+    async with ShardedUnitOfWork(store) as other:
+        await other.tasks.update(str(b), {**TASKS[b - 1], "title": "Other"})
+    with pytest.raises(ConcurrentUpdateError):
+        await uow.commit()
+    async with ShardedUnitOfWork(store) as check:
+        assert (await check.tasks.get_by_id(str(a)))["title"] == "Changed"
+        assert (await check.tasks.get_by_id(str(b)))["title"] == "Other"
+
+@pytest.mark.asyncio
+async def test_mismatched_shard_count_is_refused(tmp_path):
+    await open_store(tmp_path, count=4)
+    with pytest.raises(ValueError, match="tools.reshard"):
+        await open_store(tmp_path, count=3)
+
+@pytest.mark.asyncio
+async def test_reshard_keeps_every_task(tmp_path):
+    store = await open_store(tmp_path, count=4)
+    async with ShardedUnitOfWork(store) as uow:
+        await uow.tasks.delete("1")
+    directory = tmp_path / "tasks.shards"
+    assert await reshard(3, directory, tmp_path / "tasks.json") == 39
+    assert read_manifest(directory) == 3
+    assert not (directory / "shard-003.json").exists()
+    resharded = await open_store(tmp_path, count=3)
+    async with ShardedUnitOfWork(resharded) as uow:
+        page = await uow.tasks.get_all(limit=None)
+    assert {task["id"] for task in page["items"]} == set(range(2, 41))
+
+    merged = tmp_path / "merged.json"
+    assert await to_json(directory, merged) == 39
+    assert len(json.loads(merged.read_text())) == 39
@@ -0,0 +1,56 @@
+import json
+import pytest
+from app.storage import snapshot
+from app.storage.snapshot import SnapshotEngine, SnapshotError, decode_snapshot, encode_snapshot
+from app.storage.task_store import TaskStore
+from app.unit_of_work import JsonUnitOfWork
+from tools.convert_snapshot import to_json, to_snapshot
+
+pytest.importorskip("msgpack")
+
+TASKS = [
+    {"id": 1, "title": "Task 1", "description": None, "status": "pending", "priority": "low", "due_date": "2025-12-01"},
+    {"id": "b2", "title": "Task 2", "status": "completed", "tags": ["x"]},
+]
+
+def test_round_trip_keeps_missing_and_extra_fields():
+    records = decode_snapshot(encode_snapshot(TASKS))
+    assert [record.to_dict() for record in records] == TASKS
+    assert records[0].status is records[0].to_dict()["status"]
+    assert records[1].key == "b2"
+
+def test_uncompressed_snapshots_are_readable(monkeypatch):
+    monkeypatch.setattr(snapshot, "zstandard", None)
+    data = encode_snapshot(TASKS)
+    assert data[7] == snapshot.CODEC_NONE
+    assert [record.to_dict() for record in decode_snapshot(data)] == TASKS
+
+@pytest.mark.parametrize("corrupt", [
+    lambda data: data[:10],
+    lambda data: b"NOTSNP" + data[6:],
+    lambda data: data[:-1] + bytes([data[-1] ^ 1]),
+])
+def test_corruption_is_detected(corrupt):
+    with pytest.raises(SnapshotError):
+        decode_snapshot(corrupt(encode_snapshot(TASKS)))
+
+@pytest.mark.asyncio
+async def test_engine_imports_json_then_commits_to_snapshot(tmp_path):
+    json_path = tmp_path / "tasks.json"
+    json_path.write_text(json.dumps(TASKS))
+    store = TaskStore(json_path, engine=SnapshotEngine(json_path))
+    async with JsonUnitOfWork(store) as uow:
+        await uow.tasks.delete("1")
+
+    assert json.loads(json_path.read_text()) == TASKS
+    reloaded = await TaskStore(json_path, engine=SnapshotEngine(json_path)).load()
+    assert [task.to_dict() for task in reloaded] == TASKS[1:]
+
+@pytest.mark.asyncio
+async def test_conversion_both_ways(tmp_path):
+    json_path, snapshot_path = tmp_path / "tasks.json", tmp_path / "tasks.snapshot"
+    json_path.write_text(json.dumps(TASKS))
+    assert await to_snapshot(json_path, snapshot_path) == 2
+    json_path.unlink()
+    assert await to_json(snapshot_path, json_path) == 2
+    assert json.loads(json_path.read_text()) == TASKS
@@ -0,0 +1,93 @@
+import json
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from app.api.v1.schemas.tasks import TaskCreate, TaskUpdate
+from app.services.task_services import TaskService
+from app.storage.sqlite_database import SqliteDatabase
+from app.unit_of_work import SqliteUnitOfWork
+from tools.import_tasks_json import import_tasks
+
+TASKS = [
+    {"id": i, "title": f"Task {i}", "description": None, "priority": "low",
+     "status": ("pending", "completed")[i % 2], "due_date": f"2025-12-{i:02d}",
+     "created_at": f"2025-01-01T00:00:{i:02d}"}
+    for i in range(1, 11)
+]
+
+@pytest_asyncio.fixture
+async def database(tmp_path):
+    db = SqliteDatabase(tmp_path / "tasks.db", pool_size=2)
+    await db.init()
+    async with SqliteUnitOfWork(db) as uow:
+        for task in TASKS:
+            await uow.tasks.add(task)
+    yield db
+    await db.close()
+
+@pytest.mark.asyncio
+async def test_wal_mode_and_status_index(database):
+    async with database.connection() as conn:
+        async with conn.execute("PRAGMA journal_mode") as cursor:
+            assert (await cursor.fetchone())[0] == "wal"
+        async with conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM tasks WHERE status = ? ORDER BY due_date", ("pending",)
+        ) as cursor:
+            plan = " ".join(row[-1] for row in await cursor.fetchall())
+    assert "ix_tasks_status_due_date" in plan
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status_filter", [None, "pending"])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+async def test_get_all_pages(database, status_filter, sort_order):
+    expected = [t for t in TASKS if status_filter is None or t["status"] == status_filter]
+    expected.sort(key=lambda t: t["due_date"], reverse=sort_order == "desc")
+    async with SqliteUnitOfWork(database) as uow:
+        page = await uow.tasks.get_all(skip=1, limit=3, sort_by="due_date", sort_order=sort_order,
+                                       status_filter=status_filter)
+    assert [t["id"] for t in page["items"]] == [t["id"] for t in expected[1:4]]
+    assert page["total"] == len(expected)
+    assert page["has_next"] and page["has_previous"]
+
+@pytest.mark.asyncio
+async def test_rollback_on_error(database):
+    with pytest.raises(RuntimeError):
+        async with SqliteUnitOfWork(database) as uow:
+            await uow.tasks.delete("1")
+            raise RuntimeError("boom")
+    async with SqliteUnitOfWork(database) as uow:
+        assert await uow.tasks.get_by_id("1") is not None
+
+@pytest.mark.asyncio
+async def test_service_crud(database):
+    service = TaskService(SqliteUnitOfWork(database))
+    created = await service.create_task(TaskCreate(title="Write report", due_date="2025-11-01"))
+    fetched = await service.get_task_by_id(created.id)
+    assert fetched.title == "Write report"
+
+    updated = await service.update_task(created.id, TaskUpdate(status="completed"))
+    assert updated.status == "completed"
+    assert (await service.get_task_by_id(created.id)).status == "completed"
+
+    await service.delete_task(created.id)
+    with pytest.raises(HTTPException) as exc:
+        await service.get_task_by_id(created.id)
+    assert exc.value.status_code == 404
+
+@pytest.mark.asyncio
+async def test_import_snapshot_and_journal(tmp_path):
+    json_path = tmp_path / "tasks.json"
+    json_path.write_text(json.dumps(TASKS[:3], indent=4))
+    json_path.with_suffix(".journal").write_text(
+        json.dumps({"op": "del", "id": "1"}) + "\n"
+        + json.dumps({"op": "put", "task": {**TASKS[1], "title": "Renamed"}}) + "\n"
+        + '{"op": "put", "task"'  # torn record
+    )
+    db = SqliteDatabase(tmp_path / "tasks.db")
+    assert await import_tasks(json_path, db) == 2
+
+    async with SqliteUnitOfWork(db) as uow:
+        assert await uow.tasks.get_by_id("1") is None
+        assert (await uow.tasks.get_by_id("2"))["title"] == "Renamed"
+        assert (await uow.tasks.get_by_id("3"))["id"] == 3
+    await db.close()
@@ -0,0 +1,75 @@
+import random
+import pytest
+from app.storage.task_index import TaskIndex
+
+STATUSES = ["pending", "in_progress", "completed"]
+
+@pytest.fixture
+def tasks():
+    rng = random.Random(7)
+    return [
+        {
+            "id": i,
+            "title": f"Task {i}",
+            "status": rng.choice(STATUSES),
+            "due_date": f"2025-12-{rng.randint(1, 28):02d}",
+            "created_at": f"2025-11-01T00:00:{i:02d}",
+        }
+        for i in range(1, 41)
+    ]
+
+def expected(tasks, skip, limit, sort_by, sort_order, status):
+    rows = [t for t in tasks if status is None or t["status"] == status]
+    rows.sort(key=lambda t: (t[sort_by], str(t["id"])), reverse=sort_order == "desc")
+    return [t["id"] for t in rows[skip:skip + limit]], len(rows)
+
+@pytest.mark.parametrize("sort_by", ["created_at", "due_date"])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+@pytest.mark.parametrize("status", [None, "pending", "completed"])
+@pytest.mark.parametrize("skip", [0, 5, 50])
+def test_query_matches_full_sort(tasks, sort_by, sort_order, status, skip):
+    index = TaskIndex(tasks)
+    items, total = index.query(skip=skip, limit=7, sort_by=sort_by, sort_order=sort_order, status_filter=status)
+    assert ([t["id"] for t in items], total) == expected(tasks, skip, 7, sort_by, sort_order, status)
+
+def test_writes_keep_indexes_consistent(tasks):
+    index = TaskIndex(tasks)
+    index.remove("3")
+    index.replace("4", {**index.get("4"), "status": "completed", "due_date": "2025-01-01"})
+    index.insert({"id": 99, "title": "New", "status": "pending", "due_date": "2026-01-01", "created_at": "2025-11-02"})
+
+    rebuilt = TaskIndex(index)
+    for status in [None, "pending", "completed"]:
+        for sort_by in ["created_at", "due_date"]:
+            assert index.query(limit=None, sort_by=sort_by, status_filter=status) == rebuilt.query(limit=None, sort_by=sort_by, status_filter=status)
+
+def test_copy_does_not_share_indexes(tasks):
+    index = TaskIndex(tasks)
+    clone = index.copy()
+    clone.remove("1")
+    assert index.get("1") is not None
+    assert index.query(limit=None)[1] == len(tasks)
+
+def test_unindexed_sort_and_unknown_status(tasks):
+    index = TaskIndex(tasks)
+    items, total = index.query(limit=3, sort_by="title", sort_order="asc")
+    assert total == len(tasks)
+    assert [t["title"] for t in items] == sorted(t["title"] for t in tasks)[:3]
+    assert index.query(status_filter="archived") == ([], 0)
+
+def test_insert_duplicate_id_is_rejected(tasks):
+    index = TaskIndex(tasks)
+    with pytest.raises(ValueError):
+        index.insert(dict(tasks[0]))
+
+@pytest.mark.parametrize("sort_by", ["created_at", "due_date", "title"])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+@pytest.mark.parametrize("status", [None, "pending"])
+def test_due_date_filter_matches_scan(tasks, sort_by, sort_order, status):
+    index = TaskIndex(tasks)
+    due_date = tasks[0]["due_date"]
+    matching = [t for t in tasks if t["due_date"] == due_date]
+    items, total = index.query(skip=0, limit=None, sort_by=sort_by, sort_order=sort_order,
+                               status_filter=status, due_date=due_date)
+    assert ([t["id"] for t in items], total) == expected(matching, 0, len(matching), sort_by, sort_order, status)
+    assert index.query(due_date="1999-01-01") == ([], 0)
@@ -0,0 +1,23 @@
+import json
+from app.storage.task_record import TaskRecord
+
+def test_round_trips_missing_and_unknown_fields():
+    task = {"id": 7, "title": "Task 7", "status": "pending", "tags": ["home"]}
+    record = TaskRecord.from_dict(task)
+    assert record.to_dict() == task
+    assert record == task
+    assert record["tags"] == ["home"]
+    assert record.get("due_date") is None
+    assert "description" not in record
+    assert record.key == "7"
+
+def test_low_cardinality_values_are_shared():
+    first, second = json.loads('[{"id": 1, "title": "a", "status": "pending", "due_date": "2025-12-01"},'
+                               ' {"id": 2, "title": "b", "status": "pending", "due_date": "2025-12-01"}]')
+    assert first["status"] is not second["status"]
+    a, b = TaskRecord.from_dict(first), TaskRecord.from_dict(second)
+    assert a.status is b.status
+    assert a.due_date is b.due_date
+
+def test_records_have_no_instance_dict():
+    assert not hasattr(TaskRecord.from_dict({"id": 1, "title": "a"}), "__dict__")
@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import AsyncMock, patch
 from app.services.task_services import TaskService
-from app.api.v1.schemas.tasks import TaskCreate, TaskUpdate, TaskListResponse, TaskResponse
+from app.api.v1.schemas.tasks import TaskCreate, TaskUpdate, PaginatedTaskResponse, TaskResponse
 from fastapi import HTTPException
 from datetime import date
 from app.unit_of_work import IUnitOfWork
@@ -48,28 +48,38 @@ def sample_tasks():
         }
     ]
 
+def paged(tasks):
+    """Shape a task list like a single page from ITaskRepository.get_all."""
+    return {"items": tasks, "total": len(tasks), "skip": 0, "limit": 100, "has_next": False, "has_previous": False, "next_cursor": None}
+
 @pytest.mark.asyncio
 async def test_list_tasks_no_filters(task_service: TaskService, mock_task_repo: AsyncMock, sample_tasks):
-    mock_task_repo.get_all.return_value = sample_tasks
+    mock_task_repo.get_all.return_value = paged(sample_tasks)
     
     result = await task_service.list_tasks(None, None, None)
     
-    assert isinstance(result, TaskListResponse)
-    assert len(result.tasks) == 2
+    assert isinstance(result, PaginatedTaskResponse)
+    assert len(result.items) == 2
+    assert result.total == 2
     mock_task_repo.get_all.assert_called_once()
 
 @pytest.mark.asyncio
 async def test_list_tasks_with_status_filter(task_service: TaskService, mock_task_repo: AsyncMock, sample_tasks):
-    mock_task_repo.get_all.return_value = sample_tasks
+    # every filter is pushed down to the repository
+    mock_task_repo.get_all.return_value = paged(sample_tasks[:1])
     
-    result = await task_service.list_tasks("pending", None, None)
+    result = await task_service.list_tasks("pending", date(2025, 12, 1), None, skip=0, limit=10)
     
-    assert len(result.tasks) == 1
-    assert result.tasks[0].status == "pending"
+    assert len(result.items) == 1
+    assert result.items[0].status == "pending"
+    mock_task_repo.get_all.assert_called_once_with(
+        skip=0, limit=10, sort_by="created_at", sort_order="desc",
+        status_filter="pending", due_date="2025-12-01", search=None, cursor=None
+    )
 
 @pytest.mark.asyncio
 async def test_list_tasks_with_search_no_match(task_service: TaskService, mock_task_repo: AsyncMock, sample_tasks):
-    mock_task_repo.get_all.return_value = sample_tasks
+    mock_task_repo.get_all.return_value = paged([])
     
     with pytest.raises(HTTPException) as exc_info:
         await task_service.list_tasks(None, None, "nonexistent")
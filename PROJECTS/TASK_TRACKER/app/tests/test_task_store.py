@@ -0,0 +1,142 @@
+import asyncio
+import json
+import os
+import pytest
+from app.storage.file_engine import JsonFileEngine
+from app.storage.task_store import ConcurrentUpdateError, TaskStore
+from app.unit_of_work import JsonUnitOfWork
+
+@pytest.fixture
+def tasks_file(tmp_path):
+    path = tmp_path / "tasks.json"
+    path.write_text(json.dumps([
+        {"id": 1, "title": "Task 1", "description": None, "status": "pending", "priority": "low", "due_date": "2025-12-01"},
+        {"id": 2, "title": "Task 2", "description": None, "status": "completed", "priority": "high", "due_date": "2025-12-02"},
+    ]))
+    return path
+
+@pytest.fixture
+def store(tasks_file) -> TaskStore:
+    return TaskStore(tasks_file)
+
+@pytest.mark.asyncio
+async def test_snapshot_is_cached_between_calls(store: TaskStore):
+    first = await store.snapshot()
+    second = await store.snapshot()
+    assert len(first) == 2
+    assert first is second
+
+@pytest.mark.asyncio
+async def test_snapshot_reloads_when_file_changes(store: TaskStore, tasks_file):
+    await store.snapshot()
+    tasks_file.write_text(json.dumps([{"id": 3, "title": "External edit"}]))
+    # Force a distinct mtime even on filesystems with coarse timestamps
+    os.utime(tasks_file, ns=(1, 1))
+
+    snapshot = await store.snapshot()
+    assert [task["id"] for task in snapshot] == [3]
+
+@pytest.mark.asyncio
+async def test_commit_persists_and_swaps_snapshot(store: TaskStore, tasks_file):
+    before = await store.snapshot()
+    async with JsonUnitOfWork(store) as uow:
+        await uow.tasks.delete("1")
+        await uow.commit()
+
+    after = await store.snapshot()
+    assert sorted(task["id"] for task in before) == [1, 2]
+    assert [task["id"] for task in after] == [2]
+    assert [task["id"] for task in json.loads(tasks_file.read_text())] == [2]
+
+@pytest.mark.asyncio
+async def test_get_by_id_does_not_leak_shared_snapshot(store: TaskStore):
+    async with JsonUnitOfWork(store) as uow:
+        task = await uow.tasks.get_by_id("1")
+        task["title"] = "Changed without update()"
+
+    snapshot = await store.snapshot()
+    assert snapshot.get("1")["title"] == "Task 1"
+
+@pytest.mark.asyncio
+async def test_read_only_request_does_not_write(store: TaskStore, tasks_file):
+    await store.snapshot()
+    mtime = tasks_file.stat().st_mtime_ns
+    async with JsonUnitOfWork(store) as uow:
+        await uow.tasks.get_all()
+
+    assert tasks_file.stat().st_mtime_ns == mtime
+
+async def rename(uow: JsonUnitOfWork, task_id: str, title: str):
+    task = await uow.tasks.get_by_id(task_id)
+    task["title"] = title
+    await uow.tasks.update(task_id, task)
+
+@pytest.mark.asyncio
+async def test_concurrent_writers_to_different_tasks_are_both_kept(store: TaskStore, tasks_file):
+    first, second = JsonUnitOfWork(store), JsonUnitOfWork(store)
+    await first.__aenter__()
+    await second.__aenter__()
+    await rename(first, "1", "First")
+    await rename(second, "2", "Second")
+    await first.commit()
+    await second.commit()
+
+    titles = {task["id"]: task["title"] for task in json.loads(tasks_file.read_text())}
+    assert titles == {1: "First", 2: "Second"}
+
+@pytest.mark.asyncio
+async def test_concurrent_writers_to_same_task_conflict(store: TaskStore):
+    first, second = JsonUnitOfWork(store), JsonUnitOfWork(store)
+    await first.__aenter__()
+    await second.__aenter__()
+    await rename(first, "1", "First")
+    await rename(second, "1", "Second")
+    await first.commit()
+    with pytest.raises(ConcurrentUpdateError):
+        await second.commit()
+
+    snapshot = await store.snapshot()
+    assert snapshot.get("1")["title"] == "First"
+
+@pytest.mark.asyncio
+async def test_commits_within_window_share_one_write(tasks_file):
+    engine = JsonFileEngine(tasks_file)
+    store = TaskStore(tasks_file, engine=engine, commit_window=0.01)
+    writes = 0
+    persist = engine.persist
+
+    async def counting_persist(previous, current, changes):
+        nonlocal writes
+        writes += 1
+        await persist(previous, current, changes)
+
+    engine.persist = counting_persist
+
+    async def writer(task_id):
+        async with JsonUnitOfWork(store) as uow:
+            await rename(uow, task_id, f"Renamed {task_id}")
+
+    await asyncio.gather(writer("1"), writer("2"))
+
+    assert writes == 1
+    assert [task["title"] for task in json.loads(tasks_file.read_text())] == ["Renamed 1", "Renamed 2"]
+    assert not list(tasks_file.parent.glob("*.tmp"))
+
+@pytest.mark.asyncio
+async def test_commit_fails_instead_of_hanging_when_the_file_is_corrupted(store: TaskStore, tasks_file):
+    await store.snapshot()
+    good = tasks_file.read_text()
+    async with JsonUnitOfWork(store) as uow:
+        await uow.tasks.delete("1")
+        tasks_file.write_text("[{not json")
+        os.utime(tasks_file, ns=(1, 1))
+        with pytest.raises(ValueError):
+            await asyncio.wait_for(uow.commit(), timeout=5)
+
+    # The writer keeps serving commits once the file is readable again
+    tasks_file.write_text(good)
+    os.utime(tasks_file, ns=(2, 2))
+    async with JsonUnitOfWork(store) as uow:
+        await uow.tasks.delete("2")
+        await asyncio.wait_for(uow.commit(), timeout=5)
+    assert [task["id"] for task in json.loads(tasks_file.read_text())] == [1]
@@ -1,7 +1,13 @@
+import asyncio
 from abc import ABC, abstractmethod
+from contextlib import AsyncExitStack
 from app.repositories.json_repository import JsonTaskRepository
+from app.repositories.sharded_repository import ShardedTaskRepository
+from app.repositories.sqlite_repository import SqliteTaskRepository
 from app.repositories.interfaces.task_repository_interface import ITaskRepository
-from app.utils.files_io import write_tasks
+from app.storage.sharding import ShardedTaskStore, sharded_task_store
+from app.storage.sqlite_database import SqliteDatabase, sqlite_db
+from app.storage.task_store import TaskStore, task_store
 
 class IUnitOfWork(ABC):
     tasks: ITaskRepository
@@ -23,8 +29,8 @@ class IUnitOfWork(ABC):
         ...
 
 class JsonUnitOfWork(IUnitOfWork):
-    def __init__(self):
-        self.tasks = JsonTaskRepository()
+    def __init__(self, store: TaskStore = task_store):
+        self.tasks = JsonTaskRepository(store)
 
     async def __aenter__(self):
         await self.tasks._load_data()
@@ -37,7 +43,70 @@ class JsonUnitOfWork(IUnitOfWork):
             await self.rollback()
 
     async def commit(self):
-        await write_tasks(self.tasks.tasks)
+        # Nothing to persist for read-only requests or no-op updates
+        if self.tasks.changes:
+            published = await self.tasks.store.commit(self.tasks.base, self.tasks.index, self.tasks.changes)
+            self.tasks.mark_committed(published)
 
     async def rollback(self):
-        pass
+        self.tasks.discard_changes()
+
+class ShardedUnitOfWork(IUnitOfWork):
+    def __init__(self, store: ShardedTaskStore = sharded_task_store):
+        self.tasks = ShardedTaskRepository(store)
+
+    async def __aenter__(self):
+        # Shards are loaded by the first call that needs them
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            await self.commit()
+        else:
+            await self.rollback()
+
+    async def commit(self):
+        # Each changed shard commits on its own, concurrently; a unit of work
+        # that spans shards is therefore not atomic across them.
+        dirty = self.tasks.dirty
+        results = await asyncio.gather(
+            *(shard.store.commit(shard.base, shard.index, shard.changes) for shard in dirty),
+            return_exceptions=True
+        )
+        for shard, published in zip(dirty, results):
+            if isinstance(published, BaseException):
+                shard.discard_changes()
+            else:
+                shard.mark_committed(published)
+        for published in results:
+            if isinstance(published, BaseException):
+                raise published
+
+    async def rollback(self):
+        self.tasks.discard_changes()
+
+class SqliteUnitOfWork(IUnitOfWork):
+    def __init__(self, database: SqliteDatabase = sqlite_db):
+        self.database = database
+        self._stack = AsyncExitStack()
+
+    async def __aenter__(self):
+        conn = await self._stack.enter_async_context(self.database.connection())
+        self.tasks = SqliteTaskRepository(conn)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if exc_type is None:
+                await self.commit()
+            else:
+                await self.rollback()
+        finally:
+            await self._stack.aclose()
+
+    async def commit(self):
+        # sqlite3 opens the transaction implicitly at the first write
+        await self.tasks.conn.commit()
+
+    async def rollback(self):
+        await self.tasks.conn.rollback()
@@ -1,29 +1,140 @@
 import aiofiles
+import asyncio
+import codecs
+import contextlib
 import json
-from typing import List, Dict, Any
+import mmap
+import os
+import tempfile
+from itertools import islice
+from typing import AsyncIterator, Iterator, List, Dict, Any
 from datetime import date
 from pathlib import Path
 
 # Use relative path from the current file to avoid hardcoding absolute paths
 TASKS = Path(__file__).parent.parent / "tasks.json"
 
+# Bytes decoded per step by the streaming reader, and tasks handed from the
+# parsing thread to the event loop at a time
+CHUNK_SIZE = 64 * 1024
+STREAM_BATCH_SIZE = 500
+
+_decoder = json.JSONDecoder()
+
 def date_converter(o):
     if isinstance(o, date):
         return o.isoformat()
     return str(o)
 
-async def read_tasks() -> List[Dict[str, Any]]:  
+def fsync_dir(path: Path) -> None:
+    """Make a rename inside ``path`` durable."""
+    fd = os.open(str(path), os.O_RDONLY)
     try:
-        async with aiofiles.open(str(TASKS), mode='r') as f:
-            content = await f.read()
-            return  json.loads(content)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def iter_tasks(path: Path = TASKS) -> Iterator[Dict[str, Any]]:
+    """Lazily yield the tasks of a JSON array file.
 
+    The file is memory-mapped and decoded CHUNK_SIZE bytes at a time; each
+    array element is parsed with ``raw_decode`` as soon as it is complete,
+    so memory stays bounded by one chunk plus the largest task rather than
+    the whole document.
+    """
+    try:
+        f = open(path, "rb")
     except FileNotFoundError:
-        return []
+        return
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            offset, eof = 0, False
+            buf, pos = "", 0
+
+            def fill() -> bool:
+                nonlocal buf, pos, offset, eof
+                if eof:
+                    return False
+                chunk = mm[offset:offset + CHUNK_SIZE]
+                offset += len(chunk)
+                eof = offset >= len(mm)
+                # Drop what has been consumed so the buffer never grows with the file
+                buf = buf[pos:] + decoder.decode(chunk, final=eof)
+                pos = 0
+                return True
+
+            def next_token() -> str:
+                nonlocal pos
+                while True:
+                    while pos < len(buf) and buf[pos].isspace():
+                        pos += 1
+                    if pos < len(buf):
+                        return buf[pos]
+                    if not fill():
+                        return ""
+
+            if next_token() != "[":
+                raise ValueError(f"{path} does not contain a JSON array")
+            pos += 1
+            if next_token() == "]":
+                return
+            while True:
+                next_token()
+                while True:
+                    try:
+                        task, end = _decoder.raw_decode(buf, pos)
+                        # A bare number could be cut short at the chunk edge
+                        if end < len(buf) or not fill():
+                            break
+                    except json.JSONDecodeError:
+                        # Most likely the element continues in the next chunk
+                        if not fill():
+                            raise
+                pos = end
+                yield task
+                token = next_token()
+                pos += 1
+                if token == "]":
+                    return
+                if token != ",":
+                    raise ValueError(f"Malformed JSON array in {path}")
+
+
+async def stream_tasks(path: Path = TASKS) -> AsyncIterator[Dict[str, Any]]:
+    """Async variant of ``iter_tasks``; parsing runs in a worker thread."""
+    tasks = iter_tasks(path)
+    while True:
+        batch = await asyncio.to_thread(lambda: list(islice(tasks, STREAM_BATCH_SIZE)))
+        if not batch:
+            return
+        for task in batch:
+            yield task
+
+
+async def read_tasks(path: Path = TASKS) -> List[Dict[str, Any]]:  
+    """Load every task, parsing off the event loop and without a full-file string."""
+    return await asyncio.to_thread(lambda: list(iter_tasks(path)))
+
+async def write_tasks(tasks: List[Dict[str, Any]], path: Path = TASKS) -> None:
+    """Atomically replace the file: write a temp file, fsync it, rename it over.
 
-async def write_tasks(tasks: List[Dict[str, Any]]) -> None:
+    A crash leaves either the old or the new file, never a truncated one.
+    The temp file has a unique name, so concurrent writers (other worker
+    processes) never write into each other's temp file.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    os.close(fd)
     try:
-        async with aiofiles.open(str(TASKS), mode='w') as f:
+        async with aiofiles.open(tmp_name, mode='w') as f:
             await f.write(json.dumps(tasks, indent=4, default=date_converter))
-    except Exception as e:
-        print(f"Error writing to file: {e}")    
\ No newline at end of file
+            await f.flush()
+            await asyncio.to_thread(os.fsync, f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_name)
+        raise
+    await asyncio.to_thread(fsync_dir, path.parent)
@@ -0,0 +1,30 @@
+import base64
+import json
+from typing import Any, Callable, List
+
+
+def encode_cursor(sort_by: str, sort_order: str, position: List[Any]) -> str:
+    """Opaque keyset cursor: the sort position of the last task on a page."""
+    payload = json.dumps({"sort_by": sort_by, "sort_order": sort_order, "after": position}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str, is_position: Callable[[List[Any]], bool]) -> List[Any]:
+    """Return the position stored in ``cursor``; ValueError if it does not fit this query.
+
+    ``is_position`` checks the length and element types of the position
+    against what the repository compares it with, so a forged cursor is
+    rejected here instead of failing mid-query.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        position = payload["after"]
+        matches = payload["sort_by"] == sort_by and payload["sort_order"] == sort_order
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor") from None
+    if not matches or not isinstance(position, list):
+        raise ValueError("Cursor was issued for a different sort order")
+    if not is_position(position):
+        raise ValueError("Invalid cursor")
+    return position
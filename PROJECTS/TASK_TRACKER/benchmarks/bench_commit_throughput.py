@@ -0,0 +1,68 @@
+"""Commit throughput of the JSON task store under concurrent writers.
+
+Run from the project root:
+
+    python -m benchmarks.bench_commit_throughput [--tasks 1000] [--commits 400]
+
+Each writer repeatedly opens a JsonUnitOfWork, renames one of its own tasks
+and commits. Reported per engine, commit window and writer count.
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from app.storage.task_store import TaskStore, create_storage_engine
+from app.unit_of_work import JsonUnitOfWork
+
+
+def seed(path: Path, count: int) -> None:
+    path.write_text(json.dumps([
+        {"id": i, "title": f"Task {i}", "description": None, "status": "pending",
+         "priority": "medium", "due_date": "2025-12-31", "created_at": f"2025-01-01T00:00:{i % 60:02d}"}
+        for i in range(count)
+    ], indent=4))
+
+
+async def run(engine_name: str, window_ms: float, writers: int, tasks: int, commits: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "tasks.json"
+        seed(path, tasks)
+        store = TaskStore(path, engine=create_storage_engine(engine_name, path), commit_window=window_ms / 1000)
+        await store.load()
+        per_writer = max(1, commits // writers)
+
+        async def writer(n: int) -> None:
+            for i in range(per_writer):
+                task_id = str((n * per_writer + i) % tasks)
+                async with JsonUnitOfWork(store) as uow:
+                    task = await uow.tasks.get_by_id(task_id)
+                    task["title"] = f"Renamed {i}"
+                    await uow.tasks.update(task_id, task)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(writer(n) for n in range(writers)))
+        elapsed = time.perf_counter() - start
+        await store.close()
+        return per_writer * writers / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--commits", type=int, default=400)
+    args = parser.parse_args()
+
+    print(f"{'engine':<8} {'window':>7} {'writers':>8} {'commits/s':>10}")
+    for engine_name in ("file", "journal"):
+        for window_ms in (0.0, 2.0):
+            for writers in (1, 10, 100):
+                rate = asyncio.run(run(engine_name, window_ms, writers, args.tasks, args.commits))
+                print(f"{engine_name:<8} {window_ms:>5.1f}ms {writers:>8} {rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Load time of tasks.json (read_tasks) against the binary snapshot.
+
+Run from the project root:
+
+    python -m benchmarks.bench_snapshot_load [--sizes 100000 1000000]
+
+Both files hold the same tasks; the JSON file is pretty-printed the way
+write_tasks writes it. read_snapshot returns TaskRecords directly, so the
+fair comparison for the store is read_tasks plus building the records.
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from app.storage.snapshot import read_snapshot, write_snapshot
+from app.storage.task_record import TaskRecord
+from app.utils.files_io import read_tasks, write_tasks
+
+
+def make_tasks(count: int) -> list:
+    rng = random.Random(1)
+    return [
+        {"id": rng.randint(1000, 10**12), "title": f"Task {i}", "description": f"Description of task {i}",
+         "status": rng.choice(["pending", "in_progress", "completed"]), "priority": rng.choice(["low", "medium", "high"]),
+         "due_date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+         "created_at": f"2025-01-01T00:00:00.{i:06d}"}
+        for i in range(count)
+    ]
+
+
+async def best_of(load, path: Path, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await load(path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def run(count: int) -> None:
+    tasks = make_tasks(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path, snapshot_path = Path(tmp) / "tasks.json", Path(tmp) / "tasks.snapshot"
+        await write_tasks(tasks, json_path)
+        await write_snapshot(tasks, snapshot_path)
+        assert [task.to_dict() for task in await read_snapshot(snapshot_path)] == await read_tasks(json_path)
+
+        async def read_records(path: Path) -> list:
+            return [TaskRecord.from_dict(task) for task in await read_tasks(path)]
+
+        json_time = await best_of(read_tasks, json_path)
+        records_time = await best_of(read_records, json_path)
+        snapshot_time = await best_of(read_snapshot, snapshot_path)
+        print(f"{count} tasks")
+        print(f"  tasks.json      {json_path.stat().st_size / 1e6:7.1f} MB  read_tasks    {json_time * 1000:6.0f} ms"
+              f"   with records {records_time * 1000:6.0f} ms")
+        print(f"  tasks.snapshot  {snapshot_path.stat().st_size / 1e6:7.1f} MB  read_snapshot {snapshot_time * 1000:6.0f} ms"
+              f"  ({records_time / snapshot_time:.1f}x faster)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+    for count in args.sizes:
+        asyncio.run(run(count))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Memory per task and filter latency of the in-memory JSON task index.
+
+Run from the project root:
+
+    python -m benchmarks.bench_task_memory [--sizes 100000 1000000]
+
+"dicts" is the task list exactly as parsed from tasks.json, "records" the
+same tasks as slotted TaskRecords and "index" a full TaskIndex (records plus
+the id and sorted indexes), each measured with nothing else alive. Filter
+latency compares a list comprehension over the dicts, which is what a scan
+costs, with the equivalent indexed query returning the first page.
+"""
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from app.storage.task_index import TaskIndex
+from app.storage.task_record import TaskRecord
+
+STATUSES = ["pending", "in_progress", "completed"]
+PRIORITIES = ["low", "medium", "high"]
+
+
+def parsed_tasks(count: int) -> List[Dict[str, Any]]:
+    """Tasks as json.loads returns them: every string is its own object."""
+    rng = random.Random(1)
+    tasks = []
+    for start in range(0, count, 10_000):
+        chunk = [
+            {"id": rng.randint(1000, 10**12), "title": f"Task {i}", "description": f"Description of task {i}",
+             "status": rng.choice(STATUSES), "priority": rng.choice(PRIORITIES),
+             "due_date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+             "created_at": f"2025-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}.{i:06d}"}
+            for i in range(start, min(start + 10_000, count))
+        ]
+        tasks.extend(json.loads(json.dumps(chunk)))
+    return tasks
+
+
+def measure(build: Callable[[], Any]) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def timed(fn: Callable[[], Any], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    for count in args.sizes:
+        _, record_bytes = measure(lambda: [TaskRecord.from_dict(task) for task in parsed_tasks(count)])
+        index, index_bytes = measure(lambda: TaskIndex(parsed_tasks(count)))
+        tasks, dict_bytes = measure(lambda: parsed_tasks(count))
+        due_date = tasks[0]["due_date"]
+        print(f"{count} tasks")
+        print(f"  memory/task   dicts {dict_bytes / count:5.0f} B   records {record_bytes / count:5.0f} B"
+              f"   index {index_bytes / count:5.0f} B")
+
+        filters = {
+            "status": (lambda: [t for t in tasks if t["status"] == "pending"],
+                       lambda: index.query(limit=100, status_filter="pending")),
+            "due_date": (lambda: [t for t in tasks if t["due_date"] == due_date],
+                         lambda: index.query(limit=100, due_date=due_date)),
+            "status+due_date": (lambda: [t for t in tasks if t["status"] == "pending" and t["due_date"] == due_date],
+                                lambda: index.query(limit=100, status_filter="pending", due_date=due_date)),
+        }
+        for name, (scan, query) in filters.items():
+            print(f"  {name:<15} scan {timed(scan):8.2f} ms   index {timed(query):8.3f} ms")
+        del tasks, index
+
+
+if __name__ == "__main__":
+    main()
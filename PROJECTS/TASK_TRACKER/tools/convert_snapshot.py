@@ -0,0 +1,49 @@
+"""Convert between tasks.json and the binary tasks.snapshot format.
+
+Run from the project root:
+
+    python -m tools.convert_snapshot to-snapshot [--json app/tasks.json] [--snapshot app/tasks.snapshot]
+    python -m tools.convert_snapshot to-json [--snapshot app/tasks.snapshot] [--json app/tasks.json]
+
+to-snapshot also replays a pending tasks.journal, so it captures exactly
+what the JSON backend would load. Both directions write atomically.
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+
+from app.storage.journal import JournalEngine
+from app.storage.snapshot import read_snapshot, write_snapshot
+from app.utils.files_io import TASKS, write_tasks
+
+
+async def to_snapshot(json_path: Path, snapshot_path: Path) -> int:
+    tasks = await JournalEngine(json_path).load()
+    await write_snapshot(tasks, snapshot_path)
+    return len(tasks)
+
+
+async def to_json(snapshot_path: Path, json_path: Path) -> int:
+    tasks = [task.to_dict() for task in await read_snapshot(snapshot_path)]
+    await write_tasks(tasks, json_path)
+    return len(tasks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("direction", choices=["to-snapshot", "to-json"])
+    parser.add_argument("--json", type=Path, default=TASKS)
+    parser.add_argument("--snapshot", type=Path, default=TASKS.with_suffix(".snapshot"))
+    args = parser.parse_args()
+
+    if args.direction == "to-snapshot":
+        count = asyncio.run(to_snapshot(args.json, args.snapshot))
+        print(f"{args.json} -> {args.snapshot}: {count} tasks")
+    else:
+        count = asyncio.run(to_json(args.snapshot, args.json))
+        print(f"{args.snapshot} -> {args.json}: {count} tasks")
+
+
+if __name__ == "__main__":
+    main()
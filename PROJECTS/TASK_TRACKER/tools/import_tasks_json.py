@@ -0,0 +1,87 @@
+"""Import tasks.json (and any pending journal) into the SQLite backend.
+
+Run from the project root:
+
+    python -m tools.import_tasks_json [--json app/tasks.json] [--db app/tasks.db] [--replace]
+
+The snapshot is streamed in batches, then ``tasks.journal.sealed`` and
+``tasks.journal`` are replayed on top, so the database ends up with exactly
+what the JSON backend would load. Existing rows with the same id are
+overwritten; ``--replace`` empties the table first.
+"""
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+from app.core.config import settings
+from app.repositories.sqlite_repository import row_values, task_key
+from app.storage.sqlite_database import COLUMNS, SqliteDatabase
+from app.storage.task_store import to_record
+from app.utils.files_io import TASKS, stream_tasks
+
+BATCH_SIZE = 1000
+
+UPSERT_TASK = f"INSERT OR REPLACE INTO tasks ({', '.join(COLUMNS)}) VALUES ({', '.join('?' for _ in COLUMNS)})"
+
+
+def journal_records(path: Path) -> List[Dict[str, Any]]:
+    records = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Torn final record from a crash mid-append
+                    break
+    except FileNotFoundError:
+        pass
+    return records
+
+
+async def import_tasks(json_path: Path, database: SqliteDatabase, replace: bool = False) -> int:
+    """Copy every task into ``database``; returns the resulting row count."""
+    await database.init()
+    async with database.connection() as conn:
+        if replace:
+            await conn.execute("DELETE FROM tasks")
+
+        batch = []
+        async for task in stream_tasks(json_path):
+            batch.append(row_values(to_record(task)))
+            if len(batch) >= BATCH_SIZE:
+                await conn.executemany(UPSERT_TASK, batch)
+                batch = []
+        if batch:
+            await conn.executemany(UPSERT_TASK, batch)
+
+        for journal in (json_path.with_suffix(".journal.sealed"), json_path.with_suffix(".journal")):
+            for record in journal_records(journal):
+                if record["op"] == "put":
+                    await conn.execute(UPSERT_TASK, row_values(record["task"]))
+                elif record["op"] == "del":
+                    await conn.execute("DELETE FROM tasks WHERE id = ?", (task_key(str(record["id"])),))
+
+        await conn.commit()
+        async with conn.execute("SELECT COUNT(*) FROM tasks") as cursor:
+            (count,) = await cursor.fetchone()
+    await database.close()
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", type=Path, default=TASKS)
+    parser.add_argument("--db", type=Path, default=Path(settings.sqlite_path))
+    parser.add_argument("--replace", action="store_true", help="delete existing rows first")
+    args = parser.parse_args()
+
+    count = asyncio.run(import_tasks(args.json, SqliteDatabase(args.db), replace=args.replace))
+    print(f"{args.db}: {count} tasks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Change the number of shards of the JSON task store.
+
+Run from the project root, with the app stopped:
+
+    python -m tools.reshard --shards 8 [--dir app/tasks.shards] [--json app/tasks.json]
+    python -m tools.reshard --to-json [--dir app/tasks.shards] [--json app/tasks.json]
+
+Tasks are read from the current layout in ``--dir`` (with whatever
+``JSON_STORAGE_ENGINE`` files it has, e.g. pending journals), or from
+``--json`` if there is no layout yet. The new layout is written next to the
+old one and then swapped in with two renames, so an interrupted run leaves
+the old layout in place. ``--to-json`` instead merges the shards back into
+a single tasks.json (for ``JSON_SHARDS=1``).
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import shutil
+from pathlib import Path
+
+from app.core.config import settings
+from app.storage.sharding import SHARDS, ShardedTaskStore, read_manifest, write_layout
+from app.storage.task_store import TaskStore, create_storage_engine
+from app.utils.files_io import TASKS, fsync_dir, write_tasks
+
+
+def _plain_store(path: Path) -> TaskStore:
+    # No coordinator: the app is not running, and the lock files are replaced anyway
+    return TaskStore(path, engine=create_storage_engine(settings.json_storage_engine, path))
+
+
+async def _read_current(directory: Path, json_path: Path) -> list:
+    count = read_manifest(directory)
+    if count is None:
+        store = _plain_store(json_path)
+        tasks = list(await store.load())
+        await store.close()
+        return tasks
+    old = ShardedTaskStore(directory, count, store_factory=_plain_store)
+    tasks = list(itertools.chain.from_iterable(await old.snapshots()))
+    await old.close()
+    return tasks
+
+
+def _swap(directory: Path, staged: Path) -> None:
+    retired = directory.with_name(directory.name + ".old")
+    shutil.rmtree(retired, ignore_errors=True)
+    if directory.exists():
+        os.replace(directory, retired)
+    os.replace(staged, directory)
+    fsync_dir(directory.parent)
+    shutil.rmtree(retired, ignore_errors=True)
+
+
+async def reshard(count: int, directory: Path = SHARDS, json_path: Path = TASKS) -> int:
+    """Rewrite the store as ``count`` shards; returns the number of tasks."""
+    if count < 1:
+        raise ValueError("--shards must be at least 1")
+    tasks = await _read_current(directory, json_path)
+    staged = directory.with_name(directory.name + ".new")
+    shutil.rmtree(staged, ignore_errors=True)
+    await write_layout(staged, count, tasks)
+    await asyncio.to_thread(_swap, directory, staged)
+    return len(tasks)
+
+
+async def to_json(directory: Path = SHARDS, json_path: Path = TASKS) -> int:
+    """Merge a sharded store back into a single tasks.json."""
+    tasks = await _read_current(directory, json_path)
+    await write_tasks([task.to_dict() for task in tasks], json_path)
+    return len(tasks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--shards", type=int)
+    target.add_argument("--to-json", action="store_true")
+    parser.add_argument("--dir", type=Path, default=SHARDS)
+    parser.add_argument("--json", type=Path, default=TASKS)
+    args = parser.parse_args()
+
+    if args.to_json:
+        count = asyncio.run(to_json(args.dir, args.json))
+        print(f"{args.dir} -> {args.json}: {count} tasks")
+    else:
+        count = asyncio.run(reshard(args.shards, args.dir, args.json))
+        print(f"{args.dir}: {count} tasks in {args.shards} shards")
+
+
+if __name__ == "__main__":
+    main()